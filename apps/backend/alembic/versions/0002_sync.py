@@ -0,0 +1,55 @@
+# apps/backend/alembic/versions/0002_sync.py
+"""Delta sync: updated_at columns and tombstones
+
+Revision ID: 002
+Revises: 001
+Create Date: 2025-02-10 12:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+SYNCED_TABLES = ['accounts', 'categories', 'budgets', 'transactions']
+
+def upgrade() -> None:
+    # Existing rows get the migration time as their first version
+    for table in SYNCED_TABLES:
+        op.add_column(
+            table,
+            sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now())
+        )
+
+    op.create_index('ix_accounts_user_id_updated_at', 'accounts', ['user_id', 'updated_at'])
+    op.create_index('ix_categories_user_id_updated_at', 'categories', ['user_id', 'updated_at'])
+    op.create_index('ix_budgets_user_id_updated_at', 'budgets', ['user_id', 'updated_at'])
+    op.create_index(
+        'ix_transactions_user_id_updated_at_id',
+        'transactions',
+        ['user_id', 'updated_at', 'id']
+    )
+
+    # Tombstones table
+    op.create_table(
+        'tombstones',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.String(), nullable=True),
+        sa.Column('entity', sa.String(), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_tombstones_user_id_deleted_at', 'tombstones', ['user_id', 'deleted_at'])
+
+def downgrade() -> None:
+    op.drop_table('tombstones')
+    op.drop_index('ix_transactions_user_id_updated_at_id', 'transactions')
+    op.drop_index('ix_budgets_user_id_updated_at', 'budgets')
+    op.drop_index('ix_categories_user_id_updated_at', 'categories')
+    op.drop_index('ix_accounts_user_id_updated_at', 'accounts')
+    for table in SYNCED_TABLES:
+        op.drop_column(table, 'updated_at')
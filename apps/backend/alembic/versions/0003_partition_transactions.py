@@ -0,0 +1,92 @@
+# apps/backend/alembic/versions/0003_partition_transactions.py
+"""Partition transactions by txn_date month
+
+Revision ID: 003
+Revises: 002
+Create Date: 2025-02-20 12:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from datetime import date
+from dateutil.relativedelta import relativedelta
+
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+# Months created ahead of today; scripts/partitions.py keeps this topped up
+MONTHS_AHEAD = 12
+
+FOREIGN_KEYS = [
+    ('fk_transactions_user_id', 'user_id', 'users'),
+    ('fk_transactions_account_id', 'account_id', 'accounts'),
+    ('fk_transactions_category_id', 'category_id', 'categories'),
+    ('fk_transactions_subcategory_id', 'subcategory_id', 'categories'),
+]
+
+INDEXES = [
+    ('ix_transactions_user_id', ['user_id']),
+    ('ix_transactions_account_id', ['account_id']),
+    ('ix_transactions_txn_date', ['txn_date']),
+    ('ix_transactions_category_id', ['category_id']),
+    ('ix_transactions_hash_dedupe', ['hash_dedupe']),
+    ('ix_transactions_created_at', ['created_at']),
+    ('ix_transactions_user_id_updated_at_id', ['user_id', 'updated_at', 'id']),
+]
+
+def _copy_into(new_table_ddl: str) -> None:
+    """Rename transactions away, create its replacement and copy the rows"""
+    op.execute("ALTER TABLE transactions RENAME TO transactions_old")
+    op.execute("ALTER SEQUENCE transactions_id_seq OWNED BY NONE")
+    op.execute(new_table_ddl)
+
+def _finish_copy() -> None:
+    op.execute("INSERT INTO transactions SELECT * FROM transactions_old")
+    op.execute("DROP TABLE transactions_old")
+    op.execute("ALTER SEQUENCE transactions_id_seq OWNED BY transactions.id")
+    for name, column, target in FOREIGN_KEYS:
+        op.create_foreign_key(name, 'transactions', target, [column], ['id'])
+    for name, columns in INDEXES:
+        op.create_index(name, 'transactions', columns)
+
+def upgrade() -> None:
+    _copy_into(
+        "CREATE TABLE transactions (LIKE transactions_old INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (txn_date)"
+    )
+    # Primary and unique keys of a partitioned table must include txn_date
+    op.execute("ALTER TABLE transactions ADD PRIMARY KEY (id, txn_date)")
+    op.create_unique_constraint(
+        'uq_transactions_hash_dedupe_txn_date', 'transactions', ['hash_dedupe', 'txn_date']
+    )
+
+    # One partition per month from the oldest row to MONTHS_AHEAD from now;
+    # the default partition catches anything outside that range
+    bind = op.get_bind()
+    oldest = bind.execute(
+        sa.text("SELECT date_trunc('month', min(txn_date))::date FROM transactions_old")
+    ).scalar()
+    current = date.today().replace(day=1)
+    month = min(oldest or current, current)
+    while month <= current + relativedelta(months=MONTHS_AHEAD):
+        next_month = month + relativedelta(months=1)
+        op.execute(
+            f"CREATE TABLE transactions_y{month:%Y}m{month:%m} PARTITION OF transactions "
+            f"FOR VALUES FROM ('{month}') TO ('{next_month}')"
+        )
+        month = next_month
+    op.execute("CREATE TABLE transactions_default PARTITION OF transactions DEFAULT")
+
+    _finish_copy()
+
+    # Created on the parent, so every partition gets its own copy
+    op.create_index('ix_transactions_user_id_txn_date', 'transactions', ['user_id', 'txn_date'])
+
+def downgrade() -> None:
+    _copy_into("CREATE TABLE transactions (LIKE transactions_old INCLUDING DEFAULTS)")
+    op.execute("ALTER TABLE transactions ADD PRIMARY KEY (id)")
+    op.create_unique_constraint('transactions_hash_dedupe_key', 'transactions', ['hash_dedupe'])
+
+    # Dropping the partitioned parent drops all attached partitions
+    _finish_copy()
@@ -0,0 +1,45 @@
+# apps/backend/alembic/versions/0004_transaction_payloads.py
+"""Move transactions.raw_payload to transaction_payloads
+
+Revision ID: 004
+Revises: 003
+Create Date: 2025-02-24 12:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        'transaction_payloads',
+        sa.Column('transaction_id', sa.Integer(), nullable=False),
+        sa.Column('txn_date', sa.Date(), nullable=False),
+        sa.Column('payload', postgresql.JSONB(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['transaction_id', 'txn_date'],
+            ['transactions.id', 'transactions.txn_date'],
+            ondelete='CASCADE'
+        ),
+        sa.PrimaryKeyConstraint('transaction_id')
+    )
+    op.execute(
+        "INSERT INTO transaction_payloads (transaction_id, txn_date, payload) "
+        "SELECT id, txn_date, raw_payload FROM transactions WHERE raw_payload IS NOT NULL"
+    )
+
+    # DROP COLUMN only hides the column; existing rows shrink as they are
+    # rewritten (or right away with VACUUM FULL per partition)
+    op.drop_column('transactions', 'raw_payload')
+
+def downgrade() -> None:
+    op.add_column('transactions', sa.Column('raw_payload', postgresql.JSONB(), nullable=True))
+    op.execute(
+        "UPDATE transactions t SET raw_payload = p.payload FROM transaction_payloads p "
+        "WHERE p.transaction_id = t.id AND p.txn_date = t.txn_date"
+    )
+    op.drop_table('transaction_payloads')
@@ -0,0 +1,49 @@
+# apps/backend/alembic/versions/0006_merchants.py
+"""Canonical merchants and merchant aliases
+
+Revision ID: 006
+Revises: 005
+Create Date: 2025-03-03 12:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        'merchants',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+    )
+    op.create_table(
+        'merchant_aliases',
+        sa.Column('alias', sa.String(), nullable=False),
+        sa.Column('merchant_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['merchant_id'], ['merchants.id']),
+        sa.PrimaryKeyConstraint('alias')
+    )
+    op.create_index('ix_merchant_aliases_merchant_id', 'merchant_aliases', ['merchant_id'])
+
+    # Filled for new rows on ingest; scripts/normalize_merchants.py backfills history
+    op.add_column('transactions', sa.Column('merchant_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'fk_transactions_merchant_id', 'transactions', 'merchants', ['merchant_id'], ['id']
+    )
+    op.create_index(
+        'ix_transactions_user_id_merchant_id', 'transactions', ['user_id', 'merchant_id']
+    )
+
+def downgrade() -> None:
+    op.drop_index('ix_transactions_user_id_merchant_id', table_name='transactions')
+    op.drop_constraint('fk_transactions_merchant_id', 'transactions', type_='foreignkey')
+    op.drop_column('transactions', 'merchant_id')
+    op.drop_index('ix_merchant_aliases_merchant_id', table_name='merchant_aliases')
+    op.drop_table('merchant_aliases')
+    op.drop_table('merchants')
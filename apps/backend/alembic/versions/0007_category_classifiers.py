@@ -0,0 +1,30 @@
+# apps/backend/alembic/versions/0007_category_classifiers.py
+"""Per-user auto-categorization models
+
+Revision ID: 007
+Revises: 006
+Create Date: 2025-03-06 12:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        'category_classifiers',
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('state', postgresql.JSONB(), nullable=False),
+        sa.Column('documents', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_transaction_id', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('trained_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+
+def downgrade() -> None:
+    op.drop_table('category_classifiers')
@@ -0,0 +1,50 @@
+# apps/backend/alembic/versions/0008_recurring_series.py
+"""Detected recurring charges and the detection job's watermark
+
+Revision ID: 008
+Revises: 007
+Create Date: 2025-03-10 12:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        'recurring_series',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('merchant_id', sa.Integer(), nullable=False),
+        sa.Column('cadence', sa.String(), nullable=False),
+        sa.Column('period_days', sa.Integer(), nullable=False),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('occurrences', sa.Integer(), nullable=False),
+        sa.Column('first_date', sa.Date(), nullable=False),
+        sa.Column('last_date', sa.Date(), nullable=False),
+        sa.Column('next_expected', sa.Date(), nullable=False),
+        sa.Column('last_transaction_id', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['merchant_id'], ['merchants.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_recurring_series_user_id_merchant_id', 'recurring_series', ['user_id', 'merchant_id']
+    )
+    op.create_table(
+        'recurring_scans',
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('last_transaction_id', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('scanned_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+
+def downgrade() -> None:
+    op.drop_table('recurring_scans')
+    op.drop_index('ix_recurring_series_user_id_merchant_id', table_name='recurring_series')
+    op.drop_table('recurring_series')
@@ -0,0 +1,22 @@
+# apps/backend/alembic/versions/0009_transfer_pairs.py
+"""Link detected transfers to their other side
+
+Revision ID: 009
+Revises: 008
+Create Date: 2025-03-12 12:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Filled by TransferDetector on import/ingest; scripts/detect_transfers.py
+    # pairs existing history
+    op.add_column('transactions', sa.Column('transfer_pair_id', sa.Integer(), nullable=True))
+
+def downgrade() -> None:
+    op.drop_column('transactions', 'transfer_pair_id')
@@ -0,0 +1,30 @@
+# apps/backend/alembic/versions/0010_budget_spend.py
+"""Running budget spend counters
+
+Revision ID: 010
+Revises: 009
+Create Date: 2025-03-14 12:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Counters are built on first use (BudgetTracker), so no backfill here
+    op.create_table(
+        'budget_spend',
+        sa.Column('budget_id', sa.Integer(), nullable=False),
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('spent', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('alerted', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(['budget_id'], ['budgets.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('budget_id', 'month')
+    )
+
+def downgrade() -> None:
+    op.drop_table('budget_spend')
@@ -0,0 +1,29 @@
+# apps/backend/alembic/versions/0011_category_auto.py
+"""Flag model-assigned categories; train categorizers by updated_at
+
+Revision ID: 011
+Revises: 010
+Create Date: 2025-03-20 12:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Categories the model filled in before this migration cannot be told
+    # apart and stay training examples
+    op.add_column(
+        'transactions',
+        sa.Column('category_auto', sa.Boolean(), nullable=False, server_default=sa.false())
+    )
+    op.add_column('category_classifiers', sa.Column('trained_through', sa.DateTime(), nullable=True))
+    # Everything touched before the last training has been learned
+    op.execute("UPDATE category_classifiers SET trained_through = trained_at")
+
+def downgrade() -> None:
+    op.drop_column('category_classifiers', 'trained_through')
+    op.drop_column('transactions', 'category_auto')
@@ -0,0 +1,40 @@
+# apps/backend/alembic/versions/0012_category_learned.py
+"""Remember each transaction's learned category instead of a training watermark
+
+Revision ID: 012
+Revises: 011
+Create Date: 2025-03-24 12:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.add_column('transactions', sa.Column('category_learned', sa.Integer(), nullable=True))
+    # Rows at or before a classifier's watermark are already in its counts
+    op.execute("""
+        UPDATE transactions SET category_learned = category_id
+        WHERE category_id IS NOT NULL AND category_auto = false
+          AND EXISTS (
+            SELECT 1 FROM category_classifiers c
+            WHERE c.user_id = transactions.user_id
+              AND c.trained_through IS NOT NULL
+              AND (transactions.updated_at < c.trained_through
+                   OR (transactions.updated_at = c.trained_through
+                       AND transactions.id <= c.last_transaction_id))
+          )
+    """)
+    op.drop_column('category_classifiers', 'trained_through')
+    op.drop_column('category_classifiers', 'last_transaction_id')
+
+def downgrade() -> None:
+    op.add_column(
+        'category_classifiers',
+        sa.Column('last_transaction_id', sa.Integer(), nullable=False, server_default='0')
+    )
+    op.add_column('category_classifiers', sa.Column('trained_through', sa.DateTime(), nullable=True))
+    op.drop_column('transactions', 'category_learned')
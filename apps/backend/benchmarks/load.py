@@ -0,0 +1,208 @@
+# apps/backend/benchmarks/load.py
+"""
+HTTP load generator replaying PWA dashboard sessions against a running app.
+
+    make dev                                   # or any uvicorn/gunicorn setup
+    python benchmarks/load.py --users 50 --duration 60 --url http://localhost:8000
+
+Virtual users log in as the synthetic users created by
+scripts/generate_data.py (tokens are signed with SUPABASE_JWT_SECRET, so the
+app must run with the same secret) and loop over weighted scenarios with
+think time between requests. At the end it prints throughput, latency
+percentiles and error rates per scenario and per endpoint. With the same
+--seed, every run issues the same sequence of requests per virtual user.
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+import jwt
+from dateutil.relativedelta import relativedelta
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core.config import settings
+
+@dataclass
+class Stats:
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+
+    def record(self, seconds: float, ok: bool) -> None:
+        self.latencies.append(seconds)
+        if not ok:
+            self.errors += 1
+
+def percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * p), len(ordered) - 1)]
+
+def make_token(user_id: str, ttl: timedelta = timedelta(hours=2)) -> str:
+    """A Supabase-style access token the app's JWT check accepts"""
+    now = datetime.utcnow()
+    return jwt.encode(
+        {"sub": user_id, "aud": "authenticated", "iat": now, "exp": now + ttl},
+        settings.SUPABASE_JWT_SECRET,
+        algorithm="HS256"
+    )
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, user_id: str, rng: random.Random, run: "LoadRun"):
+        self.client = client
+        self.rng = rng
+        self.run = run
+        self.headers = {"Authorization": f"Bearer {make_token(user_id)}"}
+        self.month = run.months[rng.randrange(len(run.months))]
+
+    async def request(self, scenario: str, endpoint: str, method: str, url: str) -> None:
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=self.headers)
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        elapsed = time.perf_counter() - start
+        self.run.by_endpoint[endpoint].record(elapsed, ok)
+        self.run.by_scenario[scenario].record(elapsed, ok)
+
+    async def think(self) -> None:
+        await asyncio.sleep(self.rng.uniform(0, self.run.think_time * 2))
+
+    async def dashboard(self) -> None:
+        """Opening the app: report, recent transactions and lists in one request"""
+        await self.request("dashboard", "dashboard", "GET", f"/dashboard?month={self.month}")
+
+    async def browse(self) -> None:
+        """Scrolling the transaction list and searching"""
+        for page in range(self.rng.randint(1, 5)):
+            await self.request("browse", "transactions_page", "GET",
+                               f"/transactions?limit=50&offset={page * 50}")
+            await self.think()
+        if self.rng.random() < 0.3:
+            term = self.rng.choice(["lider", "uber", "copec", "rappi", "falabella"])
+            await self.request("browse", "transactions_search", "GET", f"/transactions?search={term}")
+
+    async def export(self) -> None:
+        await self.request("export", "exports_csv", "GET", f"/exports/monthly.csv?month={self.month}")
+
+    async def apply_rules(self) -> None:
+        await self.request("apply_rules", "rules_apply", "POST", "/rules/apply")
+
+    async def loop(self, deadline: float) -> None:
+        scenarios = [self.dashboard, self.browse, self.export, self.apply_rules]
+        weights = [self.run.weights[s.__name__] for s in scenarios]
+        while time.perf_counter() < deadline:
+            await self.rng.choices(scenarios, weights)[0]()
+            await self.think()
+
+class LoadRun:
+    def __init__(self, args):
+        self.args = args
+        self.think_time = args.think_time
+        self.weights = {"dashboard": 60, "browse": 30, "export": 5, "apply_rules": 5}
+        self.months = [
+            f"{args.end_month - relativedelta(months=i):%Y-%m}" for i in range(3)
+        ]
+        self.by_endpoint: Dict[str, Stats] = defaultdict(Stats)
+        self.by_scenario: Dict[str, Stats] = defaultdict(Stats)
+
+    async def start(self) -> float:
+        limits = httpx.Limits(max_connections=self.args.users)
+        timeout = httpx.Timeout(self.args.timeout)
+        async with httpx.AsyncClient(base_url=self.args.url, limits=limits, timeout=timeout) as client:
+            virtual_users = [
+                VirtualUser(
+                    client,
+                    f"{self.args.prefix}-{i % self.args.dataset_users:07d}",
+                    random.Random(f"{self.args.seed}:{i}"),
+                    self
+                )
+                for i in range(self.args.users)
+            ]
+            # Stagger arrivals over the ramp-up period
+            start = time.perf_counter()
+            deadline = start + self.args.ramp_up + self.args.duration
+
+            async def arrive(index: int, user: VirtualUser):
+                await asyncio.sleep(self.args.ramp_up * index / len(virtual_users))
+                await user.loop(deadline)
+
+            await asyncio.gather(*(arrive(i, u) for i, u in enumerate(virtual_users)))
+            return time.perf_counter() - start
+
+    def report(self, elapsed: float) -> Dict:
+        def summary(stats: Stats) -> Dict:
+            latencies = stats.latencies
+            return {
+                "requests": len(latencies),
+                "rps": round(len(latencies) / elapsed, 2),
+                "error_rate": round(stats.errors / len(latencies), 4),
+                "mean_ms": round(statistics.fmean(latencies) * 1000, 1),
+                "p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+                "p90_ms": round(percentile(latencies, 0.90) * 1000, 1),
+                "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+                "max_ms": round(max(latencies) * 1000, 1),
+            }
+
+        total = Stats()
+        for stats in self.by_endpoint.values():
+            total.latencies.extend(stats.latencies)
+            total.errors += stats.errors
+
+        return {
+            "users": self.args.users,
+            "duration_seconds": round(elapsed, 1),
+            "total": summary(total) if total.latencies else {},
+            "scenarios": {name: summary(s) for name, s in sorted(self.by_scenario.items())},
+            "endpoints": {name: summary(s) for name, s in sorted(self.by_endpoint.items())},
+        }
+
+def print_report(report: Dict) -> None:
+    header = f"{'':<22} {'reqs':>7} {'rps':>8} {'err%':>6} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}"
+    for section in ("scenarios", "endpoints"):
+        print(f"\n{section}\n{header}")
+        for name, s in report[section].items():
+            print(f"{name:<22} {s['requests']:>7} {s['rps']:>8.1f} {s['error_rate'] * 100:>6.1f} "
+                  f"{s['p50_ms']:>8.1f} {s['p90_ms']:>8.1f} {s['p99_ms']:>8.1f} {s['max_ms']:>8.1f}")
+    total = report["total"]
+    if total:
+        print(f"\n{total['requests']} requests in {report['duration_seconds']}s with {report['users']} users: "
+              f"{total['rps']:.1f} req/s, p99 {total['p99_ms']:.0f} ms, "
+              f"{total['error_rate'] * 100:.2f}% errors")
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Replay PWA sessions against a running app")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds after ramp-up")
+    parser.add_argument("--ramp-up", type=float, default=10)
+    parser.add_argument("--think-time", type=float, default=1.0, help="Mean pause between requests")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--prefix", default="synthetic", help="User id prefix of the generated data")
+    parser.add_argument("--dataset-users", type=int, default=100,
+                        help="Users available in the generated data")
+    parser.add_argument("--end-month", type=date.fromisoformat, default=date.today(),
+                        help="Latest month the dashboards ask for")
+    parser.add_argument("--json", type=Path, help="Also write the report to this file")
+    args = parser.parse_args(argv)
+
+    run = LoadRun(args)
+    elapsed = asyncio.run(run.start())
+    report = run.report(elapsed)
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2) + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+# apps/backend/benchmarks/run.py
+"""
+Endpoint benchmark suite with regression baselines.
+
+    DATABASE_URL=postgresql://localhost/finance_bench python benchmarks/run.py
+    python benchmarks/run.py --update-baselines
+
+The benchmark dataset (generated with scripts/generate_data.py, fixed seed)
+is created on the first run. Every case is run --repeat times after a
+warmup and its median compared against benchmarks/baselines.json; the run
+fails if any case is slower than baseline * (1 + threshold). Baselines are
+only comparable on the same database and dataset size, so they record both.
+"""
+import argparse
+import json
+import logging
+import random
+import statistics
+import sys
+import time
+from datetime import date
+from pathlib import Path
+from typing import Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel, delete, func, select
+
+from src.main import app
+from src.core.auth import get_current_user_id
+from src.core.database import engine
+from src.models.models import Transaction, TransactionPayload, User
+from src.services.parser_service import TransactionParser
+import src.services.ingest_service as ingest_module
+import generate_data
+
+logger = logging.getLogger(__name__)
+
+BASELINES = Path(__file__).resolve().parent / "baselines.json"
+PREFIX = "bench"
+SEED = 7
+MONTHS = 24
+END_MONTH = date(2024, 12, 1)
+REPORT_MONTH = "2024-12"
+
+CASES: Dict[str, Callable] = {}
+
+def benchmark(name: str):
+    def register(fn):
+        CASES[name] = fn
+        return fn
+    return register
+
+def bci_email(rng: random.Random, message_id: str) -> Dict:
+    merchant, *_ = rng.choice(generate_data.MERCHANTS)
+    amount = f"{rng.randrange(1000, 200000, 10):,}".replace(",", ".")
+    txn_date = date(2024, rng.randint(1, 12), rng.randint(1, 28))
+    return {
+        "message_id": message_id,
+        "from": "notificaciones@bci.cl",
+        "subject": "Compra aprobada con su Tarjeta de Crédito",
+        "body": (
+            f"Estimado cliente, se realizó una compra por ${amount} en {merchant}.\n"
+            f"Fecha: {txn_date:%d/%m/%Y}\n"
+            f"Tarjeta terminada en ****{rng.randint(1000, 9999)}\n"
+        ),
+    }
+
+def email_corpus(rng: random.Random, size: int, start: int = 0) -> List[Dict]:
+    """BCI purchase notifications mixed with ~20% mail no provider matches"""
+    emails = []
+    for i in range(start, start + size):
+        if rng.random() < 0.2:
+            emails.append({
+                "message_id": f"msg-{i}",
+                "from": "newsletter@tienda.cl",
+                "subject": "Ofertas de la semana",
+                "body": "Descuentos de hasta 50% en toda la tienda.",
+            })
+        else:
+            emails.append(bci_email(rng, f"msg-{i}"))
+    return emails
+
+class FakeGmailClient:
+    """Serves the next batch of the corpus instead of calling Gmail"""
+
+    batch_size = 200
+    _rng = random.Random(SEED)
+    _next = 0
+
+    def __init__(self, credentials: Dict):
+        start = FakeGmailClient._next
+        FakeGmailClient._next += self.batch_size
+        self.emails = {e["message_id"]: e for e in email_corpus(self._rng, self.batch_size, start)}
+
+    def get_messages(self, history_id=None) -> List[Dict]:
+        return [{"id": message_id} for message_id in self.emails]
+
+    def parse_message(self, message: Dict) -> Dict:
+        return self.emails[message["id"]]
+
+    def get_latest_history_id(self) -> str:
+        return str(FakeGmailClient._next)
+
+def load_parser() -> TransactionParser:
+    # Without provider configs nothing matches and the parse/ingest cases
+    # would time no-ops
+    parser = TransactionParser()
+    assert parser.providers, "No provider configs found"
+    return parser
+
+class Context:
+    def __init__(self, client: TestClient, user_id: str, transaction_count: int):
+        self.client = client
+        self.user_id = user_id
+        self.transaction_count = transaction_count
+        self.corpus = email_corpus(random.Random(SEED), 2000)
+        self.parser = load_parser()
+
+def get(ctx: Context, url: str) -> None:
+    response = ctx.client.get(url)
+    assert response.status_code == 200, f"{url}: {response.status_code} {response.text[:200]}"
+
+@benchmark("list_transactions_first_page")
+def list_first_page(ctx: Context) -> None:
+    get(ctx, "/transactions?limit=100")
+
+@benchmark("list_transactions_deep_page")
+def list_deep_page(ctx: Context) -> None:
+    offset = max(ctx.transaction_count - 200, 0)
+    get(ctx, f"/transactions?limit=100&offset={offset}")
+
+@benchmark("list_transactions_search")
+def list_search(ctx: Context) -> None:
+    get(ctx, "/transactions?search=lider&limit=100")
+
+@benchmark("monthly_report")
+def monthly_report(ctx: Context) -> None:
+    get(ctx, f"/reports/monthly?month={REPORT_MONTH}")
+
+@benchmark("dashboard")
+def dashboard(ctx: Context) -> None:
+    get(ctx, f"/dashboard?month={REPORT_MONTH}")
+
+@benchmark("export_monthly_csv")
+def export_monthly_csv(ctx: Context) -> None:
+    get(ctx, f"/exports/monthly.csv?month={REPORT_MONTH}")
+
+@benchmark("apply_rules")
+def apply_rules(ctx: Context) -> None:
+    response = ctx.client.post("/rules/apply")
+    assert response.status_code == 200, response.text[:200]
+
+@benchmark("ingest_process_emails")
+def ingest_process_emails(ctx: Context) -> None:
+    with Session(engine) as session:
+        stats = ingest_module.IngestService(session).process_emails(f"{PREFIX}-ingest", {})
+    assert stats["failed"] == 0 and stats["created"] > 0, stats
+
+@benchmark("parse_email_corpus")
+def parse_email_corpus(ctx: Context) -> None:
+    parsed = sum(ctx.parser.parse_email(email) is not None for email in ctx.corpus)
+    assert parsed > 0, "No email in the corpus was parsed"
+
+def prepare_dataset(users: int) -> None:
+    if engine.dialect.name == "sqlite":
+        SQLModel.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        missing = session.get(User, f"{PREFIX}-{users - 1:07d}") is None
+        if session.get(User, f"{PREFIX}-ingest") is None:
+            session.add(User(id=f"{PREFIX}-ingest", email=f"{PREFIX}-ingest@example.com"))
+        # The email corpus is the same every run, so start the ingest case
+        # from an empty user or every message would be a duplicate
+        ingested = select(Transaction.id).where(Transaction.user_id == f"{PREFIX}-ingest")
+        session.exec(delete(TransactionPayload).where(TransactionPayload.transaction_id.in_(ingested)))
+        session.exec(delete(Transaction).where(Transaction.user_id == f"{PREFIX}-ingest"))
+        session.commit()
+
+    if missing:
+        logger.info(f"Generating benchmark dataset ({users} users, {MONTHS} months)...")
+        generate_data.generate(users, MONTHS, END_MONTH, seed=SEED, prefix=PREFIX)
+
+def run_cases(ctx: Context, names: List[str], repeat: int) -> Dict[str, float]:
+    """Median milliseconds per case"""
+    results = {}
+    for name in names:
+        CASES[name](ctx)  # warmup
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            CASES[name](ctx)
+            timings.append((time.perf_counter() - start) * 1000)
+        results[name] = round(statistics.median(timings), 3)
+    return results
+
+def compare(
+    results: Dict[str, float],
+    baselines: Dict,
+    dataset: Dict,
+    threshold: float,
+    min_delta_ms: float
+) -> List[str]:
+    """
+    Print a result table and return the names of regressed cases: slower
+    than the threshold and by more than min_delta_ms, so timer noise on
+    sub-millisecond cases is not reported.
+    """
+    comparable = baselines.get("dataset") == dataset
+    if baselines and not comparable:
+        print(f"Baselines were recorded for {baselines.get('dataset')}, not {dataset}; "
+              "skipping comparison")
+
+    regressions = []
+    print(f"{'case':<32} {'median ms':>10} {'baseline':>10} {'change':>8}")
+    for name, median in results.items():
+        baseline = baselines.get("cases", {}).get(name) if comparable else None
+        if baseline is None:
+            print(f"{name:<32} {median:>10.1f} {'-':>10} {'-':>8}")
+            continue
+        change = median / baseline - 1
+        flag = ""
+        if change > threshold and median - baseline > min_delta_ms:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<32} {median:>10.1f} {baseline:>10.1f} {change:>+8.0%}{flag}")
+    return regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run endpoint benchmarks")
+    parser.add_argument("--users", type=int, default=200, help="Users in the benchmark dataset")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed slowdown over baseline (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0,
+                        help="Ignore slowdowns smaller than this many milliseconds")
+    parser.add_argument("--only", nargs="*", choices=sorted(CASES), help="Run only these cases")
+    parser.add_argument("--update-baselines", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    logging.getLogger("src").setLevel(logging.ERROR)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    prepare_dataset(args.users)
+    ingest_module.GmailClient = FakeGmailClient
+
+    user_id = f"{PREFIX}-0000000"
+    with Session(engine) as session:
+        transaction_count = session.exec(
+            select(func.count(Transaction.id)).where(Transaction.user_id == user_id)
+        ).one()
+
+    app.dependency_overrides[get_current_user_id] = lambda: user_id
+    ctx = Context(TestClient(app), user_id, transaction_count)
+    results = run_cases(ctx, args.only or list(CASES), args.repeat)
+
+    dataset = {"database": engine.dialect.name, "users": args.users, "months": MONTHS}
+    baselines = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+
+    if args.update_baselines:
+        cases = {**baselines.get("cases", {}), **results} if baselines.get("dataset") == dataset else results
+        BASELINES.write_text(json.dumps({"dataset": dataset, "cases": cases}, indent=2) + "\n")
+        print(f"Baselines written to {BASELINES}")
+        return
+
+    regressions = compare(results, baselines, dataset, args.threshold, args.min_delta_ms)
+    if regressions:
+        print(f"{len(regressions)} case(s) regressed more than {args.threshold:.0%}: "
+              f"{', '.join(regressions)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
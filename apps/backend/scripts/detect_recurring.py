@@ -0,0 +1,49 @@
+# apps/backend/scripts/detect_recurring.py
+"""
+Detect subscriptions and other recurring charges for every user.
+
+    python scripts/detect_recurring.py [--user USER_ID] [--full]
+
+Meant to run on a schedule (e.g. nightly, after ingestion). Each run only
+reads transactions added or changed since the user's previous run unless
+--full is given, which rebuilds every series from the whole history. Use
+--full after reassigning charges between merchants: an incremental run
+only re-scans the merchant a charge moved to.
+"""
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlmodel import Session, select
+
+from src.core.database import engine
+from src.models.models import User
+from src.services.recurring_service import RecurringDetector
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Detect recurring charges")
+    parser.add_argument("--user", help="Only this user id")
+    parser.add_argument("--full", action="store_true", help="Rebuild from the whole history")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with Session(engine) as session:
+        user_ids = [args.user] if args.user else session.exec(select(User.id).order_by(User.id)).all()
+        detector = RecurringDetector(session)
+        for user_id in user_ids:
+            try:
+                detector.run(user_id, full=args.full)
+            except Exception as e:
+                session.rollback()
+                logger.error(f"Recurring scan failed for {user_id}: {e}")
+    logger.info(f"Scanned {len(user_ids)} users in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
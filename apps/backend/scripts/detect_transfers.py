@@ -0,0 +1,43 @@
+# apps/backend/scripts/detect_transfers.py
+"""
+Pair transfers between each user's own accounts across their whole history.
+
+    python scripts/detect_transfers.py [--user USER_ID]
+
+New rows are paired on import and email ingestion; run this once after
+migration 009, or after adding an account whose history was imported
+before the account it transfers to.
+"""
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlmodel import Session, select
+
+from src.core.database import engine
+from src.models.models import User
+from src.services.transfer_service import TransferDetector
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Detect transfers between own accounts")
+    parser.add_argument("--user", help="Only this user id")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    pairs = 0
+    with Session(engine) as session:
+        user_ids = [args.user] if args.user else session.exec(select(User.id).order_by(User.id)).all()
+        detector = TransferDetector(session)
+        for user_id in user_ids:
+            pairs += detector.detect(user_id)
+    logger.info(f"Marked {pairs} transfers for {len(user_ids)} users in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
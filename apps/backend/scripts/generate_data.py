@@ -0,0 +1,265 @@
+# apps/backend/scripts/generate_data.py
+"""
+Fill the database with synthetic users and transactions for load and
+scaling tests.
+
+    python scripts/generate_data.py --users 1000 --months 24 --seed 42
+
+Each user gets several accounts, a realistic mix of Chilean merchants with
+seasonal spending (Fiestas Patrias, Christmas, back to school), recurring
+bills and salary, plus rules and budgets. The same seed and --end-month
+always produce the same data. Transactions are written with executemany
+inserts in batches and each user is committed on its own, so an
+interrupted run resumes after the last complete user.
+Run `scripts/partitions.py ensure` afterwards on Postgres so old months
+get their own partitions instead of the default one.
+"""
+import argparse
+import hashlib
+import logging
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import insert
+from sqlmodel import Session, select
+
+from src.core.database import engine
+from src.models.models import (
+    Account, AccountType, Budget, Category, Rule, Transaction, TransactionSource, User
+)
+from src.services.seeds import seed_categories
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# (merchant, category, min amount, max amount, visits per month)
+MERCHANTS = [
+    ("LIDER", "Alimentación", 8000, 120000, 4),
+    ("JUMBO", "Alimentación", 10000, 150000, 2),
+    ("UNIMARC", "Alimentación", 3000, 60000, 3),
+    ("SANTA ISABEL", "Alimentación", 3000, 50000, 2),
+    ("TOTTUS", "Alimentación", 5000, 90000, 1),
+    ("COPEC", "Transporte", 15000, 60000, 2),
+    ("SHELL", "Transporte", 15000, 55000, 1),
+    ("UBER", "Transporte", 2500, 18000, 4),
+    ("CABIFY", "Transporte", 3000, 20000, 1),
+    ("METRO DE SANTIAGO", "Transporte", 800, 20000, 3),
+    ("FARMACIAS CRUZ VERDE", "Salud", 2000, 45000, 1),
+    ("SALCOBRAND", "Salud", 2000, 40000, 1),
+    ("FARMACIAS AHUMADA", "Salud", 2000, 35000, 0.5),
+    ("STARBUCKS", "Restaurantes", 3000, 9000, 3),
+    ("MCDONALDS", "Restaurantes", 4000, 15000, 2),
+    ("RAPPI", "Restaurantes", 8000, 35000, 3),
+    ("PEDIDOSYA", "Restaurantes", 8000, 30000, 2),
+    ("FALABELLA", "Compras", 10000, 250000, 1),
+    ("RIPLEY", "Compras", 10000, 200000, 0.7),
+    ("PARIS", "Compras", 8000, 150000, 0.7),
+    ("MERCADO LIBRE", "Compras", 5000, 180000, 1.5),
+    ("CINEMARK", "Entretenimiento", 5000, 25000, 0.8),
+    ("PUNTOTICKET", "Entretenimiento", 15000, 120000, 0.2),
+]
+
+# (merchant, category, amount, day of month); charged every month
+RECURRING = [
+    ("ENEL", "Vivienda", 35000, 12),
+    ("AGUAS ANDINAS", "Vivienda", 18000, 15),
+    ("METROGAS", "Vivienda", 25000, 18),
+    ("ENTEL", "Vivienda", 22990, 5),
+    ("NETFLIX", "Entretenimiento", 7990, 3),
+    ("SPOTIFY", "Entretenimiento", 5990, 9),
+    ("ISAPRE COLMENA", "Salud", 95000, 1),
+]
+
+# Spending multiplier by month: vacations, back to school, Fiestas Patrias, Christmas
+SEASONALITY = {1: 0.95, 2: 0.85, 3: 1.2, 9: 1.3, 11: 1.1, 12: 1.5}
+
+# (name, institution, type, payment method)
+ACCOUNTS = [
+    ("Tarjeta de Crédito", "bci", AccountType.CREDIT, "credit_card"),
+    ("Cuenta Corriente", "bancochile", AccountType.DEBIT, "debit_card"),
+    ("CuentaRUT", "bancoestado", AccountType.DEBIT, "debit_card"),
+    ("Tarjeta Santander", "santander", AccountType.CREDIT, "credit_card"),
+    ("Efectivo", "cash", AccountType.CASH, "cash"),
+]
+
+BUDGET_CATEGORIES = ["Alimentación", "Transporte", "Restaurantes", "Compras", "Entretenimiento"]
+
+# Last month generated unless --end-month is given; fixed so runs on
+# different days produce the same data
+DEFAULT_END_MONTH = date(2024, 12, 1)
+
+def month_range(end_month: date, months: int) -> List[date]:
+    first = end_month - relativedelta(months=months - 1)
+    return [first + relativedelta(months=i) for i in range(months)]
+
+def category_ids(session: Session) -> Dict[str, int]:
+    seed_categories(session)
+    return {
+        c.name: c.id
+        for c in session.exec(select(Category).where(Category.user_id == None)).all()
+    }
+
+def create_user(session: Session, rng: random.Random, index: int, prefix: str, categories: Dict[str, int]):
+    """User with accounts, rules and budgets; returns (user_id, accounts)"""
+    user_id = f"{prefix}-{index:07d}"
+    session.add(User(id=user_id, email=f"{user_id}@example.com"))
+
+    specs = [ACCOUNTS[0]] + rng.sample(ACCOUNTS[1:], rng.randint(1, 3))
+    accounts = [
+        Account(user_id=user_id, name=name, institution=institution, type=account_type)
+        for name, institution, account_type, _ in specs
+    ]
+    session.add_all(accounts)
+
+    for priority, (merchant, category, *_) in enumerate(rng.sample(MERCHANTS, 6)):
+        session.add(Rule(
+            user_id=user_id,
+            pattern=merchant,
+            field="merchant",
+            action="set_category",
+            value=str(categories[category]),
+            priority=priority
+        ))
+
+    for category in rng.sample(BUDGET_CATEGORIES, rng.randint(2, len(BUDGET_CATEGORIES))):
+        session.add(Budget(
+            user_id=user_id,
+            name=category,
+            amount=rng.randrange(50000, 400000, 10000),
+            category_id=categories[category],
+            start_month=date(2020, 1, 1)
+        ))
+
+    session.flush()
+    methods = {name: method for name, _, _, method in specs}
+    return user_id, [(account.id, methods[account.name]) for account in accounts]
+
+def user_transactions(
+    rng: random.Random,
+    user_id: str,
+    accounts: list,
+    months: List[date],
+    categories: Dict[str, int]
+) -> Iterator[dict]:
+    """Transaction rows for one user, month by month"""
+    # Each user has a spending level and a few favourite merchants
+    scale = rng.lognormvariate(0, 0.4)
+    salary = rng.randrange(600000, 4000000, 10000)
+    favourites = rng.sample(MERCHANTS, rng.randint(8, len(MERCHANTS)))
+    recurring = rng.sample(RECURRING, rng.randint(3, len(RECURRING)))
+    debit_account = next((a for a, method in accounts if method == "debit_card"), accounts[0][0])
+    count = 0
+
+    def row(txn_date, amount, merchant, category, account_id, method, source):
+        nonlocal count
+        count += 1
+        hash_input = f"{txn_date}|{amount}|{merchant}|{method}|{user_id}:{count}"
+        now = datetime.combine(txn_date, datetime.min.time()) + timedelta(hours=rng.randint(8, 22))
+        return {
+            "user_id": user_id,
+            "account_id": account_id,
+            "txn_date": txn_date,
+            "posted_at": now,
+            "amount": float(amount),
+            "currency": "CLP",
+            "description": f"Compra en {merchant}" if amount < 0 else merchant,
+            "source": source,
+            "merchant": merchant,
+            "category_id": categories.get(category),
+            "subcategory_id": None,
+            "payment_method": method,
+            "is_transfer": False,
+            "hash_dedupe": hashlib.sha256(hash_input.encode()).hexdigest(),
+            "created_at": now,
+            "updated_at": now,
+        }
+
+    for month in months:
+        days = (month + relativedelta(months=1) - month).days
+        season = SEASONALITY.get(month.month, 1.0)
+
+        payday = month.replace(day=min(30, days))
+        yield row(payday, salary, "REMUNERACION", "Ingresos",
+                  debit_account, "transfer", TransactionSource.IMPORT)
+
+        for merchant, category, amount, day in recurring:
+            txn_date = month.replace(day=min(day, days))
+            yield row(txn_date, -amount, merchant, category, accounts[0][0],
+                      accounts[0][1], TransactionSource.EMAIL)
+
+        for merchant, category, low, high, visits in favourites:
+            for _ in range(int(rng.expovariate(1) * visits * season * scale + 0.5)):
+                txn_date = month.replace(day=rng.randint(1, days))
+                account_id, method = rng.choice(accounts)
+                amount = round(rng.uniform(low, high) * min(season, 1.2), -1)
+                source = TransactionSource.EMAIL if method == "credit_card" else TransactionSource.IMPORT
+                yield row(txn_date, -amount, merchant, category, account_id, method, source)
+
+def generate(
+    users: int,
+    months: int,
+    end_month: date,
+    seed: int = 42,
+    batch_size: int = 5000,
+    prefix: str = "synthetic"
+) -> int:
+    """Generate `users` users with `months` of history; returns transactions written"""
+    month_list = month_range(end_month, months)
+    transactions = Transaction.__table__
+    total = 0
+
+    with Session(engine) as session:
+        categories = category_ids(session)
+
+        for index in range(users):
+            # Per-user generator so any user can be reproduced on its own
+            rng = random.Random(f"{seed}:{index}")
+            if session.get(User, f"{prefix}-{index:07d}"):
+                logger.info(f"Skipping existing user {prefix}-{index:07d}")
+                continue
+
+            # One commit per user: a user row exists only with all its transactions
+            user_id, accounts = create_user(session, rng, index, prefix, categories)
+            batch: List[dict] = []
+            for txn in user_transactions(rng, user_id, accounts, month_list, categories):
+                batch.append(txn)
+                if len(batch) >= batch_size:
+                    session.execute(insert(transactions), batch)
+                    total += len(batch)
+                    batch = []
+            if batch:
+                session.execute(insert(transactions), batch)
+                total += len(batch)
+            session.commit()
+
+            if (index + 1) % 100 == 0:
+                logger.info(f"{index + 1}/{users} users, {total} transactions")
+
+    return total
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate synthetic users and transactions")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--months", type=int, default=24, help="Months of history per user")
+    parser.add_argument("--end-month", type=date.fromisoformat, default=DEFAULT_END_MONTH,
+                        help=f"Last month generated (YYYY-MM-01, default {DEFAULT_END_MONTH})")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--prefix", default="synthetic", help="User id prefix")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    total = generate(args.users, args.months, args.end_month, args.seed, args.batch_size, args.prefix)
+    elapsed = time.perf_counter() - start
+    logger.info(f"Generated {total} transactions for {args.users} users in {elapsed:.1f}s "
+                f"({total / max(elapsed, 1e-9):.0f} rows/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# apps/backend/scripts/normalize_merchants.py
+"""
+Backfill transactions.merchant_id for history written before merchant
+normalization.
+
+    python scripts/normalize_merchants.py [--batch-size 5000]
+
+Walks transactions in id order, resolves each batch's distinct merchant
+strings in bulk and updates the batch with one executemany UPDATE.
+Safe to interrupt and re-run.
+"""
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import bindparam, update
+from sqlmodel import Session, select
+
+from src.core.database import engine
+from src.models.models import Transaction
+from src.services.merchant_service import MerchantNormalizer
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def backfill(session: Session, batch_size: int) -> int:
+    normalizer = MerchantNormalizer(session)
+    table = Transaction.__table__
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam("_id"), table.c.txn_date == bindparam("_txn_date"))
+        .values(merchant_id=bindparam("_merchant_id"))
+    )
+    last_id = 0
+    updated = 0
+
+    while True:
+        query = select(
+            Transaction.id, Transaction.txn_date, Transaction.merchant
+        ).where(
+            Transaction.id > last_id,
+            Transaction.merchant != None,
+            Transaction.merchant_id == None
+        ).order_by(Transaction.id).limit(batch_size)
+        rows = session.exec(query).all()
+        if not rows:
+            return updated
+
+        merchant_ids = normalizer.resolve_many(row.merchant for row in rows)
+        params = [
+            {"_id": row.id, "_txn_date": row.txn_date, "_merchant_id": merchant_ids[row.merchant]}
+            for row in rows if row.merchant in merchant_ids
+        ]
+        if params:
+            session.execute(statement, params)
+        session.commit()
+
+        last_id = rows[-1].id
+        updated += len(params)
+        logger.info(f"Normalized {updated} transactions (up to id {last_id})")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill canonical merchants")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with Session(engine) as session:
+        updated = backfill(session, args.batch_size)
+    logger.info(f"Done: {updated} transactions in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
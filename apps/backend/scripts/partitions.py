@@ -0,0 +1,58 @@
+# apps/backend/scripts/partitions.py
+"""
+Manage the monthly partitions of the transactions table.
+
+    python scripts/partitions.py ensure [--ahead 12]
+    python scripts/partitions.py detach --before 2023-01-01 [--archive-schema archive | --drop]
+    python scripts/partitions.py list
+
+Run `ensure` from cron (e.g. monthly) so future months always have a
+partition and rows that landed in the default partition get moved out.
+"""
+import argparse
+import logging
+import sys
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core.database import engine
+from src.services.partition_service import (
+    detach_partitions,
+    ensure_partitions,
+    list_partitions,
+    partition_name,
+)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Manage transactions partitions")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ensure = commands.add_parser("ensure", help="Create upcoming monthly partitions")
+    ensure.add_argument("--ahead", type=int, default=12, help="Months ahead of the current one")
+
+    detach = commands.add_parser("detach", help="Detach partitions older than a date")
+    detach.add_argument("--before", type=date.fromisoformat, required=True)
+    retention = detach.add_mutually_exclusive_group()
+    retention.add_argument("--archive-schema", help="Move detached tables to this schema")
+    retention.add_argument("--drop", action="store_true", help="Drop detached tables")
+
+    commands.add_parser("list", help="List attached monthly partitions")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    with engine.begin() as conn:
+        if args.command == "ensure":
+            created = ensure_partitions(conn, args.ahead)
+            print(f"Created {len(created)} partitions")
+        elif args.command == "detach":
+            detached = detach_partitions(conn, args.before, args.archive_schema, args.drop)
+            print(f"Detached {len(detached)} partitions")
+        else:
+            for month in list_partitions(conn):
+                print(partition_name(month))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+# apps/backend/src/api/accounts_router.py
+from fastapi import APIRouter, Depends
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from pydantic import BaseModel
+from typing import Optional
+
+from src.core.database import get_session
+from src.api.dependencies import get_async_read_session
+from src.core.auth import get_current_user_id
+from src.models.models import Account, AccountType
+
+router = APIRouter()
+
+class AccountCreate(BaseModel):
+    name: str
+    institution: str
+    type: AccountType
+    currency: str = "CLP"
+
+@router.get("")
+async def list_accounts(
+    user_id: str = Depends(get_current_user_id),
+    session: AsyncSession = Depends(get_async_read_session)
+):
+    return (await session.exec(select(Account).where(Account.user_id == user_id))).all()
+
+@router.post("", status_code=201)
+def create_account(
+    data: AccountCreate,
+    user_id: str = Depends(get_current_user_id),
+    session: Session = Depends(get_session)
+):
+    account = Account(user_id=user_id, **data.dict())
+    session.add(account)
+    session.commit()
+    session.refresh(account)
+    return account
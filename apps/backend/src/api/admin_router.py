@@ -0,0 +1,45 @@
+# apps/backend/src/api/admin_router.py
+from fastapi import APIRouter, Depends
+from fastapi.responses import FileResponse
+from pathlib import Path
+from typing import List
+import json
+import re
+
+from src.core.auth import require_admin
+from src.core.config import settings
+from src.core.errors import NotFoundError
+
+router = APIRouter()
+
+PROFILE_FILE_RE = re.compile(r"^[\w-]+\.(json|collapsed)$")
+
+@router.get("/profiles")
+def list_profiles(user_id: str = Depends(require_admin)) -> List[dict]:
+    """List stored request profiles, newest first"""
+    directory = Path(settings.PROFILE_DIR)
+    if not directory.exists():
+        return []
+    
+    profiles = []
+    for path in sorted(directory.glob("*.json"), reverse=True):
+        with open(path, encoding="utf-8") as f:
+            report = json.load(f)
+        profiles.append({
+            "id": report["id"],
+            "method": report["method"],
+            "path": report["path"],
+            "duration_seconds": report["duration_seconds"],
+            "queries": report["queries"]["count"],
+        })
+    return profiles
+
+@router.get("/profiles/{filename}")
+def download_profile(filename: str, user_id: str = Depends(require_admin)):
+    """Download a profile report (.json) or its collapsed stacks (.collapsed)"""
+    path = Path(settings.PROFILE_DIR) / filename
+    if not PROFILE_FILE_RE.match(filename) or not path.exists():
+        raise NotFoundError("Profile not found")
+    
+    media_type = "application/json" if filename.endswith(".json") else "text/plain"
+    return FileResponse(path, media_type=media_type, filename=filename)
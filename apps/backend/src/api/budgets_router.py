@@ -0,0 +1,81 @@
+# apps/backend/src/api/budgets_router.py
+from fastapi import APIRouter, Depends, Query
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import List, Optional
+from pydantic import BaseModel
+from datetime import date
+
+from src.core.database import get_session
+from src.api.dependencies import get_async_read_session
+from src.core.auth import get_current_user_id
+from src.core.errors import NotFoundError
+from src.models.models import Budget, BudgetPeriod
+from src.services.budget_service import BudgetTracker
+
+router = APIRouter()
+
+class BudgetCreate(BaseModel):
+    name: str
+    amount: float
+    category_id: int
+    start_month: date
+
+class BudgetStatus(BaseModel):
+    budget_id: int
+    name: str
+    category_id: Optional[int]
+    amount: float
+    spent: float
+    remaining: float
+    used: float  # spent / amount
+    alerted: float  # highest alert threshold reached this month
+
+@router.get("")
+async def list_budgets(
+    user_id: str = Depends(get_current_user_id),
+    session: AsyncSession = Depends(get_async_read_session)
+):
+    return (await session.exec(select(Budget).where(Budget.user_id == user_id))).all()
+
+@router.get("/status", response_model=List[BudgetStatus])
+def budget_status(
+    month: Optional[str] = Query(None, regex=r"^\d{4}-\d{2}$"),
+    user_id: str = Depends(get_current_user_id),
+    session: Session = Depends(get_session)
+):
+    """
+    Spending against each budget for a month (current month by default),
+    read from the running counters instead of aggregating transactions
+    """
+    if month:
+        year, mon = map(int, month.split("-"))
+        day = date(year, mon, 1)
+    else:
+        day = date.today()
+    
+    return [
+        BudgetStatus(
+            budget_id=budget.id,
+            name=budget.name,
+            category_id=budget.category_id,
+            amount=budget.amount,
+            spent=counter.spent,
+            remaining=budget.amount - counter.spent,
+            used=counter.spent / budget.amount if budget.amount else 0,
+            alerted=counter.alerted
+        )
+        for budget, counter in BudgetTracker(session).status(user_id, day)
+    ]
+
+@router.post("", status_code=201)
+def create_budget(
+    data: BudgetCreate,
+    user_id: str = Depends(get_current_user_id),
+    session: Session = Depends(get_session)
+):
+    budget = Budget(user_id=user_id, **data.dict())
+    session.add(budget)
+    session.commit()
+    session.refresh(budget)
+    return budget
@@ -0,0 +1,41 @@
+# apps/backend/src/api/categories_router.py
+from fastapi import APIRouter, Depends
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from pydantic import BaseModel
+from typing import Optional
+
+from src.core.database import get_session
+from src.api.dependencies import get_async_read_session
+from src.core.auth import get_current_user_id
+from src.models.models import Category
+
+router = APIRouter()
+
+class CategoryCreate(BaseModel):
+    name: str
+    parent_id: Optional[int] = None
+
+@router.get("")
+async def list_categories(
+    user_id: str = Depends(get_current_user_id),
+    session: AsyncSession = Depends(get_async_read_session)
+):
+    # Include global categories (user_id is NULL) and user's own
+    return (await session.exec(
+        select(Category).where(
+            (Category.user_id == user_id) | (Category.user_id == None)
+        )
+    )).all()
+
+@router.post("", status_code=201)
+def create_category(
+    data: CategoryCreate,
+    user_id: str = Depends(get_current_user_id),
+    session: Session = Depends(get_session)
+):
+    category = Category(user_id=user_id, **data.dict())
+    session.add(category)
+    session.commit()
+    session.refresh(category)
+    return category
@@ -0,0 +1,80 @@
+# apps/backend/src/api/dashboard_router.py
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from pydantic import BaseModel
+from typing import Awaitable, Callable, List, TypeVar
+from datetime import date
+import asyncio
+
+from src.api.dependencies import get_async_read_session_factory
+from src.core.auth import get_current_user_id
+from src.models.models import Transaction, Category, Account, Budget
+from src.api.reports_router import MonthlyReport, build_monthly_report
+from src.api.transactions_api import RESPONSE_COLUMNS, TransactionResponse, row_to_response
+
+router = APIRouter(default_response_class=ORJSONResponse)
+
+T = TypeVar("T")
+
+class DashboardResponse(BaseModel):
+    month: str
+    report: MonthlyReport
+    recent_transactions: List[TransactionResponse]
+    categories: List[Category]
+    accounts: List[Account]
+    budgets: List[Budget]
+
+@router.get("", response_model=DashboardResponse)
+async def dashboard(
+    month: str = Query(None, regex=r"^\d{4}-\d{2}$"),
+    recent: int = Query(20, ge=0, le=100),
+    user_id: str = Depends(get_current_user_id),
+    session_factory: Callable[[], AsyncSession] = Depends(get_async_read_session_factory)
+):
+    """
+    Everything the dashboard page shows in one round trip: the month report
+    (current month by default), latest transactions, categories, accounts
+    and budgets. Auth and replica routing are resolved once. The report and
+    the recent transactions run concurrently, each on its own pooled
+    connection; the three small lists share a third one, so a request never
+    holds more than three connections of the async pool.
+    """
+    month = month or f"{date.today():%Y-%m}"
+
+    async def run(query: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        async with session_factory() as session:
+            return await query(session)
+
+    async def recent_transactions(session: AsyncSession):
+        rows = (await session.exec(
+            select(*RESPONSE_COLUMNS)
+            .where(Transaction.user_id == user_id)
+            .order_by(Transaction.txn_date.desc(), Transaction.created_at.desc())
+            .limit(recent)
+        )).all()
+        return [row_to_response(row) for row in rows]
+
+    async def lists(session: AsyncSession):
+        categories = (await session.exec(select(Category).where(
+            (Category.user_id == user_id) | (Category.user_id == None)
+        ))).all()
+        accounts = (await session.exec(select(Account).where(Account.user_id == user_id))).all()
+        budgets = (await session.exec(select(Budget).where(Budget.user_id == user_id))).all()
+        return categories, accounts, budgets
+
+    report, transactions, (categories, accounts, budgets) = await asyncio.gather(
+        run(lambda s: build_monthly_report(s, user_id, month)),
+        run(recent_transactions),
+        run(lists),
+    )
+
+    return DashboardResponse(
+        month=month,
+        report=report,
+        recent_transactions=transactions,
+        categories=categories,
+        accounts=accounts,
+        budgets=budgets
+    )
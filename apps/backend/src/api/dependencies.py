@@ -0,0 +1,25 @@
+# apps/backend/src/api/dependencies.py
+from fastapi import Depends
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.auth import get_current_user_id
+from src.core.database import read_engine, async_read_engine
+
+def get_read_session(user_id: str = Depends(get_current_user_id)):
+    """Session for read-only routes: the replica unless user_id just wrote"""
+    with Session(read_engine(user_id)) as session:
+        yield session
+
+async def get_async_read_session(user_id: str = Depends(get_current_user_id)):
+    """Async session for read-only routes: the replica unless user_id just wrote"""
+    async with AsyncSession(async_read_engine(user_id), expire_on_commit=False) as session:
+        yield session
+
+def get_async_read_session_factory(user_id: str = Depends(get_current_user_id)):
+    """
+    Factory of async read sessions on one engine, for routes that run several
+    queries concurrently (an AsyncSession runs one statement at a time)
+    """
+    engine = async_read_engine(user_id)
+    return lambda: AsyncSession(engine, expire_on_commit=False)
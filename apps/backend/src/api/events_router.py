@@ -0,0 +1,65 @@
+# apps/backend/src/api/events_router.py
+from fastapi import APIRouter, Depends, Header, Request
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Optional
+import asyncio
+import orjson
+
+from src.core.auth import get_stream_user_id
+from src.core.config import settings
+from src.core.events import Event, event_bus
+
+router = APIRouter()
+
+def format_event(item: Event) -> str:
+    return f"id: {item.id}\nevent: {item.type}\ndata: {orjson.dumps(item.data).decode()}\n\n"
+
+@router.get("")
+async def event_stream(
+    request: Request,
+    user_id: str = Depends(get_stream_user_id),
+    last_event_id: Optional[str] = Header(None)
+):
+    """
+    Server-sent events for the user: transaction.created,
+    transactions.imported, rules.applied and budget.threshold, each with a
+    JSON payload. Browsers reconnect on their own and send Last-Event-ID,
+    so events published while the connection was down are replayed.
+    """
+    try:
+        last_id = int(last_event_id or 0)
+    except ValueError:
+        last_id = 0
+
+    async def stream() -> AsyncIterator[str]:
+        nonlocal last_id
+        # Subscribe before replaying so nothing published in between is lost
+        subscription = event_bus.subscribe(user_id)
+        try:
+            yield "retry: 5000\n\n"
+            for item in event_bus.replay(user_id, last_id):
+                last_id = item.id
+                yield format_event(item)
+
+            while True:
+                try:
+                    item = await asyncio.wait_for(
+                        subscription.queue.get(), timeout=settings.EVENT_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    # Comment line: keeps proxies from closing an idle connection
+                    yield ": keep-alive\n\n"
+                    continue
+                if item.id > last_id:
+                    last_id = item.id
+                    yield format_event(item)
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
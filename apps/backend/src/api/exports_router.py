@@ -1,22 +1,23 @@
 # apps/backend/src/api/exports.py
 from fastapi import APIRouter, Depends, Query
 from fastapi.responses import StreamingResponse
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from datetime import date
 from io import StringIO
 import csv
 
-from src.core.database import get_session
-from src.core.auth_jwt import get_current_user_id
+from src.api.dependencies import get_async_read_session
+from src.core.auth import get_current_user_id
 from src.models.models import Transaction, Category, Account
 
 router = APIRouter()
 
 @router.get("/monthly.csv")
-def export_monthly_csv(
+async def export_monthly_csv(
     month: str = Query(..., regex=r"^\d{4}-\d{2}$"),
     user_id: str = Depends(get_current_user_id),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_read_session)
 ):
     """Export transactions as CSV with Spanish headers"""
     year, mon = map(int, month.split("-"))
@@ -27,14 +28,28 @@ def export_monthly_csv(
     else:
         end_date = date(year, mon + 1, 1)
     
-    # Fetch transactions
-    query = select(Transaction).where(
+    # Fetch transactions with category and account names joined in
+    query = select(
+        Transaction.txn_date,
+        Transaction.amount,
+        Transaction.currency,
+        Transaction.description,
+        Transaction.merchant,
+        Transaction.payment_method,
+        Transaction.source,
+        Category.name.label('category_name'),
+        Account.name.label('account_name')
+    ).outerjoin(
+        Category, Category.id == Transaction.category_id
+    ).outerjoin(
+        Account, Account.id == Transaction.account_id
+    ).where(
         Transaction.user_id == user_id,
         Transaction.txn_date >= start_date,
         Transaction.txn_date < end_date
     ).order_by(Transaction.txn_date.desc())
     
-    transactions = session.exec(query).all()
+    transactions = (await session.exec(query)).all()
     
     # Build CSV
     output = StringIO()
@@ -55,28 +70,14 @@ def export_monthly_csv(
     
     # Write data
     for txn in transactions:
-        # Get category name
-        cat_name = ''
-        if txn.category_id:
-            cat = session.get(Category, txn.category_id)
-            if cat:
-                cat_name = cat.name
-        
-        # Get account name
-        acc_name = ''
-        if txn.account_id:
-            acc = session.get(Account, txn.account_id)
-            if acc:
-                acc_name = acc.name
-        
         writer.writerow([
             txn.txn_date.isoformat(),
             f"{txn.amount:.2f}",
             txn.currency,
             txn.description,
             txn.merchant or '',
-            cat_name,
-            acc_name,
+            txn.category_name or '',
+            txn.account_name or '',
             txn.payment_method or '',
             txn.source.value
         ])
@@ -6,9 +6,9 @@ from typing import Optional
 import logging
 
 from src.core.database import get_session
-from src.core.auth_jwt import require_admin
+from src.core.auth import require_admin
 from src.core.config import settings
-from src.services.ingest import IngestService
+from src.services.ingest_service import IngestService
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -27,8 +27,7 @@ class IngestResponse(BaseModel):
 @router.post("/webhook")
 async def gmail_webhook(
     payload: WebhookPayload,
-    x_webhook_secret: Optional[str] = Header(None),
-    session: Session = Depends(get_session)
+    x_webhook_secret: Optional[str] = Header(None)
 ):
     """Receive Gmail push notifications"""
     # Validate webhook secret
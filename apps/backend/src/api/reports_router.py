@@ -1,14 +1,16 @@
 # apps/backend/src/api/reports.py
 from fastapi import APIRouter, Depends, Query
-from sqlmodel import Session, select, func
+from sqlmodel import select, func
+from sqlmodel.ext.asyncio.session import AsyncSession
 from pydantic import BaseModel
 from typing import Dict, List, Optional
 from datetime import date, datetime
 from dateutil.relativedelta import relativedelta
 
-from src.core.database import get_session
-from src.core.auth_jwt import get_current_user_id
-from src.models.models import Transaction, Category
+from src.api.dependencies import get_async_read_session
+from src.core.auth import get_current_user_id
+from src.models.models import Transaction, Category, CategoryClosure, Merchant, RecurringSeries
+from src.services.recurring_service import active_series
 
 router = APIRouter()
 
@@ -18,6 +20,25 @@ class CategoryTotal(BaseModel):
     total: float
     count: int
 
+class MerchantTotal(BaseModel):
+    merchant_id: int
+    merchant_name: str
+    total: float
+    count: int
+
+class Subscription(BaseModel):
+    id: int
+    merchant_id: int
+    merchant_name: str
+    cadence: str
+    amount: float
+    monthly_amount: float
+    occurrences: int
+    first_date: date
+    last_date: date
+    next_expected: date
+    active: bool
+
 class MonthlyReport(BaseModel):
     month: str
     total_income: float
@@ -27,15 +48,26 @@ class MonthlyReport(BaseModel):
     previous_month_delta: Optional[float]
 
 @router.get("/monthly", response_model=MonthlyReport)
-def monthly_report(
+async def monthly_report(
     month: str = Query(..., regex=r"^\d{4}-\d{2}$"),
+    rollup: bool = False,
     user_id: str = Depends(get_current_user_id),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_read_session)
 ):
     """
     Generate monthly financial report.
     Optimized with aggregations and indices.
+    With rollup=true, subcategory totals are folded into their top-level category.
     """
+    return await build_monthly_report(session, user_id, month, rollup)
+
+async def build_monthly_report(
+    session: AsyncSession,
+    user_id: str,
+    month: str,
+    rollup: bool = False
+) -> MonthlyReport:
+    """MonthlyReport for a YYYY-MM month; shared with /dashboard"""
     year, mon = map(int, month.split("-"))
     start_date = date(year, mon, 1)
     
@@ -46,37 +78,53 @@ def monthly_report(
         end_date = date(year, mon + 1, 1)
     
     # Get transactions for this month
+    if rollup:
+        # Top-level ancestor of every category, via the closure table
+        roots = select(
+            CategoryClosure.ancestor_id,
+            CategoryClosure.descendant_id
+        ).join(
+            Category, Category.id == CategoryClosure.ancestor_id
+        ).where(Category.parent_id == None).subquery()
+        group_column = roots.c.ancestor_id
+    else:
+        group_column = Transaction.category_id
+    
     query = select(
-        Transaction.category_id,
+        group_column.label('category_id'),
         func.sum(Transaction.amount).label('total'),
         func.count(Transaction.id).label('count')
-    ).where(
+    ).select_from(Transaction).where(
         Transaction.user_id == user_id,
         Transaction.txn_date >= start_date,
-        Transaction.txn_date < end_date
-    ).group_by(Transaction.category_id)
+        Transaction.txn_date < end_date,
+        Transaction.is_transfer == False
+    ).group_by(group_column)
     
-    results = session.exec(query).all()
+    if rollup:
+        query = query.outerjoin(roots, roots.c.descendant_id == Transaction.category_id)
+    
+    results = (await session.exec(query)).all()
     
     # Calculate totals
     total_expenses = sum(r.total for r in results if r.total < 0)
     total_income = sum(r.total for r in results if r.total > 0)
     
-    # Get category names
-    by_category = []
-    for r in results:
-        cat_name = None
-        if r.category_id:
-            cat = session.get(Category, r.category_id)
-            if cat:
-                cat_name = cat.name
-        
-        by_category.append(CategoryTotal(
+    # Get category names in one query
+    category_ids = {r.category_id for r in results if r.category_id}
+    names = dict((await session.exec(
+        select(Category.id, Category.name).where(Category.id.in_(category_ids))
+    )).all()) if category_ids else {}
+    
+    by_category = [
+        CategoryTotal(
             category_id=r.category_id,
-            category_name=cat_name,
+            category_name=names.get(r.category_id),
             total=r.total,
             count=r.count
-        ))
+        )
+        for r in results
+    ]
     
     # Calculate delta vs previous month
     prev_month = start_date - relativedelta(months=1)
@@ -87,10 +135,11 @@ def monthly_report(
     ).where(
         Transaction.user_id == user_id,
         Transaction.txn_date >= prev_month,
-        Transaction.txn_date < prev_end
+        Transaction.txn_date < prev_end,
+        Transaction.is_transfer == False
     )
     
-    prev_result = session.exec(prev_query).first()
+    prev_result = (await session.exec(prev_query)).first()
     prev_net = prev_result if prev_result else 0
     
     current_net = total_income + total_expenses
@@ -104,3 +153,73 @@ def monthly_report(
         by_category=by_category,
         previous_month_delta=delta
     )
+
+@router.get("/merchants", response_model=List[MerchantTotal])
+async def merchant_report(
+    month: str = Query(..., regex=r"^\d{4}-\d{2}$"),
+    limit: int = Query(10, le=100),
+    user_id: str = Depends(get_current_user_id),
+    session: AsyncSession = Depends(get_async_read_session)
+):
+    """Top merchants by spending in a month, grouped by canonical merchant"""
+    year, mon = map(int, month.split("-"))
+    start_date = date(year, mon, 1)
+    end_date = start_date + relativedelta(months=1)
+    
+    total = func.sum(Transaction.amount)
+    query = select(
+        Merchant.id,
+        Merchant.name,
+        total.label('total'),
+        func.count(Transaction.id).label('count')
+    ).join(
+        Merchant, Merchant.id == Transaction.merchant_id
+    ).where(
+        Transaction.user_id == user_id,
+        Transaction.txn_date >= start_date,
+        Transaction.txn_date < end_date,
+        Transaction.amount < 0,
+        Transaction.is_transfer == False
+    ).group_by(Merchant.id, Merchant.name).order_by(total).limit(limit)
+    
+    return [
+        MerchantTotal(merchant_id=r.id, merchant_name=r.name, total=r.total, count=r.count)
+        for r in (await session.exec(query)).all()
+    ]
+
+@router.get("/subscriptions", response_model=List[Subscription])
+async def subscriptions(
+    include_inactive: bool = False,
+    user_id: str = Depends(get_current_user_id),
+    session: AsyncSession = Depends(get_async_read_session)
+):
+    """
+    Recurring charges found by scripts/detect_recurring.py, largest monthly
+    cost first. Series whose next charge is overdue are hidden unless
+    include_inactive is set.
+    """
+    query = select(RecurringSeries, Merchant.name).join(
+        Merchant, Merchant.id == RecurringSeries.merchant_id
+    ).where(RecurringSeries.user_id == user_id)
+    
+    today = date.today()
+    result = []
+    for series, merchant_name in (await session.exec(query)).all():
+        active = active_series(series, today)
+        if not active and not include_inactive:
+            continue
+        result.append(Subscription(
+            id=series.id,
+            merchant_id=series.merchant_id,
+            merchant_name=merchant_name,
+            cadence=series.cadence,
+            amount=series.amount,
+            monthly_amount=round(series.amount * 30 / series.period_days, 2),
+            occurrences=series.occurrences,
+            first_date=series.first_date,
+            last_date=series.last_date,
+            next_expected=series.next_expected,
+            active=active
+        ))
+    
+    return sorted(result, key=lambda s: s.monthly_amount)
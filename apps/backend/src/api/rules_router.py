@@ -0,0 +1,90 @@
+# apps/backend/src/api/rules_router.py
+from fastapi import APIRouter, Depends
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from pydantic import BaseModel
+from typing import List
+import re
+import logging
+
+from src.core.database import get_session
+from src.api.dependencies import get_async_read_session
+from src.core.auth import get_current_user_id
+from src.core.events import RULES_APPLIED, publish_after_commit
+from src.models.models import Rule, Transaction
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+class RuleCreate(BaseModel):
+    pattern: str
+    field: str  # merchant, description, amount
+    action: str  # set_category, set_subcategory
+    value: str
+    priority: int = 0
+
+class ApplyRulesResponse(BaseModel):
+    updated: int
+
+@router.get("")
+async def list_rules(
+    user_id: str = Depends(get_current_user_id),
+    session: AsyncSession = Depends(get_async_read_session)
+):
+    return (await session.exec(
+        select(Rule).where(Rule.user_id == user_id).order_by(Rule.priority.desc())
+    )).all()
+
+@router.post("", status_code=201)
+def create_rule(
+    data: RuleCreate,
+    user_id: str = Depends(get_current_user_id),
+    session: Session = Depends(get_session)
+):
+    rule = Rule(user_id=user_id, **data.dict())
+    session.add(rule)
+    session.commit()
+    session.refresh(rule)
+    return rule
+
+@router.post("/apply", response_model=ApplyRulesResponse)
+def apply_rules(
+    user_id: str = Depends(get_current_user_id),
+    session: Session = Depends(get_session)
+):
+    """Apply all rules to existing transactions"""
+    rules = session.exec(
+        select(Rule).where(Rule.user_id == user_id).order_by(Rule.priority.desc())
+    ).all()
+    
+    transactions = session.exec(
+        select(Transaction).where(Transaction.user_id == user_id)
+    ).all()
+    
+    updated = 0
+    
+    for txn in transactions:
+        for rule in rules:
+            # Get field value
+            field_value = getattr(txn, rule.field, None)
+            if not field_value:
+                continue
+            
+            # Check if pattern matches
+            if re.search(rule.pattern, str(field_value), re.IGNORECASE):
+                # Apply action
+                if rule.action == "set_category":
+                    txn.category_id = int(rule.value)
+                    txn.category_auto = False
+                    updated += 1
+                elif rule.action == "set_subcategory":
+                    txn.subcategory_id = int(rule.value)
+                    updated += 1
+                
+                break  # Apply only first matching rule
+    
+    publish_after_commit(session, user_id, RULES_APPLIED, {"updated": updated})
+    session.commit()
+    logger.info(f"Applied rules, updated {updated} transactions")
+    
+    return ApplyRulesResponse(updated=updated)
@@ -0,0 +1,109 @@
+# apps/backend/src/api/sync_router.py
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
+from sqlmodel import Session, select, and_, or_
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+
+from src.api.dependencies import get_read_session
+from src.core.auth import get_current_user_id
+from src.core.errors import ValidationError
+from src.models.models import Transaction, Category, Account, Budget, Tombstone
+from src.api.transactions_api import RESPONSE_COLUMNS, row_to_response
+
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Rows committed by transactions that started before a token was issued can
+# carry an updated_at slightly older than the token; re-send that window.
+SYNC_OVERLAP = timedelta(seconds=30)
+
+def _parse_token(token: Optional[str]) -> Tuple[datetime, int]:
+    """Tokens are '<updated_at iso>|<last transaction id>'"""
+    if not token:
+        return datetime.min, 0
+    try:
+        ts, last_id = token.split("|")
+        return datetime.fromisoformat(ts), int(last_id)
+    except ValueError:
+        raise ValidationError("Invalid sync token")
+
+def _make_token(ts: datetime, last_id: int) -> str:
+    return f"{ts.isoformat()}|{last_id}"
+
+@router.get("")
+def sync_changes(
+    since: Optional[str] = None,
+    limit: int = Query(1000, ge=1, le=5000),
+    user_id: str = Depends(get_current_user_id),
+    session: Session = Depends(get_read_session)
+):
+    """
+    Change feed for offline clients.
+    Returns transactions, categories, accounts and budgets created or updated
+    since the sync token, plus ids deleted since then. Without a token the
+    full dataset is returned. Transactions are paged by (updated_at, id):
+    while has_more is true, call again with the returned token.
+    """
+    now = datetime.utcnow()
+    since_ts, since_id = _parse_token(since)
+    
+    transactions = session.exec(
+        select(*RESPONSE_COLUMNS, Transaction.updated_at)
+        .where(
+            Transaction.user_id == user_id,
+            or_(
+                Transaction.updated_at > since_ts,
+                and_(Transaction.updated_at == since_ts, Transaction.id > since_id)
+            )
+        )
+        .order_by(Transaction.updated_at, Transaction.id)
+        .limit(limit + 1)
+    ).all()
+    
+    has_more = len(transactions) > limit
+    if has_more:
+        transactions = transactions[:limit]
+        last = transactions[-1]
+        token = _make_token(last.updated_at, last.id)
+    else:
+        token = _make_token(now - SYNC_OVERLAP, 0)
+    
+    categories = session.exec(
+        select(Category).where(
+            (Category.user_id == user_id) | (Category.user_id == None),
+            Category.updated_at >= since_ts
+        )
+    ).all()
+    accounts = session.exec(
+        select(Account).where(Account.user_id == user_id, Account.updated_at >= since_ts)
+    ).all()
+    budgets = session.exec(
+        select(Budget).where(Budget.user_id == user_id, Budget.updated_at >= since_ts)
+    ).all()
+    
+    deleted: Dict[str, List[int]] = {
+        "transactions": [],
+        "categories": [],
+        "accounts": [],
+        "budgets": [],
+    }
+    if since:
+        tombstones = session.exec(
+            select(Tombstone.entity, Tombstone.entity_id).where(
+                (Tombstone.user_id == user_id) | (Tombstone.user_id == None),
+                Tombstone.deleted_at >= since_ts
+            )
+        ).all()
+        for entity, entity_id in tombstones:
+            deleted.setdefault(entity, []).append(entity_id)
+    
+    return {
+        "token": token,
+        "has_more": has_more,
+        "full": since is None,
+        "transactions": [row_to_response(row) for row in transactions],
+        "categories": [c.model_dump() for c in categories],
+        "accounts": [a.model_dump() for a in accounts],
+        "budgets": [b.model_dump() for b in budgets],
+        "deleted": deleted,
+    }
@@ -1,17 +1,31 @@
 # apps/backend/src/api/transactions.py
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, Response
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import update
 from typing import Optional, List
 from datetime import date
+import codecs
 import hashlib
 
-from src.core.database import get_session
-from src.core.auth_jwt import get_current_user_id
-from src.core.errors import NotFoundError
-from src.models.models import Transaction, TransactionSource
-from pydantic import BaseModel
+from src.core.database import get_session, mark_written
+from src.api.dependencies import get_async_read_session
+from src.core.auth import get_current_user_id
+from src.core.errors import NotFoundError, ValidationError
+from src.core.events import TRANSACTION_CREATED, publish_after_commit, transaction_data
+from src.models.models import (
+    Transaction, TransactionSource, Account, Category, CategoryClosure, TransactionPayload
+)
+from src.services.import_service import ImportFormat, StatementImporter
+from src.services.merchant_service import MerchantNormalizer
+from src.services.categorizer_service import CategorizerService
+from src.services.transfer_service import TransferDetector
+from src.services.budget_service import BudgetTracker
+from pydantic import BaseModel, Field
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 class TransactionCreate(BaseModel):
     account_id: int
@@ -38,8 +52,105 @@ class TransactionResponse(BaseModel):
     is_transfer: bool
     source: str
 
+# Columns needed for TransactionResponse; read paths select only these so
+# the unused columns are never fetched or hydrated.
+RESPONSE_COLUMNS = (
+    Transaction.id,
+    Transaction.account_id,
+    Transaction.txn_date,
+    Transaction.amount,
+    Transaction.currency,
+    Transaction.description,
+    Transaction.merchant,
+    Transaction.category_id,
+    Transaction.payment_method,
+    Transaction.is_transfer,
+    Transaction.source,
+)
+
+def row_to_response(row) -> dict:
+    """Map a RESPONSE_COLUMNS row (or Transaction) to a TransactionResponse dict"""
+    data = {column.key: getattr(row, column.key) for column in RESPONSE_COLUMNS}
+    data["source"] = data["source"].value
+    return data
+
+class TransactionPayloadResponse(BaseModel):
+    transaction_id: int
+    payload: Optional[dict]
+
+class ImportResponse(BaseModel):
+    processed: int
+    created: int
+    duplicates: int
+    failed: int
+    transfers: int
+
+class TransferDetectResponse(BaseModel):
+    transfers: int
+
+class CategorizeResponse(BaseModel):
+    trained_on: int
+    scored: int
+    categorized: int
+
+class TransactionFilter(BaseModel):
+    month: Optional[str] = Field(None, pattern=r"^\d{4}-\d{2}$")
+    category_id: Optional[int] = None
+    account_id: Optional[int] = None
+    method: Optional[str] = None
+    search: Optional[str] = None
+
+class TransactionChanges(BaseModel):
+    category_id: Optional[int] = None
+    subcategory_id: Optional[int] = None
+    merchant: Optional[str] = None
+    payment_method: Optional[str] = None
+    is_transfer: Optional[bool] = None
+
+class BulkUpdateRequest(BaseModel):
+    ids: Optional[List[int]] = None
+    filter: Optional[TransactionFilter] = None
+    changes: TransactionChanges
+
+class BulkUpdateResponse(BaseModel):
+    updated: int
+
+def _filter_conditions(user_id: str, filters: TransactionFilter) -> list:
+    """WHERE clauses shared by list_transactions and bulk_update_transactions"""
+    conditions = [Transaction.user_id == user_id]
+    
+    if filters.month:
+        year, mon = map(int, filters.month.split("-"))
+        conditions.append(Transaction.txn_date >= date(year, mon, 1))
+        if mon == 12:
+            conditions.append(Transaction.txn_date < date(year + 1, 1, 1))
+        else:
+            conditions.append(Transaction.txn_date < date(year, mon + 1, 1))
+    
+    if filters.category_id:
+        # The category and all of its subcategories
+        conditions.append(Transaction.category_id.in_(
+            select(CategoryClosure.descendant_id)
+            .where(CategoryClosure.ancestor_id == filters.category_id)
+        ))
+    
+    if filters.account_id:
+        conditions.append(Transaction.account_id == filters.account_id)
+    
+    if filters.method:
+        conditions.append(Transaction.payment_method == filters.method)
+    
+    if filters.search:
+        search_term = f"%{filters.search}%"
+        conditions.append(
+            (Transaction.description.ilike(search_term)) | 
+            (Transaction.merchant.ilike(search_term))
+        )
+    
+    return conditions
+
 @router.get("", response_model=List[TransactionResponse])
-def list_transactions(
+async def list_transactions(
     month: Optional[str] = Query(None, regex=r"^\d{4}-\d{2}$"),
     category_id: Optional[int] = None,
     account_id: Optional[int] = None,
@@ -48,56 +159,116 @@ def list_transactions(
     limit: int = Query(100, le=500),
     offset: int = 0,
     user_id: str = Depends(get_current_user_id),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_read_session)
 ):
     """List transactions with filters"""
-    query = select(Transaction).where(Transaction.user_id == user_id)
+    filters = TransactionFilter(
+        month=month,
+        category_id=category_id,
+        account_id=account_id,
+        method=method,
+        search=search
+    )
+    query = select(*RESPONSE_COLUMNS).where(*_filter_conditions(user_id, filters))
     
-    if month:
-        year, mon = month.split("-")
-        query = query.where(
-            Transaction.txn_date >= date(int(year), int(mon), 1)
-        )
-        # Simple month end (could improve)
-        if int(mon) == 12:
-            query = query.where(Transaction.txn_date < date(int(year) + 1, 1, 1))
-        else:
-            query = query.where(Transaction.txn_date < date(int(year), int(mon) + 1, 1))
+    query = query.order_by(Transaction.txn_date.desc(), Transaction.created_at.desc())
+    query = query.offset(offset).limit(limit)
+    
+    rows = (await session.exec(query)).all()
     
-    if category_id:
-        query = query.where(Transaction.category_id == category_id)
+    # Rows already match TransactionResponse; skip re-validation
+    return ORJSONResponse([row_to_response(row) for row in rows])
+
+@router.patch("/bulk", response_model=BulkUpdateResponse)
+def bulk_update_transactions(
+    data: BulkUpdateRequest,
+    user_id: str = Depends(get_current_user_id),
+    session: Session = Depends(get_session)
+):
+    """
+    Apply the same changes to many transactions with one UPDATE.
+    Targets either an explicit list of ids or the list_transactions filters;
+    only fields present in `changes` are written (null clears a field).
+    """
+    if (data.ids is None) == (data.filter is None):
+        raise ValidationError("Provide exactly one of 'ids' or 'filter'")
+    if data.filter is not None and not any(data.filter.dict().values()):
+        # An empty filter would match every transaction of the user
+        raise ValidationError("Filter needs at least one field")
     
-    if account_id:
-        query = query.where(Transaction.account_id == account_id)
+    changes = data.changes.dict(exclude_unset=True)
+    if changes.get("is_transfer") is None:
+        changes.pop("is_transfer", None)
+    if not changes:
+        raise ValidationError("No changes given")
+    if "merchant" in changes:
+        changes["merchant_id"] = MerchantNormalizer(session).resolve(changes["merchant"])
+    if "category_id" in changes:
+        # A category chosen by the user is a training example again
+        changes["category_auto"] = False
     
-    if method:
-        query = query.where(Transaction.payment_method == method)
+    category_ids = {changes.get("category_id"), changes.get("subcategory_id")} - {None}
+    if category_ids:
+        visible = session.exec(
+            select(Category.id).where(
+                Category.id.in_(category_ids),
+                (Category.user_id == user_id) | (Category.user_id == None)
+            )
+        ).all()
+        if len(visible) != len(category_ids):
+            raise NotFoundError("Category not found")
     
-    if search:
-        search_term = f"%{search}%"
-        query = query.where(
-            (Transaction.description.ilike(search_term)) | 
-            (Transaction.merchant.ilike(search_term))
-        )
+    if data.ids is not None:
+        if not data.ids:
+            return BulkUpdateResponse(updated=0)
+        conditions = [Transaction.user_id == user_id, Transaction.id.in_(data.ids)]
+    else:
+        conditions = _filter_conditions(user_id, data.filter)
     
-    query = query.order_by(Transaction.txn_date.desc(), Transaction.created_at.desc())
-    query = query.offset(offset).limit(limit)
+    # Budget counters of the touched months are recomputed after the update
+    months = set()
+    if {"category_id", "is_transfer"} & changes.keys():
+        months = set(session.exec(select(Transaction.txn_date).where(*conditions).distinct()).all())
     
-    transactions = session.exec(query).all()
-    
-    return [TransactionResponse(
-        id=t.id,
-        account_id=t.account_id,
-        txn_date=t.txn_date,
-        amount=t.amount,
-        currency=t.currency,
-        description=t.description,
-        merchant=t.merchant,
-        category_id=t.category_id,
-        payment_method=t.payment_method,
-        is_transfer=t.is_transfer,
-        source=t.source.value
-    ) for t in transactions]
+    result = session.execute(
+        update(Transaction)
+        .where(*conditions)
+        .values(**changes)
+        .execution_options(synchronize_session=False)
+    )
+    BudgetTracker(session).refresh(user_id, months)
+    mark_written(session, user_id)
+    session.commit()
+    
+    return BulkUpdateResponse(updated=result.rowcount)
+
+@router.post("/categorize", response_model=CategorizeResponse)
+def categorize_transactions(
+    retrain: bool = False,
+    user_id: str = Depends(get_current_user_id),
+    session: Session = Depends(get_session)
+):
+    """
+    Update the user's categorizer with newly categorized transactions (or
+    rebuild it with retrain=true), then fill in the category of
+    uncategorized transactions it is confident about.
+    """
+    service = CategorizerService(session)
+    model = service.train(user_id, full=retrain)
+    stats = service.categorize_uncategorized(user_id)
+    return CategorizeResponse(trained_on=model.documents, **stats)
+
+@router.post("/transfers/detect", response_model=TransferDetectResponse)
+def detect_transfers(
+    user_id: str = Depends(get_current_user_id),
+    session: Session = Depends(get_session)
+):
+    """
+    Pair unmatched transactions across the user's accounts as transfers.
+    Imports and email ingestion already do this for the rows they add;
+    this rescans the whole history, e.g. after adding an account.
+    """
+    return TransferDetectResponse(transfers=TransferDetector(session).detect(user_id))
 
 @router.post("", response_model=TransactionResponse, status_code=201)
 def create_transaction(
@@ -118,6 +289,7 @@ def create_transaction(
         currency=data.currency,
         description=data.description,
         merchant=data.merchant,
+        merchant_id=MerchantNormalizer(session).resolve(data.merchant),
         category_id=data.category_id,
         subcategory_id=data.subcategory_id,
         payment_method=data.payment_method,
@@ -127,30 +299,98 @@ def create_transaction(
     )
     
     session.add(txn)
+    session.flush()
+    # Build the response before commit expires txn, avoiding a refresh SELECT
+    response = row_to_response(txn)
+    publish_after_commit(session, user_id, TRANSACTION_CREATED, transaction_data(txn))
     session.commit()
-    session.refresh(txn)
-    
-    return TransactionResponse(
-        id=txn.id,
-        account_id=txn.account_id,
-        txn_date=txn.txn_date,
-        amount=txn.amount,
-        currency=txn.currency,
-        description=txn.description,
-        merchant=txn.merchant,
-        category_id=txn.category_id,
-        payment_method=txn.payment_method,
-        is_transfer=txn.is_transfer,
-        source=txn.source.value
+    
+    return ORJSONResponse(response, status_code=201)
+
+@router.post("/import", response_model=ImportResponse)
+async def import_transactions(
+    request: Request,
+    account_id: int,
+    format: ImportFormat = ImportFormat.CSV,
+    encoding: str = "utf-8",
+    user_id: str = Depends(get_current_user_id),
+    session: Session = Depends(get_session)
+):
+    """
+    Bulk import a CSV or OFX bank statement sent as the raw request body.
+    The body is parsed as it streams in and inserted in batches; rows
+    already imported (same hash_dedupe and txn_date) are counted as duplicates.
+    """
+    account = await run_in_threadpool(
+        lambda: session.exec(
+            select(Account).where(Account.id == account_id, Account.user_id == user_id)
+        ).first()
     )
+    if not account:
+        raise NotFoundError("Account not found")
+
+    try:
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    except LookupError:
+        raise ValidationError(f"Unknown encoding: {encoding}")
+
+    importer = StatementImporter(session, user_id, account_id, format)
+
+    async for chunk in request.stream():
+        if chunk:
+            await run_in_threadpool(importer.feed, decoder.decode(chunk))
+    await run_in_threadpool(importer.feed, decoder.decode(b"", final=True))
+
+    stats = await run_in_threadpool(importer.close)
+    return ImportResponse(**stats)
 
 @router.get("/{transaction_id}", response_model=TransactionResponse)
-def get_transaction(
+async def get_transaction(
     transaction_id: int,
     user_id: str = Depends(get_current_user_id),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_read_session)
 ):
     """Get single transaction"""
+    row = (await session.exec(
+        select(*RESPONSE_COLUMNS).where(
+            Transaction.id == transaction_id,
+            Transaction.user_id == user_id
+        )
+    )).first()
+    
+    if not row:
+        raise NotFoundError("Transaction not found")
+    
+    return ORJSONResponse(row_to_response(row))
+
+@router.get("/{transaction_id}/payload", response_model=TransactionPayloadResponse)
+async def get_transaction_payload(
+    transaction_id: int,
+    user_id: str = Depends(get_current_user_id),
+    session: AsyncSession = Depends(get_async_read_session)
+):
+    """Get the raw source metadata of a transaction (null for manual/imported ones)"""
+    row = (await session.exec(
+        select(Transaction.id, TransactionPayload.payload)
+        .outerjoin(TransactionPayload, TransactionPayload.transaction_id == Transaction.id)
+        .where(
+            Transaction.id == transaction_id,
+            Transaction.user_id == user_id
+        )
+    )).first()
+    
+    if not row:
+        raise NotFoundError("Transaction not found")
+    
+    return TransactionPayloadResponse(transaction_id=row.id, payload=row.payload)
+
+@router.delete("/{transaction_id}", status_code=204)
+def delete_transaction(
+    transaction_id: int,
+    user_id: str = Depends(get_current_user_id),
+    session: Session = Depends(get_session)
+):
+    """Delete transaction (a tombstone is recorded for /sync clients)"""
     txn = session.exec(
         select(Transaction).where(
             Transaction.id == transaction_id,
@@ -161,16 +401,7 @@ def get_transaction(
     if not txn:
         raise NotFoundError("Transaction not found")
     
-    return TransactionResponse(
-        id=txn.id,
-        account_id=txn.account_id,
-        txn_date=txn.txn_date,
-        amount=txn.amount,
-        currency=txn.currency,
-        description=txn.description,
-        merchant=txn.merchant,
-        category_id=txn.category_id,
-        payment_method=txn.payment_method,
-        is_transfer=txn.is_transfer,
-        source=txn.source.value
-    )
+    session.delete(txn)
+    session.commit()
+    
+    return Response(status_code=204)
@@ -1,15 +1,64 @@
-# apps/backend/src/core/auth_jwt.py
-from fastapi import Depends, HTTPException, status
+# apps/backend/src/core/auth.py
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from cachetools import TLRUCache
+from typing import Optional
+from prometheus_client import Counter
+import hashlib
+import threading
+import time
 import jwt
 from src.core.config import settings
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
+
+# Verified tokens, keyed by digest, each expiring at the token's own exp
+_token_cache = TLRUCache(
+    maxsize=settings.AUTH_TOKEN_CACHE_SIZE,
+    ttu=lambda _key, entry, now: entry[1],
+    timer=time.time
+)
+_token_cache_lock = threading.Lock()
+
+TOKEN_CACHE_REQUESTS = Counter(
+    "auth_token_cache_requests_total",
+    "Verified JWT cache lookups",
+    ["result"]
+)
 
 def get_current_user_id(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
     """Extract user_id from Supabase JWT token"""
+    return verify_token(credentials.credentials)
+
+def get_stream_user_id(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    access_token: Optional[str] = Query(None)
+) -> str:
+    """
+    Like get_current_user_id, but also accepts ?access_token= for streams
+    opened with EventSource, which cannot send an Authorization header
+    """
+    token = credentials.credentials if credentials else access_token
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated"
+        )
+    return verify_token(token)
+
+def verify_token(token: str) -> str:
+    """user_id of a valid token, checking the cache first"""
+    key = hashlib.sha256(token.encode()).digest()
+    
+    with _token_cache_lock:
+        cached = _token_cache.get(key)
+    if cached:
+        TOKEN_CACHE_REQUESTS.labels(result="hit").inc()
+        return cached[0]
+    TOKEN_CACHE_REQUESTS.labels(result="miss").inc()
+    
     try:
-        token = credentials.credentials
         payload = jwt.decode(
             token,
             settings.SUPABASE_JWT_SECRET,
@@ -22,6 +71,10 @@ def get_current_user_id(credentials: HTTPAuthorizationCredentials = Depends(secu
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid token: missing user_id"
             )
+        # Tokens without exp are still re-verified periodically
+        expires_at = payload.get("exp") or time.time() + settings.AUTH_TOKEN_CACHE_MAX_TTL
+        with _token_cache_lock:
+            _token_cache[key] = (user_id, expires_at)
         return user_id
     except jwt.ExpiredSignatureError:
         raise HTTPException(
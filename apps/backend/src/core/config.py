@@ -1,14 +1,26 @@
 # apps/backend/src/core/config.py
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Literal, Optional
 
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True
+    
+    # Optional read replica for GET routes; users who just wrote read from
+    # the primary for REPLICA_PIN_SECONDS so they see their own changes
+    DATABASE_REPLICA_URL: Optional[str] = None
+    REPLICA_PIN_SECONDS: float = 10
     
     # Supabase Auth
     SUPABASE_URL: str
     SUPABASE_JWT_SECRET: str
+    AUTH_TOKEN_CACHE_SIZE: int = 10000
+    AUTH_TOKEN_CACHE_MAX_TTL: int = 300  # seconds, for tokens without exp
     
     # Google/Gmail
     GOOGLE_CLIENT_ID: str
@@ -22,10 +34,38 @@ class Settings(BaseSettings):
     # Rate limiting
     RATE_LIMIT_PER_MINUTE: int = 60
     RATE_LIMIT_PER_HOUR: int = 1000
+    RATE_LIMIT_BACKEND: Literal["memory", "sqlite"] = "memory"  # memory (per process) or sqlite (shared by workers)
+    RATE_LIMIT_SQLITE_PATH: str = "/tmp/finanzas_rate_limit.sqlite3"
+    RATE_LIMIT_MAX_KEYS: int = 10000
     
     # Admin users (for /gmail/ingest/run)
     ADMIN_USER_IDS: List[str] = []
     
+    # Merchant normalization: cleaned raw merchant -> canonical id, per process
+    MERCHANT_CACHE_SIZE: int = 50000
+    
+    # Auto-categorization: only applied when the user's model has seen
+    # enough categorized transactions and is this confident
+    AUTO_CATEGORIZE_THRESHOLD: float = 0.8
+    AUTO_CATEGORIZE_MIN_DOCUMENTS: int = 20
+    
+    # Transfer detection: max days between the two sides of a transfer
+    TRANSFER_WINDOW_DAYS: int = 3
+    
+    # Server-sent events: per-client queue (also the per-user replay buffer),
+    # how long events stay replayable on reconnect, keep-alive interval
+    EVENT_QUEUE_SIZE: int = 100
+    EVENT_REPLAY_SECONDS: int = 300
+    EVENT_KEEPALIVE_SECONDS: int = 15
+    
+    # Budget alerts: share of the budget amount that triggers a
+    # budget.threshold event (once per budget and month)
+    BUDGET_ALERT_THRESHOLDS: List[float] = [0.8, 1.0]
+    
+    # Per-request profiling (admin only, X-Profile: 1 or ?profile=1)
+    PROFILE_DIR: str = "/tmp/finanzas_profiles"
+    PROFILE_SAMPLE_INTERVAL: float = 0.005  # seconds between stack samples
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
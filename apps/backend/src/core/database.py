@@ -1,9 +1,114 @@
 # apps/backend/src/core/database.py
 from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from cachetools import TTLCache
+from itertools import chain
+import threading
+
 from src.core.config import settings
+from src.core.metrics import InstrumentedQueuePool, InstrumentedAsyncQueuePool, pool_collector
+
+# Async drivers for each sync URL scheme we deploy with
+ASYNC_DRIVERS = {
+    "postgres": "postgresql+psycopg",
+    "postgresql": "postgresql+psycopg",
+    "postgresql+psycopg2": "postgresql+psycopg",
+    "postgresql+psycopg": "postgresql+psycopg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def to_async_url(url: str) -> str:
+    """Map a sync DATABASE_URL to the equivalent async driver URL"""
+    scheme, sep, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+def pool_options(url: str, name: str, poolclass) -> dict:
+    """Engine pool arguments from settings; SQLite keeps its default pool"""
+    if url.startswith("sqlite"):
+        return {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    return {
+        "poolclass": poolclass,
+        "pool_logging_name": name,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+def make_engines(url: str, name: str):
+    """Sync and async engine pair for one database"""
+    sync_engine = create_engine(url, echo=False, **pool_options(url, name, InstrumentedQueuePool))
+
+    async_url = to_async_url(url)
+    async_engine = create_async_engine(
+        async_url,
+        echo=False,
+        **pool_options(async_url, f"{name}_async", InstrumentedAsyncQueuePool)
+    )
+
+    pool_collector.register(name, sync_engine)
+    pool_collector.register(f"{name}_async", async_engine.sync_engine)
+    return sync_engine, async_engine
+
+# Primary: all writes, scripts and alembic. The async engine serves
+# I/O-heavy routes on the event loop without the threadpool.
+engine, async_engine = make_engines(settings.DATABASE_URL, "primary")
+
+# Replica: read-only routes, when configured
+replica_engine, async_replica_engine = (
+    make_engines(settings.DATABASE_REPLICA_URL, "replica")
+    if settings.DATABASE_REPLICA_URL else (None, None)
+)
 
-engine = create_engine(settings.DATABASE_URL, echo=False, pool_pre_ping=True)
+# Users who recently committed a write, so their reads stay on the primary
+# until the replica has caught up. Process-local: a read served by another
+# worker within the window may still hit the replica.
+_primary_pins = TTLCache(maxsize=100_000, ttl=settings.REPLICA_PIN_SECONDS)
+_primary_pins_lock = threading.Lock()
+
+def pin_to_primary(user_id: str) -> None:
+    with _primary_pins_lock:
+        _primary_pins[user_id] = True
+
+def is_pinned(user_id: str) -> bool:
+    with _primary_pins_lock:
+        return user_id in _primary_pins
+
+def mark_written(session: Session, user_id: str) -> None:
+    """Pin user_id to the primary once session commits (for Core UPDATE/INSERT)"""
+    session.info.setdefault("written_user_ids", set()).add(user_id)
+
+@event.listens_for(Session, "after_flush")
+def _collect_written_users(session, flush_context):
+    for obj in chain(session.new, session.dirty, session.deleted):
+        user_id = getattr(obj, "user_id", None)
+        if user_id:
+            mark_written(session, user_id)
+
+@event.listens_for(Session, "after_commit")
+def _pin_written_users(session):
+    for user_id in session.info.pop("written_user_ids", ()):
+        pin_to_primary(user_id)
 
 def get_session():
     with Session(engine) as session:
         yield session
+
+async def get_async_session():
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+def read_engine(user_id: str):
+    """Engine for user_id's reads: the replica unless user_id just wrote"""
+    if replica_engine is None or is_pinned(user_id):
+        return engine
+    return replica_engine
+
+def async_read_engine(user_id: str):
+    """Async engine for user_id's reads: the replica unless user_id just wrote"""
+    if async_replica_engine is None or is_pinned(user_id):
+        return async_engine
+    return async_replica_engine
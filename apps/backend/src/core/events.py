@@ -0,0 +1,143 @@
+# apps/backend/src/core/events.py
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from cachetools import TTLCache
+from collections import deque
+from dataclasses import dataclass
+from itertools import count
+from prometheus_client import Gauge
+from typing import Any, Callable, Deque, Dict, List, Optional, Set
+import asyncio
+import threading
+import time
+
+from src.core.config import settings
+
+# Event types pushed to clients
+TRANSACTION_CREATED = "transaction.created"
+TRANSACTIONS_IMPORTED = "transactions.imported"
+RULES_APPLIED = "rules.applied"
+BUDGET_THRESHOLD = "budget.threshold"
+
+EVENT_SUBSCRIBERS = Gauge("event_stream_subscribers", "Open per-user event streams")
+
+@dataclass
+class Event:
+    id: int
+    type: str
+    data: Dict[str, Any]
+    published_at: float = 0.0
+
+class Subscription:
+    """One client's queue of events, fed from any thread"""
+
+    def __init__(self, user_id: str, loop: asyncio.AbstractEventLoop):
+        self.user_id = user_id
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.EVENT_QUEUE_SIZE)
+
+    def deliver(self, item: Event) -> None:
+        """Runs on the subscriber's loop; a client that falls behind loses its oldest events"""
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(item)
+
+class EventBus:
+    """
+    In-process per-user pub/sub. publish() may be called from request
+    threads, the threadpool or background jobs; events are handed to each
+    subscriber's event loop. Recent events are kept per user so a client
+    reconnecting with Last-Event-ID misses nothing. Process-local: only
+    streams served by the publishing worker receive its events.
+    """
+
+    def __init__(self, timer: Callable[[], float] = time.monotonic):
+        self._lock = threading.Lock()
+        self._timer = timer
+        self._subscriptions: Dict[str, Set[Subscription]] = {}
+        # The TTL only evicts users who have gone quiet; it runs from the
+        # last publish because the key is set again on every event. Events
+        # themselves expire by their own age in _prune()
+        self._recent: TTLCache = TTLCache(maxsize=100_000, ttl=settings.EVENT_REPLAY_SECONDS, timer=timer)
+        # Start from the clock so ids keep increasing across restarts and a
+        # Last-Event-ID from before a restart never hides newer events
+        self._ids = count(time.time_ns() // 1000)
+
+    def subscribe(self, user_id: str) -> Subscription:
+        subscription = Subscription(user_id, asyncio.get_running_loop())
+        with self._lock:
+            self._subscriptions.setdefault(user_id, set()).add(subscription)
+        EVENT_SUBSCRIBERS.inc()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self._subscriptions.pop(subscription.user_id, None)
+        EVENT_SUBSCRIBERS.dec()
+
+    def publish(self, user_id: str, type: str, data: Dict[str, Any]) -> Event:
+        with self._lock:
+            now = self._timer()
+            item = Event(next(self._ids), type, data, now)
+            recent: Optional[Deque[Event]] = self._recent.get(user_id)
+            if recent is None:
+                recent = deque(maxlen=settings.EVENT_QUEUE_SIZE)
+            self._prune(recent, now)
+            recent.append(item)
+            self._recent[user_id] = recent
+            subscriptions = list(self._subscriptions.get(user_id, ()))
+
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, item)
+            except RuntimeError:
+                # Loop already closed; the stream is going away
+                pass
+        return item
+
+    def replay(self, user_id: str, last_event_id: int) -> List[Event]:
+        """Recent events after last_event_id, oldest first"""
+        with self._lock:
+            recent = self._recent.get(user_id)
+            if recent is None:
+                return []
+            self._prune(recent, self._timer())
+            return [e for e in recent if e.id > last_event_id]
+
+    @staticmethod
+    def _prune(recent: Deque[Event], now: float) -> None:
+        while recent and recent[0].published_at <= now - settings.EVENT_REPLAY_SECONDS:
+            recent.popleft()
+
+event_bus = EventBus()
+
+def transaction_data(txn) -> Dict[str, Any]:
+    """Event payload for a new transaction"""
+    return {
+        "id": txn.id,
+        "account_id": txn.account_id,
+        "txn_date": txn.txn_date.isoformat(),
+        "amount": txn.amount,
+        "currency": txn.currency,
+        "description": txn.description,
+        "merchant": txn.merchant,
+        "category_id": txn.category_id,
+        "source": txn.source.value,
+    }
+
+def publish_after_commit(session: Session, user_id: str, type: str, data: Dict[str, Any]) -> None:
+    """Publish once session commits, so clients never hear about rolled-back rows"""
+    session.info.setdefault("pending_events", []).append((user_id, type, data))
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending_events(session):
+    for user_id, type, data in session.info.pop("pending_events", ()):
+        event_bus.publish(user_id, type, data)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_events(session, previous_transaction):
+    if not previous_transaction.nested:
+        session.info.pop("pending_events", None)
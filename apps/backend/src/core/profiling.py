@@ -0,0 +1,176 @@
+# apps/backend/src/core/profiling.py
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs
+import json
+import logging
+import sys
+import threading
+import time
+import uuid
+
+from src.core.auth import get_current_user_id, require_admin
+from src.core.config import settings
+from src.core.metrics import current_query_log
+
+logger = logging.getLogger(__name__)
+
+APP_ROOT = str(Path(__file__).resolve().parent.parent)
+
+class SamplingProfiler:
+    """
+    Samples the stacks of all threads at a fixed interval. Sync routes run in
+    the threadpool and async ones on the event loop, so instead of following
+    one thread we keep every stack that passes through application code.
+    Concurrent requests hitting the same code while profiling are included.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.is_set():
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                in_app = False
+                while frame is not None:
+                    code = frame.f_code
+                    in_app = in_app or code.co_filename.startswith(APP_ROOT)
+                    stack.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                if in_app:
+                    self.samples[";".join(reversed(stack))] += 1
+            self._stop.wait(self.interval)
+
+    def summary(self, limit: int = 30) -> Dict[str, List]:
+        """Top functions by samples spent in them (self) and under them (total)"""
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, count in self.samples.items():
+            frames = stack.split(";")
+            own[frames[-1]] += count
+            for name in set(frames):
+                total[name] += count
+        return {
+            "self": own.most_common(limit),
+            "total": total.most_common(limit),
+        }
+
+def _profiling_requested(scope) -> bool:
+    for name, value in scope["headers"]:
+        if name == b"x-profile" and value in (b"1", b"true"):
+            return True
+    query = scope.get("query_string", b"")
+    return b"profile=" in query and parse_qs(query.decode()).get("profile") in (["1"], ["true"])
+
+def _admin_from_scope(scope) -> Optional[str]:
+    """Return the admin user id behind the request, or None"""
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode().partition(" ")
+            if scheme.lower() != "bearer" or not token:
+                return None
+            try:
+                credentials = HTTPAuthorizationCredentials(scheme=scheme, credentials=token)
+                return require_admin(get_current_user_id(credentials))
+            except HTTPException:
+                return None
+    return None
+
+class ProfilingMiddleware:
+    """
+    Profile a single request when an admin sends `X-Profile: 1` (or
+    `?profile=1`). The sampled stacks (collapsed format, loadable in
+    speedscope or flamegraph.pl) and the SQL statements it ran are written to
+    PROFILE_DIR, and the artifact id is returned in the X-Profile-Id header.
+    Other requests only pay for the header check.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _profiling_requested(scope):
+            return await self.app(scope, receive, send)
+
+        admin_id = _admin_from_scope(scope)
+        if admin_id is None:
+            return await self.app(scope, receive, send)
+
+        profile_id = f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", []).append(
+                    (b"x-profile-id", profile_id.encode())
+                )
+            await send(message)
+
+        query_log: list = []
+        token = current_query_log.set(query_log)
+        profiler = SamplingProfiler(settings.PROFILE_SAMPLE_INTERVAL)
+        profiler.start()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            elapsed = time.perf_counter() - start
+            profiler.stop()
+            current_query_log.reset(token)
+            self._write_artifacts(profile_id, scope, admin_id, elapsed, profiler, query_log)
+
+    def _write_artifacts(
+        self,
+        profile_id: str,
+        scope,
+        admin_id: str,
+        elapsed: float,
+        profiler: SamplingProfiler,
+        query_log: list
+    ) -> None:
+        directory = Path(settings.PROFILE_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        with open(directory / f"{profile_id}.collapsed", "w", encoding="utf-8") as f:
+            for stack, count in profiler.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+        report = {
+            "id": profile_id,
+            "method": scope["method"],
+            "path": scope["path"],
+            "query_string": scope.get("query_string", b"").decode(),
+            "requested_by": admin_id,
+            "duration_seconds": elapsed,
+            "sample_interval": profiler.interval,
+            "samples": sum(profiler.samples.values()),
+            "functions": profiler.summary(),
+            "queries": {
+                "count": len(query_log),
+                "seconds": sum(seconds for _, seconds in query_log),
+                "statements": [
+                    {"sql": statement, "seconds": seconds} for statement, seconds in query_log
+                ],
+            },
+        }
+        with open(directory / f"{profile_id}.json", "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+        logger.info(f"Profiled {scope['method']} {scope['path']} for {admin_id}: {profile_id}")
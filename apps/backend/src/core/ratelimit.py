@@ -1,65 +1,176 @@
 # apps/backend/src/core/rate_limit.py
-from fastapi import Request, HTTPException, status
+from fastapi import Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
-from collections import defaultdict
-from datetime import datetime, timedelta
-from typing import Dict, Tuple
+from collections import OrderedDict
+from typing import Optional, Tuple
+import hashlib
+import math
+import sqlite3
+import threading
+import time
+
+from src.core.config import settings
+
+MINUTE = 60
+HOUR = 3600
+
+def _sliding_window(
+    state: Optional[Tuple[int, int, int]],
+    now: float,
+    limit: int,
+    window: int
+) -> Tuple[bool, float, Tuple[int, int, int]]:
+    """
+    Sliding window counter: keep only the counts of the current and the
+    previous fixed window and weight the previous one by how much of it still
+    overlaps the sliding window. Returns (allowed, retry_after, new_state).
+    """
+    index = int(now // window)
+    current_index, current, previous = state or (index, 0, 0)
+
+    if index == current_index + 1:
+        previous, current = current, 0
+    elif index != current_index:
+        previous, current = 0, 0
+
+    elapsed = (now - index * window) / window
+    estimated = previous * (1 - elapsed) + current
+
+    if estimated + 1 > limit:
+        # Time until the previous window's weight decays enough for one more hit
+        if previous and current < limit:
+            retry_after = window * (1 - (limit - 1 - current) / previous) - (now - index * window)
+        else:
+            retry_after = (index + 1) * window - now
+        return False, max(retry_after, 1.0), (index, current, previous)
+
+    return True, 0.0, (index, current + 1, previous)
+
+class MemoryBackend:
+    """Process-local limiter state, bounded by LRU eviction of idle keys"""
+
+    blocking = False
+
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        self._state: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, limit: int, window: int) -> Tuple[bool, float]:
+        with self._lock:
+            allowed, retry_after, state = _sliding_window(
+                self._state.get(key), time.time(), limit, window
+            )
+            self._state[key] = state
+            self._state.move_to_end(key)
+            while len(self._state) > self.max_keys:
+                self._state.popitem(last=False)
+        return allowed, retry_after
+
+class SQLiteBackend:
+    """
+    Limiter state in a local SQLite file so every uvicorn worker on the host
+    shares the same counters (a stand-in for Redis on single-host deploys).
+    hit() does disk I/O and can wait on other workers' locks, so the
+    middleware calls it from the threadpool.
+    """
+
+    PRUNE_EVERY = 1000
+    blocking = True
+
+    def __init__(self, path: str, max_keys: int = 10000):
+        self.max_keys = max_keys
+        self._conn = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits ("
+            " key TEXT PRIMARY KEY, window_index INTEGER, current INTEGER,"
+            " previous INTEGER, touched REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_rate_limits_touched ON rate_limits (touched)")
+        self._lock = threading.Lock()
+        self._hits = 0
+
+    def hit(self, key: str, limit: int, window: int) -> Tuple[bool, float]:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT window_index, current, previous FROM rate_limits WHERE key = ?",
+                    (key,)
+                ).fetchone()
+                allowed, retry_after, state = _sliding_window(row, now, limit, window)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO rate_limits VALUES (?, ?, ?, ?, ?)",
+                    (key, *state, now)
+                )
+                self._hits += 1
+                if self._hits % self.PRUNE_EVERY == 0:
+                    self._prune(now)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return allowed, retry_after
+
+    def _prune(self, now: float) -> None:
+        """Drop keys idle for two hours, then the least recently used overflow"""
+        self._conn.execute("DELETE FROM rate_limits WHERE touched < ?", (now - 2 * HOUR,))
+        self._conn.execute(
+            "DELETE FROM rate_limits WHERE key IN ("
+            " SELECT key FROM rate_limits ORDER BY touched DESC LIMIT -1 OFFSET ?)",
+            (self.max_keys,)
+        )
+
+def create_backend():
+    if settings.RATE_LIMIT_BACKEND == "sqlite":
+        return SQLiteBackend(settings.RATE_LIMIT_SQLITE_PATH, settings.RATE_LIMIT_MAX_KEYS)
+    return MemoryBackend(settings.RATE_LIMIT_MAX_KEYS)
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app):
+    def __init__(self, app, backend=None):
         super().__init__(app)
-        self.requests: Dict[str, list] = defaultdict(list)
-        self.user_requests: Dict[str, list] = defaultdict(list)
-    
-    def _clean_old_requests(self, requests_list: list, window: timedelta):
-        """Remove requests older than window"""
-        cutoff = datetime.utcnow() - window
-        return [req_time for req_time in requests_list if req_time > cutoff]
-    
+        self.backend = backend or create_backend()
+
+    async def _hit(self, key: str, limit: int, window: int) -> Tuple[bool, float]:
+        if getattr(self.backend, "blocking", True):
+            return await run_in_threadpool(self.backend.hit, key, limit, window)
+        return self.backend.hit(key, limit, window)
+
+    def _too_many(self, detail: str, retry_after: float) -> JSONResponse:
+        return JSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            content={"detail": detail},
+            headers={"Retry-After": str(math.ceil(retry_after))}
+        )
+
     async def dispatch(self, request: Request, call_next):
         # Skip rate limiting for health/metrics
         if request.url.path in ["/health", "/metrics", "/docs", "/openapi.json"]:
             return await call_next(request)
-        
+
         # IP-based rate limiting
-        client_ip = request.client.host
-        now = datetime.utcnow()
-        
-        # Clean old requests
-        self.requests[client_ip] = self._clean_old_requests(
-            self.requests[client_ip], 
-            timedelta(minutes=1)
-        )
-        
-        # Check per-minute limit
-        if len(self.requests[client_ip]) >= 60:
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="Rate limit exceeded: 60 requests per minute"
+        client_ip = request.client.host if request.client else "unknown"
+        per_minute = settings.RATE_LIMIT_PER_MINUTE
+        allowed, retry_after = await self._hit(f"ip:{client_ip}", per_minute, MINUTE)
+        if not allowed:
+            return self._too_many(
+                f"Rate limit exceeded: {per_minute} requests per minute", retry_after
             )
-        
-        self.requests[client_ip].append(now)
-        
-        # User-based rate limiting (if authenticated)
+
+        # User-based rate limiting (if authenticated), keyed by a token digest
         auth_header = request.headers.get("Authorization")
         if auth_header:
-            try:
-                # Extract user from token (simplified)
-                user_key = f"user_{auth_header[:20]}"
-                self.user_requests[user_key] = self._clean_old_requests(
-                    self.user_requests[user_key],
-                    timedelta(hours=1)
+            user_key = "user:" + hashlib.sha256(auth_header.encode()).hexdigest()[:32]
+            per_hour = settings.RATE_LIMIT_PER_HOUR
+            allowed, retry_after = await self._hit(user_key, per_hour, HOUR)
+            if not allowed:
+                return self._too_many(
+                    f"Rate limit exceeded: {per_hour} requests per hour", retry_after
                 )
-                
-                if len(self.user_requests[user_key]) >= 1000:
-                    raise HTTPException(
-                        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                        detail="Rate limit exceeded: 1000 requests per hour"
-                    )
-                
-                self.user_requests[user_key].append(now)
-            except:
-                pass
-        
+
         response = await call_next(request)
         return response
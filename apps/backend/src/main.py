@@ -1,13 +1,48 @@
 # apps/backend/src/main.py
-from fastapi import FastAPI
-from fastapi.responses import Response
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
 from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
 
+from src.core.errors import AppException
+from src.core.metrics import MetricsMiddleware
+from src.core.profiling import ProfilingMiddleware
+from src.api import (
+    accounts_router,
+    admin_router,
+    budgets_router,
+    categories_router,
+    dashboard_router,
+    events_router,
+    exports_router,
+    health_router,
+    reports_router,
+    rules_router,
+    sync_router,
+    transactions_api,
+)
+
 app = FastAPI(title="Finanzas PWA - Backend (bootstrap)")
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(ProfilingMiddleware)
+
+@app.exception_handler(AppException)
+async def app_exception_handler(request: Request, exc: AppException):
+    return JSONResponse({"detail": exc.detail, "error_code": exc.error_code}, status_code=exc.status_code)
+
+app.include_router(health_router.router, tags=["health"])
+app.include_router(transactions_api.router, prefix="/transactions", tags=["transactions"])
+app.include_router(reports_router.router, prefix="/reports", tags=["reports"])
+app.include_router(exports_router.router, prefix="/exports", tags=["exports"])
+app.include_router(dashboard_router.router, prefix="/dashboard", tags=["dashboard"])
+app.include_router(sync_router.router, prefix="/sync", tags=["sync"])
+app.include_router(events_router.router, prefix="/events", tags=["events"])
+app.include_router(accounts_router.router, prefix="/accounts", tags=["accounts"])
+app.include_router(categories_router.router, prefix="/categories", tags=["categories"])
+app.include_router(budgets_router.router, prefix="/budgets", tags=["budgets"])
+app.include_router(rules_router.router, prefix="/rules", tags=["rules"])
 
-@app.get("/health")
-def health():
-    return {"status": "ok"}
+# Admin-only tools (request profiles): /admin/profiles, /admin/profiles/{file}
+app.include_router(admin_router.router, prefix="/admin", tags=["admin"])
 
 @app.get("/metrics", include_in_schema=False)
 def metrics():
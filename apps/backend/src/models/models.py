@@ -1,5 +1,10 @@
 # apps/backend/src/models/models.py
-from sqlmodel import SQLModel, Field, Column, JSON
+from sqlmodel import SQLModel, Field, Column, JSON, Index, UniqueConstraint
+from sqlalchemy import ForeignKeyConstraint, delete, insert, inspect, literal, select, true
+from sqlalchemy import PrimaryKeyConstraint, event
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateColumn
 from typing import Optional
 from datetime import datetime, date
 from enum import Enum
@@ -28,6 +33,7 @@ class User(SQLModel, table=True):
 
 class Account(SQLModel, table=True):
     __tablename__ = "accounts"
+    __table_args__ = (Index("ix_accounts_user_id_updated_at", "user_id", "updated_at"),)
     
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: str = Field(foreign_key="users.id", index=True)
@@ -37,18 +43,41 @@ class Account(SQLModel, table=True):
     currency: str = "CLP"
     last_sync_at: Optional[datetime] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        sa_column_kwargs={"onupdate": datetime.utcnow}
+    )
 
 class Category(SQLModel, table=True):
     __tablename__ = "categories"
+    __table_args__ = (Index("ix_categories_user_id_updated_at", "user_id", "updated_at"),)
     
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: Optional[str] = Field(default=None, foreign_key="users.id", index=True)
     name: str
     parent_id: Optional[int] = Field(default=None, foreign_key="categories.id")
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        sa_column_kwargs={"onupdate": datetime.utcnow}
+    )
+
+class CategoryClosure(SQLModel, table=True):
+    """
+    Every (ancestor, descendant) pair of the category tree, including each
+    category with itself at depth 0, so subtree queries are a single join.
+    Maintained by the Category insert/update listeners below.
+    """
+    __tablename__ = "category_closure"
+    __table_args__ = (Index("ix_category_closure_descendant_id", "descendant_id", "ancestor_id"),)
+    
+    ancestor_id: int = Field(foreign_key="categories.id", primary_key=True, ondelete="CASCADE")
+    descendant_id: int = Field(foreign_key="categories.id", primary_key=True, ondelete="CASCADE")
+    depth: int
 
 class Budget(SQLModel, table=True):
     __tablename__ = "budgets"
+    __table_args__ = (Index("ix_budgets_user_id_updated_at", "user_id", "updated_at"),)
     
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: str = Field(foreign_key="users.id", index=True)
@@ -59,27 +88,113 @@ class Budget(SQLModel, table=True):
     start_month: date
     end_month: Optional[date] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        sa_column_kwargs={"onupdate": datetime.utcnow}
+    )
+
+class BudgetSpend(SQLModel, table=True):
+    """Running spend of a budget in one month, kept current by BudgetTracker"""
+    __tablename__ = "budget_spend"
+    
+    budget_id: int = Field(foreign_key="budgets.id", primary_key=True, ondelete="CASCADE")
+    month: date = Field(primary_key=True)  # first day of the month
+    spent: float = 0
+    alerted: float = 0  # highest alert threshold already reached
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+class Merchant(SQLModel, table=True):
+    """Canonical merchant that raw merchant strings are normalized to"""
+    __tablename__ = "merchants"
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str = Field(unique=True)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+class MerchantAlias(SQLModel, table=True):
+    """Cleaned raw merchant string -> canonical merchant, filled as new strings are seen"""
+    __tablename__ = "merchant_aliases"
+    
+    alias: str = Field(primary_key=True)
+    merchant_id: int = Field(foreign_key="merchants.id", index=True)
 
 class Transaction(SQLModel, table=True):
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Postgres partitions this table by txn_date (migration 003), so the
+        # primary key and unique constraints must include it
+        UniqueConstraint("hash_dedupe", "txn_date", name="uq_transactions_hash_dedupe_txn_date"),
+        Index("ix_transactions_user_id_txn_date", "user_id", "txn_date"),
+        Index("ix_transactions_user_id_updated_at_id", "user_id", "updated_at", "id"),
+        Index("ix_transactions_user_id_merchant_id", "user_id", "merchant_id"),
+        {"info": {"sqlite_rowid_pk": "id"}},
+    )
     
-    id: Optional[int] = Field(default=None, primary_key=True)
+    id: Optional[int] = Field(default=None, primary_key=True, sa_column_kwargs={"autoincrement": True})
     user_id: str = Field(foreign_key="users.id", index=True)
     account_id: int = Field(foreign_key="accounts.id", index=True)
-    txn_date: date = Field(index=True)
+    txn_date: date = Field(primary_key=True, index=True)
     posted_at: datetime = Field(default_factory=datetime.utcnow)
     amount: float
     currency: str = "CLP"
     description: str
-    raw_payload: Optional[dict] = Field(default=None, sa_column=Column(JSON))
     source: TransactionSource
     merchant: Optional[str] = None
+    merchant_id: Optional[int] = Field(default=None, foreign_key="merchants.id")
     category_id: Optional[int] = Field(default=None, foreign_key="categories.id", index=True)
+    # Set by the categorizer's own suggestions, so it never trains on them
+    category_auto: bool = False
+    # Category the user's categorizer last learned from this row
+    category_learned: Optional[int] = None
     subcategory_id: Optional[int] = Field(default=None, foreign_key="categories.id")
     payment_method: Optional[str] = None
     is_transfer: bool = False
-    hash_dedupe: str = Field(unique=True, index=True)
+    # Other side of a detected transfer (no FK: transactions is partitioned)
+    transfer_pair_id: Optional[int] = None
+    hash_dedupe: str = Field(index=True)
     created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    updated_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        sa_column_kwargs={"onupdate": datetime.utcnow}
+    )
+
+# SQLite only autoincrements a single INTEGER PRIMARY KEY. On SQLite, tables
+# marked with info["sqlite_rowid_pk"] keep that column as the rowid and turn
+# the composite primary key into a UNIQUE constraint, which still backs
+# composite foreign keys; every other database gets the declared key.
+@compiles(CreateColumn, "sqlite")
+def _sqlite_rowid_column(element, compiler, **kw):
+    column = element.element
+    if column.table.info.get("sqlite_rowid_pk") == column.name:
+        return f"{compiler.preparer.format_column(column)} INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT"
+    return compiler.visit_create_column(element, **kw)
+
+@compiles(PrimaryKeyConstraint, "sqlite")
+def _sqlite_rowid_primary_key(constraint, compiler, **kw):
+    if constraint.table.info.get("sqlite_rowid_pk"):
+        columns = ", ".join(compiler.preparer.format_column(c) for c in constraint.columns)
+        return f"UNIQUE ({columns})"
+    return compiler.visit_primary_key_constraint(constraint, **kw)
+
+class TransactionPayload(SQLModel, table=True):
+    """
+    Raw source metadata (e.g. the ingested email) for a transaction. Kept out
+    of the transactions row so list/report reads stay narrow; only loaded by
+    GET /transactions/{id}/payload.
+    """
+    __tablename__ = "transaction_payloads"
+    __table_args__ = (
+        # transactions is partitioned, so its key is (id, txn_date)
+        ForeignKeyConstraint(
+            ["transaction_id", "txn_date"],
+            ["transactions.id", "transactions.txn_date"],
+            ondelete="CASCADE"
+        ),
+    )
+    
+    transaction_id: int = Field(primary_key=True)
+    txn_date: date
+    payload: dict = Field(sa_column=Column(JSON, nullable=False))
 
 class Rule(SQLModel, table=True):
     __tablename__ = "rules"
@@ -92,3 +207,156 @@ class Rule(SQLModel, table=True):
     value: str  # category_id or value to set
     priority: int = 0
     created_at: datetime = Field(default_factory=datetime.utcnow)
+
+class CategoryClassifier(SQLModel, table=True):
+    """Per-user naive Bayes token counts used to auto-categorize transactions"""
+    __tablename__ = "category_classifiers"
+    
+    user_id: str = Field(foreign_key="users.id", primary_key=True)
+    state: dict = Field(default_factory=dict, sa_column=Column(JSON, nullable=False))
+    documents: int = 0
+    trained_at: datetime = Field(default_factory=datetime.utcnow)
+
+class RecurringSeries(SQLModel, table=True):
+    """Subscription or other periodic charge detected in a user's history"""
+    __tablename__ = "recurring_series"
+    __table_args__ = (
+        Index("ix_recurring_series_user_id_merchant_id", "user_id", "merchant_id"),
+    )
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: str = Field(foreign_key="users.id")
+    merchant_id: int = Field(foreign_key="merchants.id")
+    cadence: str  # weekly, biweekly, monthly, quarterly, yearly
+    period_days: int
+    amount: float  # latest charge, so price changes show up
+    occurrences: int
+    first_date: date
+    last_date: date
+    next_expected: date
+    last_transaction_id: int
+    updated_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        sa_column_kwargs={"onupdate": datetime.utcnow}
+    )
+
+class RecurringScan(SQLModel, table=True):
+    """Watermark of the recurring-charge job per user"""
+    __tablename__ = "recurring_scans"
+    
+    user_id: str = Field(foreign_key="users.id", primary_key=True)
+    last_transaction_id: int = 0
+    scanned_at: datetime = Field(default_factory=datetime.utcnow)
+
+class Tombstone(SQLModel, table=True):
+    """Marker left behind when a synced row is deleted, served by /sync"""
+    __tablename__ = "tombstones"
+    __table_args__ = (Index("ix_tombstones_user_id_deleted_at", "user_id", "deleted_at"),)
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: Optional[str] = Field(default=None, foreign_key="users.id")
+    entity: str  # table name of the deleted row
+    entity_id: int
+    deleted_at: datetime = Field(default_factory=datetime.utcnow)
+
+SYNCED_MODELS = (Account, Category, Budget, Transaction)
+
+@event.listens_for(Session, "before_flush")
+def record_tombstones(session, flush_context, instances):
+    """Write a Tombstone for every synced row deleted through the ORM"""
+    for obj in session.deleted:
+        if isinstance(obj, SYNCED_MODELS):
+            session.add(Tombstone(user_id=obj.user_id, entity=obj.__tablename__, entity_id=obj.id))
+
+BUDGET_FIELDS = ("category_id", "txn_date", "amount", "is_transfer")
+
+def _keep_previous_value(target, value, oldvalue, initiator):
+    """No-op; registered with active_history so track_budget_spend sees old values"""
+
+# Without active history, setting an expired attribute records no old value
+for name in BUDGET_FIELDS:
+    event.listen(getattr(Transaction, name), "set", _keep_previous_value, active_history=True)
+
+@event.listens_for(Session, "after_flush")
+def track_budget_spend(session, flush_context):
+    """Apply the spending change of flushed transactions to budget counters"""
+    from src.services.budget_service import BudgetTracker, month_of, spending
+    
+    deltas = {}
+    
+    def add(user_id, category_id, txn_date, amount, is_transfer, sign):
+        value = spending(amount, is_transfer)
+        if value:
+            key = (category_id, month_of(txn_date))
+            user_deltas = deltas.setdefault(user_id, {})
+            user_deltas[key] = user_deltas.get(key, 0) + sign * value
+    
+    for obj in session.new:
+        if isinstance(obj, Transaction):
+            add(obj.user_id, obj.category_id, obj.txn_date, obj.amount, obj.is_transfer, 1)
+    for obj in session.deleted:
+        if isinstance(obj, Transaction):
+            add(obj.user_id, obj.category_id, obj.txn_date, obj.amount, obj.is_transfer, -1)
+    for obj in session.dirty:
+        if not isinstance(obj, Transaction):
+            continue
+        attrs = inspect(obj).attrs
+        histories = [attrs[name].history for name in BUDGET_FIELDS]
+        if not any(h.has_changes() for h in histories):
+            continue
+        old = [h.deleted[0] if h.deleted else getattr(obj, name) for h, name in zip(histories, BUDGET_FIELDS)]
+        add(obj.user_id, *old, -1)
+        add(obj.user_id, obj.category_id, obj.txn_date, obj.amount, obj.is_transfer, 1)
+    
+    for user_id, user_deltas in deltas.items():
+        BudgetTracker(session).apply(user_id, user_deltas)
+
+@event.listens_for(Category, "after_insert")
+def insert_category_paths(mapper, connection, target):
+    """Add the new category's paths: itself plus every ancestor of its parent"""
+    closure = CategoryClosure.__table__
+    connection.execute(
+        insert(closure).values(ancestor_id=target.id, descendant_id=target.id, depth=0)
+    )
+    if target.parent_id is not None:
+        connection.execute(
+            insert(closure).from_select(
+                ["ancestor_id", "descendant_id", "depth"],
+                select(closure.c.ancestor_id, literal(target.id), closure.c.depth + 1)
+                .where(closure.c.descendant_id == target.parent_id)
+            )
+        )
+
+@event.listens_for(Category, "after_update")
+def move_category_paths(mapper, connection, target):
+    """Re-link the category's subtree under its new parent when parent_id changes"""
+    if not inspect(target).attrs.parent_id.history.has_changes():
+        return
+    
+    closure = CategoryClosure.__table__
+    subtree = select(closure.c.descendant_id).where(closure.c.ancestor_id == target.id)
+    
+    if target.parent_id is not None and connection.execute(
+        subtree.where(closure.c.descendant_id == target.parent_id)
+    ).first():
+        raise ValueError(f"Category {target.parent_id} is inside the subtree of {target.id}")
+    
+    # Drop paths from the old ancestors into the subtree
+    connection.execute(
+        delete(closure).where(
+            closure.c.descendant_id.in_(subtree),
+            closure.c.ancestor_id.not_in(subtree)
+        )
+    )
+    if target.parent_id is not None:
+        above = closure.alias("above")
+        below = closure.alias("below")
+        connection.execute(
+            insert(closure).from_select(
+                ["ancestor_id", "descendant_id", "depth"],
+                # Every new ancestor paired with every node of the subtree
+                select(above.c.ancestor_id, below.c.descendant_id, above.c.depth + below.c.depth + 1)
+                .select_from(above.join(below, true()))
+                .where(above.c.descendant_id == target.parent_id, below.c.ancestor_id == target.id)
+            )
+        )
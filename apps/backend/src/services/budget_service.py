@@ -0,0 +1,231 @@
+# apps/backend/src/services/budget_service.py
+from sqlmodel import Session, select
+from sqlalchemy import bindparam, func, or_, tuple_, update
+from collections import defaultdict
+from datetime import date, datetime
+from dateutil.relativedelta import relativedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import logging
+
+from src.core.config import settings
+from src.core.events import BUDGET_THRESHOLD, publish_after_commit
+from src.models.models import Budget, BudgetSpend, CategoryClosure, Transaction
+
+logger = logging.getLogger(__name__)
+
+# (category_id, month) -> change in spending
+Deltas = Dict[Tuple[Optional[int], date], float]
+
+def month_of(day: date) -> date:
+    return day.replace(day=1)
+
+def spending(amount: float, is_transfer: bool) -> float:
+    """What a transaction adds to budget spending: expenses only, never transfers"""
+    return -amount if amount < 0 and not is_transfer else 0.0
+
+def covers(budget, month: date) -> bool:
+    return budget.start_month <= month and (budget.end_month is None or month <= budget.end_month)
+
+class BudgetTracker:
+    """
+    Running spend per (budget, month) in budget_spend, so a status check is
+    a primary-key read. Changes made through the ORM are applied as deltas
+    by the track_budget_spend flush listener (models.py); bulk Core writes (imports, bulk updates,
+    auto-categorization, transfer detection) call refresh() for the months
+    they touched. A counter is created from a full aggregate the first time
+    its month is touched or read, then only adjusted. Crossing one of
+    BUDGET_ALERT_THRESHOLDS in the current month publishes a
+    budget.threshold event once.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def apply(self, user_id: str, deltas: Deltas) -> None:
+        """Add spending deltas to the counters of the budgets they fall under"""
+        deltas = {key: delta for key, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        budgets = self._budgets(user_id)
+        if not budgets:
+            return
+        ancestors = self._ancestors({category_id for category_id, _ in deltas})
+
+        by_counter: Dict[Tuple[int, date], float] = defaultdict(float)
+        for (category_id, month), delta in deltas.items():
+            for budget in budgets:
+                if covers(budget, month) and (
+                    budget.category_id is None or budget.category_id in ancestors.get(category_id, ())
+                ):
+                    by_counter[(budget.id, month)] += delta
+        if not by_counter:
+            return
+
+        existing = set(self.session.exec(
+            select(BudgetSpend.budget_id, BudgetSpend.month)
+            .where(tuple_(BudgetSpend.budget_id, BudgetSpend.month).in_(list(by_counter)))
+        ).all())
+        table = BudgetSpend.__table__
+        params = [
+            {"_budget_id": budget_id, "_month": month, "_delta": delta}
+            for (budget_id, month), delta in by_counter.items() if (budget_id, month) in existing
+        ]
+        if params:
+            self.session.execute(
+                update(table)
+                .where(table.c.budget_id == bindparam("_budget_id"), table.c.month == bindparam("_month"))
+                .values(spent=table.c.spent + bindparam("_delta"), updated_at=datetime.utcnow()),
+                params
+            )
+        # Missing counters are built from the rows as they are now, deltas included
+        missing = {key for key in by_counter if key not in existing}
+        if missing:
+            self._rebuild(user_id, budgets, {month for _, month in missing}, only=missing)
+
+        self._check_thresholds(user_id, budgets, set(by_counter))
+
+    def refresh(self, user_id: str, months: Iterable[date]) -> None:
+        """Recompute every counter of the user's budgets for these months"""
+        months = {month_of(m) for m in months}
+        budgets = self._budgets(user_id)
+        if not months or not budgets:
+            return
+        keys = self._rebuild(user_id, budgets, months)
+        self._check_thresholds(user_id, budgets, keys)
+
+    def status(self, user_id: str, month: date) -> List[Tuple[Budget, BudgetSpend]]:
+        """(budget, counter) for the user's budgets covering month"""
+        month = month_of(month)
+        budgets = [b for b in self._budgets(user_id, full=True) if covers(b, month)]
+        if not budgets:
+            return []
+        # Counters are changed with Core UPDATEs, so never trust loaded copies
+        query = select(BudgetSpend).where(
+            BudgetSpend.budget_id.in_([b.id for b in budgets]),
+            BudgetSpend.month == month
+        ).execution_options(populate_existing=True)
+        counters = {c.budget_id: c for c in self.session.exec(query).all()}
+        missing = {(b.id, month) for b in budgets if b.id not in counters}
+        if missing:
+            # First read of this month: build its counters once
+            self._rebuild(user_id, budgets, {month}, only=missing)
+            self.session.commit()
+            counters = {c.budget_id: c for c in self.session.exec(query).all()}
+        return [(b, counters[b.id]) for b in budgets]
+
+    def _budgets(self, user_id: str, full: bool = False):
+        columns = (Budget,) if full else (
+            Budget.id, Budget.name, Budget.amount, Budget.category_id, Budget.start_month, Budget.end_month
+        )
+        rows = self.session.exec(select(*columns).where(Budget.user_id == user_id)).all()
+        return list(rows)
+
+    def _ancestors(self, category_ids: Set[Optional[int]]) -> Dict[int, Set[int]]:
+        category_ids = category_ids - {None}
+        if not category_ids:
+            return {}
+        ancestors: Dict[int, Set[int]] = defaultdict(set)
+        for ancestor_id, descendant_id in self.session.exec(
+            select(CategoryClosure.ancestor_id, CategoryClosure.descendant_id)
+            .where(CategoryClosure.descendant_id.in_(category_ids))
+        ).all():
+            ancestors[descendant_id].add(ancestor_id)
+        return ancestors
+
+    def _rebuild(
+        self,
+        user_id: str,
+        budgets,
+        months: Set[date],
+        only: Optional[Set[Tuple[int, date]]] = None
+    ) -> Set[Tuple[int, date]]:
+        """Write counters from an aggregate of the months' transactions"""
+        rows = self.session.exec(
+            select(
+                Transaction.category_id,
+                Transaction.txn_date,
+                func.sum(Transaction.amount)
+            ).where(
+                Transaction.user_id == user_id,
+                Transaction.amount < 0,
+                Transaction.is_transfer == False,
+                or_(*(
+                    (Transaction.txn_date >= m) & (Transaction.txn_date < m + relativedelta(months=1))
+                    for m in months
+                ))
+            ).group_by(Transaction.category_id, Transaction.txn_date)
+        ).all()
+        totals: Deltas = defaultdict(float)
+        for category_id, txn_date, amount in rows:
+            totals[(category_id, month_of(txn_date))] += -amount
+        ancestors = self._ancestors({category_id for category_id, _ in totals})
+
+        spent: Dict[Tuple[int, date], float] = {}
+        for budget in budgets:
+            for month in months:
+                key = (budget.id, month)
+                if not covers(budget, month) or (only is not None and key not in only):
+                    continue
+                spent[key] = sum(
+                    total for (category_id, m), total in totals.items()
+                    if m == month and (
+                        budget.category_id is None or budget.category_id in ancestors.get(category_id, ())
+                    )
+                )
+        if spent:
+            self.session.execute(self._upsert([
+                {"budget_id": budget_id, "month": month, "spent": value, "updated_at": datetime.utcnow()}
+                for (budget_id, month), value in spent.items()
+            ]))
+        return set(spent)
+
+    def _upsert(self, rows: List[Dict]):
+        if self.session.get_bind().dialect.name == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+
+        statement = insert(BudgetSpend).values(rows)
+        return statement.on_conflict_do_update(
+            index_elements=['budget_id', 'month'],
+            set_={'spent': statement.excluded.spent, 'updated_at': statement.excluded.updated_at}
+        )
+
+    def _check_thresholds(self, user_id: str, budgets, keys: Set[Tuple[int, date]]) -> None:
+        """Announce thresholds newly crossed this month; older months are marked silently"""
+        if not keys:
+            return
+        by_id = {b.id: b for b in budgets}
+        current = month_of(date.today())
+        crossed = []
+        for counter in self.session.exec(
+            select(BudgetSpend.budget_id, BudgetSpend.month, BudgetSpend.spent, BudgetSpend.alerted)
+            .where(tuple_(BudgetSpend.budget_id, BudgetSpend.month).in_(list(keys)))
+        ).all():
+            budget = by_id[counter.budget_id]
+            if budget.amount <= 0:
+                continue
+            level = max(
+                (t for t in settings.BUDGET_ALERT_THRESHOLDS if counter.spent >= t * budget.amount),
+                default=0
+            )
+            if level <= counter.alerted:
+                continue
+            crossed.append({"_budget_id": counter.budget_id, "_month": counter.month, "_alerted": level})
+            if counter.month == current:
+                publish_after_commit(self.session, user_id, BUDGET_THRESHOLD, {
+                    "budget_id": budget.id,
+                    "name": budget.name,
+                    "month": counter.month.isoformat(),
+                    "threshold": level,
+                    "spent": counter.spent,
+                    "amount": budget.amount,
+                })
+        if crossed:
+            table = BudgetSpend.__table__
+            self.session.execute(
+                update(table)
+                .where(table.c.budget_id == bindparam("_budget_id"), table.c.month == bindparam("_month"))
+                .values(alerted=bindparam("_alerted")),
+                crossed
+            )
@@ -0,0 +1,284 @@
+# apps/backend/src/services/categorizer_service.py
+from sqlmodel import Session, select
+from sqlalchemy import bindparam, case, or_, update
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+import math
+
+from src.core.config import settings
+from src.core.database import mark_written
+from src.models.models import CategoryClassifier, Transaction
+from src.services.merchant_service import clean_merchant
+from src.services.budget_service import BudgetTracker, month_of
+
+logger = logging.getLogger(__name__)
+
+# Words in notification subjects and statement descriptions that say
+# nothing about the category
+STOPWORDS = {
+    "COMPRA", "COMPRAS", "PAGO", "CARGO", "CON", "POR", "DEL", "LAS", "LOS",
+    "TARJETA", "CREDITO", "DEBITO", "APROBADA", "NOTIFICACION", "TRANSACCION",
+}
+
+def features(
+    merchant: Optional[str],
+    merchant_id: Optional[int],
+    description: Optional[str],
+    amount: float
+) -> List[str]:
+    """Tokens for one transaction: canonical merchant, words and amount magnitude"""
+    tokens = [f"m:{merchant_id}"] if merchant_id else []
+    words = set(clean_merchant(f"{merchant or ''} {description or ''}").split())
+    tokens.extend(f"w:{word}" for word in words if len(word) > 2 and word not in STOPWORDS)
+    sign = "+" if amount > 0 else "-"
+    tokens.append(f"a:{sign}{int(math.log10(abs(amount) + 1))}")
+    return tokens
+
+class NaiveBayesCategorizer:
+    """
+    Multinomial naive Bayes over transaction tokens with Laplace smoothing.
+    Counts can be updated one example at a time; scoring compiles them into
+    per-token sparse weight lists so a batch costs O(classes + hits) per
+    transaction instead of O(classes * tokens).
+    """
+
+    def __init__(self, alpha: float = 1.0):
+        self.alpha = alpha
+        self.class_docs: Counter = Counter()
+        self.class_tokens: Counter = Counter()
+        self.token_counts: Dict[str, Counter] = {}
+        self._compiled = None
+
+    @property
+    def documents(self) -> int:
+        return sum(self.class_docs.values())
+
+    def learn(self, tokens: List[str], category_id: int) -> None:
+        self.class_docs[category_id] += 1
+        self.class_tokens[category_id] += len(tokens)
+        for token in tokens:
+            self.token_counts.setdefault(token, Counter())[category_id] += 1
+        self._compiled = None
+
+    def unlearn(self, tokens: List[str], category_id: int) -> None:
+        """Take back one learn(); counts that reach zero are dropped"""
+        self.class_docs[category_id] -= 1
+        self.class_tokens[category_id] -= len(tokens)
+        for token in tokens:
+            counts = self.token_counts.get(token)
+            if counts is not None:
+                counts[category_id] -= 1
+                if counts[category_id] <= 0:
+                    del counts[category_id]
+                if not counts:
+                    del self.token_counts[token]
+        for counter in (self.class_docs, self.class_tokens):
+            if counter[category_id] <= 0:
+                del counter[category_id]
+        self._compiled = None
+
+    def _compile(self):
+        alpha = self.alpha
+        log_alpha = math.log(alpha)
+        vocabulary = max(len(self.token_counts), 1)
+        documents = self.documents
+        classes = list(self.class_docs)
+
+        prior = [math.log(self.class_docs[c] / documents) for c in classes]
+        # log of the smoothed probability of a token never seen with the class
+        unseen = [log_alpha - math.log(self.class_tokens[c] + alpha * vocabulary) for c in classes]
+        index = {c: i for i, c in enumerate(classes)}
+        weights = {
+            token: [(index[c], math.log(n + alpha) - log_alpha) for c, n in counts.items()]
+            for token, counts in self.token_counts.items()
+        }
+        self._compiled = (classes, prior, unseen, weights)
+        return self._compiled
+
+    def predict_many(self, documents: Iterable[List[str]]) -> List[Tuple[Optional[int], float]]:
+        """(category_id, probability) for each token list"""
+        if not self.class_docs:
+            return [(None, 0.0) for _ in documents]
+        classes, prior, unseen, weights = self._compiled or self._compile()
+
+        results = []
+        for tokens in documents:
+            n = len(tokens)
+            scores = [p + n * u for p, u in zip(prior, unseen)]
+            for token in tokens:
+                for i, weight in weights.get(token, ()):
+                    scores[i] += weight
+            best = max(range(len(scores)), key=scores.__getitem__)
+            top = scores[best]
+            results.append((classes[best], 1 / sum(math.exp(s - top) for s in scores)))
+        return results
+
+    def to_state(self) -> Dict:
+        return {
+            "alpha": self.alpha,
+            "class_docs": {str(c): n for c, n in self.class_docs.items()},
+            "class_tokens": {str(c): n for c, n in self.class_tokens.items()},
+            "token_counts": {
+                token: {str(c): n for c, n in counts.items()}
+                for token, counts in self.token_counts.items()
+            },
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> "NaiveBayesCategorizer":
+        model = cls(state["alpha"])
+        model.class_docs = Counter({int(c): n for c, n in state["class_docs"].items()})
+        model.class_tokens = Counter({int(c): n for c, n in state["class_tokens"].items()})
+        model.token_counts = {
+            token: Counter({int(c): n for c, n in counts.items()})
+            for token, counts in state["token_counts"].items()
+        }
+        return model
+
+TRAINING_COLUMNS = (
+    Transaction.id,
+    Transaction.txn_date,
+    Transaction.merchant,
+    Transaction.merchant_id,
+    Transaction.description,
+    Transaction.amount,
+    Transaction.category_id,
+)
+
+# The category a row should currently count as in its user's model: its own
+# category, unless the model filled it in
+TRAINING_LABEL = case((Transaction.category_auto == True, None), else_=Transaction.category_id)
+
+class CategorizerService:
+    """Train, persist and apply a user's NaiveBayesCategorizer"""
+
+    BATCH_SIZE = 5000
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def train(self, user_id: str, full: bool = False) -> NaiveBayesCategorizer:
+        """
+        Bring the user's model up to date with the categories users have set
+        (or rebuild it with full=True). Each row remembers the category the
+        model learned from it in category_learned, so only rows whose
+        category changed since are visited: the old label is unlearned and
+        the new one learned. Categories filled in by the model itself are
+        never learned, and other writes to a row do not retrain it.
+        """
+        record = self.session.get(CategoryClassifier, user_id)
+        rebuild = record is None or full
+        if rebuild:
+            model = NaiveBayesCategorizer()
+            changed = or_(TRAINING_LABEL != None, Transaction.category_learned != None)
+        else:
+            model = NaiveBayesCategorizer.from_state(record.state)
+            changed = Transaction.category_learned.is_distinct_from(TRAINING_LABEL)
+
+        rows = self.session.exec(
+            select(*TRAINING_COLUMNS, Transaction.category_learned, TRAINING_LABEL.label("label"))
+            .where(Transaction.user_id == user_id, changed)
+            .execution_options(yield_per=self.BATCH_SIZE)
+        )
+        params = []
+        for row in rows:
+            tokens = features(row.merchant, row.merchant_id, row.description, row.amount)
+            if row.category_learned is not None and not rebuild:
+                model.unlearn(tokens, row.category_learned)
+            if row.label is not None:
+                model.learn(tokens, row.label)
+            if row.category_learned != row.label:
+                params.append({"_id": row.id, "_txn_date": row.txn_date, "_label": row.label})
+
+        # Record what was learned without touching updated_at, so training
+        # does not send every row back through /sync
+        table = Transaction.__table__
+        if params:
+            self.session.execute(
+                update(table)
+                .where(table.c.id == bindparam("_id"), table.c.txn_date == bindparam("_txn_date"))
+                .values(category_learned=bindparam("_label"), updated_at=table.c.updated_at),
+                params
+            )
+
+        if record is None:
+            record = CategoryClassifier(user_id=user_id)
+        record.state = model.to_state()
+        record.documents = model.documents
+        record.trained_at = datetime.utcnow()
+        self.session.add(record)
+        self.session.commit()
+
+        logger.info(f"Trained categorizer for {user_id} on {model.documents} transactions")
+        return model
+
+    def load(self, user_id: str) -> Optional[NaiveBayesCategorizer]:
+        """The user's trained model, if it has seen enough examples to be used"""
+        record = self.session.get(CategoryClassifier, user_id)
+        if record is None or record.documents < settings.AUTO_CATEGORIZE_MIN_DOCUMENTS:
+            return None
+        return NaiveBayesCategorizer.from_state(record.state)
+
+    @staticmethod
+    def suggest(model: Optional[NaiveBayesCategorizer], rows: List[Dict]) -> List[Optional[int]]:
+        """
+        Category for each row dict (merchant, merchant_id, description, amount),
+        or None where the model is missing or below the confidence threshold
+        """
+        if model is None:
+            return [None] * len(rows)
+        predictions = model.predict_many(
+            features(r.get('merchant'), r.get('merchant_id'), r.get('description'), r['amount'])
+            for r in rows
+        )
+        return [
+            category_id if confidence >= settings.AUTO_CATEGORIZE_THRESHOLD else None
+            for category_id, confidence in predictions
+        ]
+
+    def categorize_uncategorized(self, user_id: str) -> Dict:
+        """Score every uncategorized transaction of the user and fill confident ones"""
+        model = self.load(user_id)
+        stats = {'scored': 0, 'categorized': 0}
+        if model is None:
+            return stats
+
+        table = Transaction.__table__
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("_id"), table.c.txn_date == bindparam("_txn_date"))
+            .values(category_id=bindparam("_category_id"), category_auto=True)
+        )
+        last_id = 0
+        months = set()
+
+        while True:
+            rows = self.session.exec(
+                select(*TRAINING_COLUMNS).where(
+                    Transaction.user_id == user_id,
+                    Transaction.category_id == None,
+                    Transaction.id > last_id
+                ).order_by(Transaction.id).limit(self.BATCH_SIZE)
+            ).all()
+            if not rows:
+                break
+
+            suggestions = self.suggest(model, [row._asdict() for row in rows])
+            params = [
+                {"_id": row.id, "_txn_date": row.txn_date, "_category_id": category_id}
+                for row, category_id in zip(rows, suggestions) if category_id
+            ]
+            if params:
+                self.session.execute(statement, params)
+                months.update(month_of(p["_txn_date"]) for p in params)
+
+            stats['scored'] += len(rows)
+            stats['categorized'] += len(params)
+            last_id = rows[-1].id
+
+        BudgetTracker(self.session).refresh(user_id, months)
+        mark_written(self.session, user_id)
+        self.session.commit()
+        return stats
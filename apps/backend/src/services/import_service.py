@@ -0,0 +1,345 @@
+# apps/backend/src/services/import_service.py
+from sqlmodel import Session
+from typing import Dict, Iterable, List, Optional, Set
+from datetime import date, datetime
+from enum import Enum
+import csv
+import hashlib
+import io
+import logging
+import re
+
+from src.models.models import Transaction, TransactionSource
+from src.core.errors import ValidationError
+from src.core.database import mark_written
+from src.core.events import TRANSACTIONS_IMPORTED, event_bus
+from src.services.merchant_service import MerchantNormalizer
+from src.services.categorizer_service import CategorizerService
+from src.services.transfer_service import TransferDetector
+from src.services.budget_service import BudgetTracker, month_of
+
+logger = logging.getLogger(__name__)
+
+class ImportFormat(str, Enum):
+    CSV = "csv"
+    OFX = "ofx"
+
+# Header aliases accepted in CSV statements (lowercase, accents stripped).
+# Includes the headers written by /exports/monthly.csv so exports round-trip.
+CSV_COLUMNS = {
+    'date': ['fecha', 'date', 'fecha transaccion', 'fecha operacion'],
+    'amount': ['monto', 'amount', 'importe'],
+    'debit': ['cargo', 'cargos', 'debit'],
+    'credit': ['abono', 'abonos', 'credit'],
+    'description': ['descripcion', 'description', 'detalle', 'glosa'],
+    'merchant': ['comercio', 'merchant'],
+    'currency': ['moneda', 'currency'],
+    'payment_method': ['metodo de pago', 'payment_method'],
+}
+
+DATE_FORMATS = ['%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y', '%Y%m%d']
+
+def _normalize_header(value: str) -> str:
+    value = value.strip().lower()
+    for accented, plain in zip('áéíóú', 'aeiou'):
+        value = value.replace(accented, plain)
+    return value
+
+def parse_date(value: str) -> date:
+    value = value.strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognized date: {value!r}")
+
+def parse_amount(value: str) -> float:
+    """
+    Parse amounts like '-25000.00', '$ 25.000', '1.234,50' or '1,234.50'.
+    When both separators appear the last one is the decimal separator; a
+    lone '.' before groups of three digits is a thousands separator (CLP).
+    '1,234' could be either and is rejected.
+    """
+    value = value.strip().replace('$', '').replace(' ', '')
+    if '.' in value and ',' in value:
+        decimal, thousands = ('.', ',') if value.rfind('.') > value.rfind(',') else (',', '.')
+        integer, _, fraction = value.rpartition(decimal)
+        if not fraction.isdigit() or not re.fullmatch(rf"-?\d{{1,3}}(\{thousands}\d{{3}})*", integer):
+            raise ValueError(f"Unrecognized amount: {value!r}")
+        return float(f"{integer.replace(thousands, '')}.{fraction}")
+    if re.fullmatch(r"-?\d{1,3}(\.\d{3})+", value):
+        return float(value.replace('.', ''))
+    if re.fullmatch(r"-?\d{1,3}(,\d{3}){2,}", value):
+        return float(value.replace(',', ''))
+    if re.fullmatch(r"-?\d{1,3},\d{3}", value):
+        raise ValueError(f"Ambiguous amount: {value!r}")
+    return float(value.replace(',', '.'))
+
+class CsvStatementParser:
+    """Push parser for CSV bank statements; feed text chunks, get rows back"""
+
+    def __init__(self):
+        self._buffer = ''
+        # Scan position in the buffer and whether it is inside a quoted field
+        self._scanned = 0
+        self._quoted = False
+        self._columns: Optional[Dict[str, int]] = None
+        self._delimiter = ','
+        self.failed = 0
+
+    def feed(self, chunk: str) -> List[Dict]:
+        """Rows of every complete record; a quoted field may span chunks and lines"""
+        self._buffer += chunk
+        end = 0
+        while True:
+            newline = self._buffer.find('\n', self._scanned)
+            if newline == -1:
+                break
+            if self._buffer.count('"', self._scanned, newline) % 2:
+                self._quoted = not self._quoted
+            self._scanned = newline + 1
+            if not self._quoted:
+                end = self._scanned
+
+        text, self._buffer = self._buffer[:end], self._buffer[end:]
+        self._scanned -= end
+        return self._parse(text)
+
+    def close(self) -> List[Dict]:
+        text, self._buffer = self._buffer, ''
+        self._scanned, self._quoted = 0, False
+        return self._parse(text)
+
+    def _parse(self, text: str) -> List[Dict]:
+        if not text.strip():
+            return []
+
+        if self._columns is None:
+            text = text.lstrip('\ufeff')
+            header = next(line for line in text.split('\n') if line.strip())
+            self._delimiter = ';' if header.count(';') > header.count(',') else ','
+
+        rows = []
+        for record in csv.reader(io.StringIO(text, newline=''), delimiter=self._delimiter):
+            if not any(field.strip() for field in record):
+                continue
+            if self._columns is None:
+                self._columns = self._map_header(record)
+                continue
+            try:
+                rows.append(self._to_row(record))
+            except (ValueError, IndexError) as e:
+                logger.debug(f"Skipping CSV row {record}: {e}")
+                self.failed += 1
+        return rows
+
+    def _map_header(self, header: List[str]) -> Dict[str, int]:
+        normalized = [_normalize_header(h) for h in header]
+        columns = {}
+        for key, aliases in CSV_COLUMNS.items():
+            for i, name in enumerate(normalized):
+                if name in aliases:
+                    columns[key] = i
+                    break
+
+        has_amount = 'amount' in columns or 'debit' in columns or 'credit' in columns
+        if 'date' not in columns or 'description' not in columns or not has_amount:
+            raise ValidationError(f"CSV header missing date/amount/description columns: {header}")
+        return columns
+
+    def _to_row(self, record: List[str]) -> Dict:
+        cols = self._columns
+
+        def get(key: str) -> Optional[str]:
+            if key not in cols or cols[key] >= len(record):
+                return None
+            return record[cols[key]].strip() or None
+
+        if get('amount') is not None:
+            amount = parse_amount(get('amount'))
+        else:
+            # Separate debit/credit columns: charges are expenses (negative)
+            amount = parse_amount(get('credit') or '0') - abs(parse_amount(get('debit') or '0'))
+
+        return {
+            'txn_date': parse_date(get('date') or ''),
+            'amount': amount,
+            'description': (get('description') or '')[:200],
+            'merchant': get('merchant'),
+            'currency': get('currency') or 'CLP',
+            'payment_method': get('payment_method'),
+            'external_id': None,
+        }
+
+class OfxStatementParser:
+    """Push parser for OFX (SGML or XML) statements"""
+
+    TAG_RE = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+
+    def __init__(self):
+        self._buffer = ''
+        self._current: Optional[Dict[str, str]] = None
+        self._currency = 'CLP'
+        self.failed = 0
+
+    def feed(self, chunk: str) -> List[Dict]:
+        self._buffer += chunk
+        # Only consume up to the last '<' so a tag split across chunks is kept
+        cut = self._buffer.rfind('<')
+        if cut <= 0:
+            return []
+        text, self._buffer = self._buffer[:cut], self._buffer[cut:]
+        return self._parse(text)
+
+    def close(self) -> List[Dict]:
+        text, self._buffer = self._buffer, ''
+        return self._parse(text)
+
+    def _parse(self, text: str) -> List[Dict]:
+        rows = []
+        for closing, tag, value in self.TAG_RE.findall(text):
+            tag = tag.upper()
+            value = value.strip()
+
+            if tag == 'STMTTRN':
+                if closing and self._current is not None:
+                    row = self._to_row(self._current)
+                    if row:
+                        rows.append(row)
+                    self._current = None
+                elif not closing:
+                    self._current = {}
+            elif tag == 'CURDEF' and value:
+                self._currency = value
+            elif self._current is not None and not closing and value:
+                self._current[tag] = value
+        return rows
+
+    def _to_row(self, fields: Dict[str, str]) -> Optional[Dict]:
+        try:
+            txn_date = parse_date(fields['DTPOSTED'][:8])
+            amount = parse_amount(fields['TRNAMT'])
+        except (KeyError, ValueError) as e:
+            logger.debug(f"Skipping OFX transaction {fields}: {e}")
+            self.failed += 1
+            return None
+
+        name = fields.get('NAME')
+        return {
+            'txn_date': txn_date,
+            'amount': amount,
+            'description': (fields.get('MEMO') or name or '')[:200],
+            'merchant': name,
+            'currency': self._currency,
+            'payment_method': None,
+            'external_id': fields.get('FITID'),
+        }
+
+class StatementImporter:
+    """
+    Incrementally parse a bank statement and bulk insert it as IMPORT
+    transactions. Rows are flushed in batches with a single multi-row
+    INSERT that skips rows whose (hash_dedupe, txn_date) already exists.
+    """
+
+    BATCH_SIZE = 500
+
+    def __init__(self, session: Session, user_id: str, account_id: int, fmt: ImportFormat):
+        self.session = session
+        self.user_id = user_id
+        self.account_id = account_id
+        self.parser = CsvStatementParser() if fmt == ImportFormat.CSV else OfxStatementParser()
+        self.merchants = MerchantNormalizer(session)
+        self.categorizer = CategorizerService(session).load(user_id)
+        self.transfers = TransferDetector(session)
+        self._after_id = self.transfers.latest_id(user_id)
+        self._pending: List[Dict] = []
+        self._seen: Dict[str, int] = {}
+        self._months: Set[date] = set()
+        self.stats = {
+            'processed': 0,
+            'created': 0,
+            'duplicates': 0,
+            'failed': 0,
+            'transfers': 0
+        }
+
+    def feed(self, chunk: str) -> None:
+        self._add(self.parser.feed(chunk))
+
+    def close(self) -> Dict:
+        self._add(self.parser.close())
+        self._flush()
+        if self.stats['created']:
+            BudgetTracker(self.session).refresh(self.user_id, self._months)
+        mark_written(self.session, self.user_id)
+        self.session.commit()
+        if self.stats['created']:
+            self.stats['transfers'] = self.transfers.detect(self.user_id, self._after_id)
+        self.stats['failed'] = self.parser.failed
+        self.stats['processed'] += self.parser.failed
+        if self.stats['created']:
+            event_bus.publish(self.user_id, TRANSACTIONS_IMPORTED, {'account_id': self.account_id, **self.stats})
+        logger.info(f"Imported statement for user {self.user_id}: {self.stats}")
+        return self.stats
+
+    def _add(self, rows: Iterable[Dict]) -> None:
+        for row in rows:
+            self.stats['processed'] += 1
+            self._pending.append(self._build(row))
+            if len(self._pending) >= self.BATCH_SIZE:
+                self._flush()
+
+    def _build(self, row: Dict) -> Dict:
+        external_id = row.pop('external_id')
+        if external_id:
+            key = f"fitid:{external_id}"
+        else:
+            key = f"{row['txn_date']}|{row['amount']}|{row['merchant'] or ''}|{row['description']}"
+
+        # Identical CSV lines (two equal purchases on one day) stay distinct,
+        # while re-importing the same file yields the same hashes.
+        occurrence = self._seen.get(key, 0)
+        self._seen[key] = occurrence + 1
+
+        hash_input = f"{key}|{occurrence}|import:{self.account_id}"
+        now = datetime.utcnow()
+        return {
+            **row,
+            'user_id': self.user_id,
+            'account_id': self.account_id,
+            'source': TransactionSource.IMPORT,
+            'is_transfer': False,
+            'posted_at': now,
+            'created_at': now,
+            'hash_dedupe': hashlib.sha256(hash_input.encode()).hexdigest(),
+        }
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+
+        merchant_ids = self.merchants.resolve_many(row['merchant'] for row in rows)
+        for row in rows:
+            row['merchant_id'] = merchant_ids.get(row['merchant'])
+        for row, category_id in zip(rows, CategorizerService.suggest(self.categorizer, rows)):
+            row['category_id'] = category_id
+            row['category_auto'] = category_id is not None
+
+        self._months.update(month_of(row['txn_date']) for row in rows)
+        result = self.session.execute(self._insert_ignoring_duplicates(rows))
+        created = result.rowcount
+        self.stats['created'] += created
+        self.stats['duplicates'] += len(rows) - created
+
+    def _insert_ignoring_duplicates(self, rows: List[Dict]):
+        if self.session.get_bind().dialect.name == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+
+        return insert(Transaction).values(rows).on_conflict_do_nothing(
+            index_elements=['hash_dedupe', 'txn_date']
+        )
@@ -1,14 +1,18 @@
-# apps/backend/src/services/ingest.py
+# apps/backend/src/services/ingest_service.py
 from sqlmodel import Session, select
-from typing import List, Dict
+from typing import List, Dict, Optional
 import hashlib
 import logging
 from datetime import datetime
 
 from src.services.gmail_client import GmailClient
-from src.services.parser import TransactionParser
-from src.models.models import Transaction, TransactionSource, Account
+from src.services.parser_service import TransactionParser
+from src.models.models import Transaction, TransactionSource, Account, TransactionPayload
 from src.core.errors import ValidationError
+from src.core.events import TRANSACTION_CREATED, publish_after_commit, transaction_data
+from src.services.merchant_service import MerchantNormalizer
+from src.services.categorizer_service import CategorizerService
+from src.services.transfer_service import TransferDetector
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +20,10 @@ class IngestService:
     def __init__(self, session: Session):
         self.session = session
         self.parser = TransactionParser()
+        self.merchants = MerchantNormalizer(session)
+        self.categorizers = CategorizerService(session)
+        self.transfers = TransferDetector(session)
+        self._models: Dict = {}
     
     def process_emails(
         self, 
@@ -34,8 +42,10 @@ class IngestService:
             'processed': 0,
             'created': 0,
             'duplicates': 0,
-            'failed': 0
+            'failed': 0,
+            'transfers': 0
         }
+        after_id = self.transfers.latest_id(user_id)
         
         for message in messages:
             stats['processed'] += 1
@@ -61,6 +71,10 @@ class IngestService:
                 logger.error(f"Error processing message {message.get('id')}: {e}")
                 stats['failed'] += 1
         
+        # Pair new rows with the other side of transfers between own accounts
+        if stats['created']:
+            stats['transfers'] = self.transfers.detect(user_id, after_id)
+        
         # Update history_id for next sync
         try:
             new_history_id = gmail_client.get_latest_history_id()
@@ -103,6 +117,17 @@ class IngestService:
             logger.debug(f"Duplicate transaction: {hash_dedupe}")
             return False
         
+        # Normalize merchant and auto-categorize from the user's history
+        merchant_id = self.merchants.resolve(txn_data.get('merchant'))
+        if user_id not in self._models:
+            self._models[user_id] = self.categorizers.load(user_id)
+        [category_id] = self.categorizers.suggest(self._models[user_id], [{
+            'merchant': txn_data.get('merchant'),
+            'merchant_id': merchant_id,
+            'description': txn_data['description'],
+            'amount': txn_data['amount'],
+        }])
+        
         # Create transaction
         txn = Transaction(
             user_id=user_id,
@@ -112,17 +137,26 @@ class IngestService:
             currency='CLP',
             description=txn_data['description'],
             merchant=txn_data.get('merchant'),
+            merchant_id=merchant_id,
+            category_id=category_id,
+            category_auto=category_id is not None,
             source=TransactionSource.EMAIL,
             payment_method=txn_data.get('card_tail'),
-            hash_dedupe=hash_dedupe,
-            raw_payload={
+            hash_dedupe=hash_dedupe
+        )
+        
+        self.session.add(txn)
+        self.session.flush()
+        self.session.add(TransactionPayload(
+            transaction_id=txn.id,
+            txn_date=txn.txn_date,
+            payload={
                 'email_id': email_data['message_id'],
                 'subject': email_data['subject'],
                 'from': email_data['from']
             }
-        )
-        
-        self.session.add(txn)
+        ))
+        publish_after_commit(self.session, user_id, TRANSACTION_CREATED, transaction_data(txn))
         self.session.commit()
         
         logger.info(f"Created transaction: {txn.id} for {txn.amount} CLP")
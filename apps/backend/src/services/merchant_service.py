@@ -0,0 +1,191 @@
+# apps/backend/src/services/merchant_service.py
+from sqlmodel import Session, select
+from sqlalchemy import event
+from sqlalchemy.orm import Session as OrmSession
+from cachetools import LRUCache
+from typing import Dict, Iterable, Optional, Set
+import logging
+import re
+import threading
+import unicodedata
+
+from src.core.config import settings
+from src.models.models import Merchant, MerchantAlias
+
+logger = logging.getLogger(__name__)
+
+# Canonical merchant -> cleaned prefixes that identify it
+KNOWN_MERCHANTS = {
+    "Líder": ["LIDER", "HIPER LIDER", "SUPER LIDER", "EXPRESS DE LIDER"],
+    "Jumbo": ["JUMBO"],
+    "Unimarc": ["UNIMARC"],
+    "Santa Isabel": ["SANTA ISABEL", "STA ISABEL"],
+    "Tottus": ["TOTTUS", "HIPER TOTTUS"],
+    "Copec": ["COPEC"],
+    "Shell": ["SHELL"],
+    "Uber": ["UBER", "UBER TRIP", "UBER BV"],
+    "Uber Eats": ["UBER EATS"],
+    "Cabify": ["CABIFY"],
+    "Metro de Santiago": ["METRO DE SANTIAGO", "METRO SANTIAGO"],
+    "Cruz Verde": ["CRUZ VERDE", "FARMACIA CRUZ VERDE", "FARMACIAS CRUZ VERDE"],
+    "Salcobrand": ["SALCOBRAND"],
+    "Farmacias Ahumada": ["AHUMADA", "FARMACIAS AHUMADA"],
+    "Starbucks": ["STARBUCKS"],
+    "McDonald's": ["MCDONALDS", "MC DONALDS"],
+    "Rappi": ["RAPPI"],
+    "PedidosYa": ["PEDIDOSYA", "PEDIDOS YA"],
+    "Falabella": ["FALABELLA"],
+    "Ripley": ["RIPLEY"],
+    "Paris": ["PARIS"],
+    "Mercado Libre": ["MERCADOLIBRE", "MERCADO LIBRE"],
+    "Netflix": ["NETFLIX"],
+    "Spotify": ["SPOTIFY"],
+    "Entel": ["ENTEL"],
+    "Enel": ["ENEL"],
+    "Aguas Andinas": ["AGUAS ANDINAS"],
+    "Metrogas": ["METROGAS"],
+    "Cinemark": ["CINEMARK"],
+}
+
+# Tokens that carry no merchant identity: payment processors, web and
+# legal-entity suffixes
+NOISE_TOKENS = {
+    "MERPAGO", "MERCADOPAGO", "PAYU", "SUMUP", "FLOW", "TUU", "WWW", "COM", "CL",
+    "SPA", "LTDA", "SA", "S", "A", "CIA",
+}
+
+def clean_merchant(raw: str) -> str:
+    """
+    Reduce a raw merchant string to its comparable form: uppercase ASCII
+    words without punctuation, store/terminal numbers or processor noise.
+    "Uber *Trip" -> "UBER TRIP", "UBER EATS 1234" -> "UBER EATS".
+    """
+    text = unicodedata.normalize("NFKD", raw).encode("ascii", "ignore").decode().upper()
+    tokens = re.sub(r"[^A-Z0-9]+", " ", text).split()
+    return " ".join(
+        token for token in tokens
+        if token not in NOISE_TOKENS and not any(c.isdigit() for c in token)
+    )
+
+class PrefixIndex:
+    """Token trie of known merchant prefixes; the longest matching prefix wins"""
+    
+    def __init__(self, known: Dict[str, list]):
+        self.root: dict = {}
+        for canonical, prefixes in known.items():
+            for prefix in prefixes:
+                node = self.root
+                for token in prefix.split():
+                    node = node.setdefault(token, {})
+                node[None] = canonical
+    
+    def match(self, cleaned: str) -> Optional[str]:
+        node, found = self.root, None
+        for token in cleaned.split():
+            node = node.get(token)
+            if node is None:
+                break
+            found = node.get(None, found)
+        return found
+
+known_index = PrefixIndex(KNOWN_MERCHANTS)
+
+# (database url, alias) -> merchant id, shared by all sessions in the
+# process; an alias never changes merchant once persisted
+alias_cache = LRUCache(maxsize=settings.MERCHANT_CACHE_SIZE)
+_alias_cache_lock = threading.Lock()
+
+def _cache_aliases(database: str, ids: Dict[str, int]) -> None:
+    with _alias_cache_lock:
+        for alias, merchant_id in ids.items():
+            alias_cache[(database, alias)] = merchant_id
+
+@event.listens_for(OrmSession, "after_commit")
+def _cache_committed_aliases(session):
+    for database, ids in session.info.pop("pending_aliases", ()):
+        _cache_aliases(database, ids)
+
+@event.listens_for(OrmSession, "after_soft_rollback")
+def _discard_pending_aliases(session, previous_transaction):
+    if not previous_transaction.nested:
+        session.info.pop("pending_aliases", None)
+
+class MerchantNormalizer:
+    """
+    Map raw merchant strings to canonical Merchant ids. Lookups go through
+    the in-process LRU, then merchant_aliases; strings never seen before are
+    matched against the known prefixes (or become their own merchant) and
+    persisted, so the mapping is stable across workers and backfills.
+    """
+    
+    def __init__(self, session: Session):
+        self.session = session
+        self._database = str(session.get_bind().url)
+    
+    def resolve(self, raw: Optional[str]) -> Optional[int]:
+        return self.resolve_many([raw]).get(raw) if raw else None
+    
+    def resolve_many(self, raws: Iterable[Optional[str]]) -> Dict[str, int]:
+        """Merchant id for every raw string that cleans to something"""
+        aliases = {raw: clean_merchant(raw) for raw in set(raws) if raw}
+        aliases = {raw: alias for raw, alias in aliases.items() if alias}
+        
+        ids: Dict[str, int] = {}
+        with _alias_cache_lock:
+            for alias in set(aliases.values()):
+                merchant_id = alias_cache.get((self._database, alias))
+                if merchant_id is not None:
+                    ids[alias] = merchant_id
+        
+        missing = set(aliases.values()) - ids.keys()
+        if missing:
+            stored = self._load(missing)
+            _cache_aliases(self._database, stored)
+            ids.update(stored)
+            unseen = missing - ids.keys()
+            if unseen:
+                self._create(unseen)
+                created = self._load(unseen)
+                ids.update(created)
+                # Only cache new aliases once their rows are committed; a
+                # rolled-back id would otherwise be handed to later inserts
+                self.session.info.setdefault("pending_aliases", []).append((self._database, created))
+        
+        return {raw: ids[alias] for raw, alias in aliases.items()}
+    
+    def _load(self, aliases: Set[str]) -> Dict[str, int]:
+        return dict(self.session.exec(
+            select(MerchantAlias.alias, MerchantAlias.merchant_id)
+            .where(MerchantAlias.alias.in_(aliases))
+        ).all())
+    
+    def _create(self, aliases: Set[str]) -> None:
+        """Persist new aliases; concurrent writers of the same alias are ignored"""
+        canonical = {alias: known_index.match(alias) or alias for alias in aliases}
+        names = set(canonical.values())
+        
+        self.session.execute(
+            self._insert(Merchant)
+            .values([{"name": name} for name in names])
+            .on_conflict_do_nothing(index_elements=["name"])
+        )
+        merchant_ids = dict(self.session.exec(
+            select(Merchant.name, Merchant.id).where(Merchant.name.in_(names))
+        ).all())
+        
+        self.session.execute(
+            self._insert(MerchantAlias)
+            .values([
+                {"alias": alias, "merchant_id": merchant_ids[name]}
+                for alias, name in canonical.items()
+            ])
+            .on_conflict_do_nothing(index_elements=["alias"])
+        )
+        logger.debug(f"Created {len(aliases)} merchant aliases")
+    
+    def _insert(self, model):
+        if self.session.get_bind().dialect.name == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        return insert(model)
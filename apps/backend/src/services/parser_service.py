@@ -1,4 +1,4 @@
-# apps/backend/src/services/parser.py
+# apps/backend/src/services/parser_service.py
 import re
 import yaml
 from pathlib import Path
@@ -8,14 +8,16 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# apps/backend/providers, next to src/
+PROVIDERS_DIR = Path(__file__).resolve().parents[2] / "providers"
+
 class TransactionParser:
-    def __init__(self):
-        self.providers = self._load_providers()
+    def __init__(self, providers_dir: Path = PROVIDERS_DIR):
+        self.providers = self._load_providers(providers_dir)
     
-    def _load_providers(self) -> Dict:
+    def _load_providers(self, providers_dir: Path) -> Dict:
         """Load provider configurations from YAML files"""
         providers = {}
-        providers_dir = Path(__file__).parent.parent / "providers"
         
         if not providers_dir.exists():
             logger.warning(f"Providers directory not found: {providers_dir}")
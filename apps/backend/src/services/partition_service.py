@@ -0,0 +1,115 @@
+# apps/backend/src/services/partition_service.py
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from typing import List, Optional, Tuple
+from datetime import date
+from dateutil.relativedelta import relativedelta
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+PARENT = "transactions"
+DEFAULT_PARTITION = "transactions_default"
+PARTITION_RE = re.compile(r"^transactions_y(\d{4})m(\d{2})$")
+
+def partition_name(month: date) -> str:
+    return f"{PARENT}_y{month:%Y}m{month:%m}"
+
+def month_bounds(month: date) -> Tuple[date, date]:
+    start = month.replace(day=1)
+    return start, start + relativedelta(months=1)
+
+def list_partitions(conn: Connection) -> List[date]:
+    """Months that currently have an attached partition, oldest first"""
+    names = conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :parent"
+    ), {"parent": PARENT}).scalars()
+
+    months = []
+    for name in names:
+        match = PARTITION_RE.match(name)
+        if match:
+            months.append(date(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+def create_partition(conn: Connection, month: date) -> bool:
+    """
+    Create the partition for month. Rows for that month that already landed
+    in the default partition are moved into it before it is attached.
+    Returns False if the partition already existed.
+    """
+    start, end = month_bounds(month)
+    name = partition_name(start)
+    if start in list_partitions(conn):
+        return False
+
+    bounds = {"start": start, "end": end}
+    in_default = conn.execute(text(
+        f"SELECT count(*) FROM {DEFAULT_PARTITION} WHERE txn_date >= :start AND txn_date < :end"
+    ), bounds).scalar()
+
+    if not in_default:
+        conn.execute(text(
+            f"CREATE TABLE {name} PARTITION OF {PARENT} FOR VALUES FROM ('{start}') TO ('{end}')"
+        ))
+    else:
+        conn.execute(text(f"CREATE TABLE {name} (LIKE {PARENT} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+        conn.execute(text(
+            f"INSERT INTO {name} SELECT * FROM {DEFAULT_PARTITION} "
+            "WHERE txn_date >= :start AND txn_date < :end"
+        ), bounds)
+        conn.execute(text(
+            f"DELETE FROM {DEFAULT_PARTITION} WHERE txn_date >= :start AND txn_date < :end"
+        ), bounds)
+        conn.execute(text(
+            f"ALTER TABLE {PARENT} ATTACH PARTITION {name} FOR VALUES FROM ('{start}') TO ('{end}')"
+        ))
+
+    logger.info(f"Created partition {name} ({in_default or 0} rows moved from default)")
+    return True
+
+def ensure_partitions(conn: Connection, months_ahead: int, today: Optional[date] = None) -> List[str]:
+    """
+    Create partitions from the current month to months_ahead, plus one for
+    every month that has rows sitting in the default partition (e.g. old
+    statements imported after the fact).
+    """
+    current = (today or date.today()).replace(day=1)
+    wanted = {current + relativedelta(months=i) for i in range(months_ahead + 1)}
+    wanted.update(conn.execute(text(
+        f"SELECT DISTINCT date_trunc('month', txn_date)::date FROM {DEFAULT_PARTITION}"
+    )).scalars())
+
+    return [partition_name(month) for month in sorted(wanted) if create_partition(conn, month)]
+
+def detach_partitions(
+    conn: Connection,
+    before: date,
+    archive_schema: Optional[str] = None,
+    drop: bool = False
+) -> List[str]:
+    """
+    Detach partitions whose whole month is before `before`. Detached tables
+    are kept as plain tables, optionally moved to archive_schema, or dropped.
+    """
+    detached = []
+    for month in list_partitions(conn):
+        _, end = month_bounds(month)
+        if end > before:
+            continue
+
+        name = partition_name(month)
+        conn.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {name}"))
+        if drop:
+            conn.execute(text(f"DROP TABLE {name}"))
+        elif archive_schema:
+            conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {archive_schema}"))
+            conn.execute(text(f"ALTER TABLE {name} SET SCHEMA {archive_schema}"))
+
+        logger.info(f"Detached partition {name}")
+        detached.append(name)
+    return detached
@@ -0,0 +1,226 @@
+# apps/backend/src/services/recurring_service.py
+from sqlmodel import Session, select
+from sqlalchemy import delete, func
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from itertools import groupby
+from statistics import median
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import logging
+
+from src.models.models import RecurringScan, RecurringSeries, Tombstone, Transaction
+
+logger = logging.getLogger(__name__)
+
+# (cadence, period in days, allowed date jitter in days)
+CADENCES = [
+    ("weekly", 7, 2),
+    ("biweekly", 14, 3),
+    ("monthly", 30, 5),
+    ("quarterly", 91, 10),
+    ("yearly", 365, 20),
+]
+JITTER = {period: jitter for _, period, jitter in CADENCES}
+AMOUNT_TOLERANCE = 0.15  # relative to the previous charge, so price changes are followed
+MIN_OCCURRENCES = 3
+MIN_REGULAR_SHARE = 0.75  # share of intervals that must match the cadence
+# Writes committed by transactions that started before a scan can carry an
+# updated_at slightly older than it; look back this far (like /sync)
+SCAN_OVERLAP = timedelta(seconds=30)
+
+@dataclass
+class Charge:
+    id: int
+    merchant_id: int
+    txn_date: date
+    amount: float
+
+def amount_matches(amount: float, previous: float) -> bool:
+    return abs(amount - previous) <= AMOUNT_TOLERANCE * abs(previous)
+
+def on_schedule(txn_date: date, last_date: date, period_days: int) -> bool:
+    return abs((txn_date - last_date).days - period_days) <= JITTER[period_days]
+
+def detect_series(charges: Iterable[Charge]) -> List[Dict]:
+    """
+    Recurring series in charges sorted by (merchant_id, txn_date), read in a
+    single pass. Each merchant's charges are split into runs of similar
+    amounts; a run is a series when most of its intervals match a cadence.
+    """
+    found = []
+    for merchant_id, merchant_charges in groupby(charges, key=lambda c: c.merchant_id):
+        runs: List[List[Charge]] = []
+        for charge in merchant_charges:
+            run = next((r for r in runs if amount_matches(charge.amount, r[-1].amount)), None)
+            if run is None:
+                runs.append([charge])
+            else:
+                run.append(charge)
+
+        for run in runs:
+            series = periodic(run)
+            if series:
+                found.append({**series, 'merchant_id': merchant_id})
+    return found
+
+def periodic(charges: List[Charge]) -> Optional[Dict]:
+    """Series fields for date-ordered charges of one amount run, if periodic"""
+    if len(charges) < MIN_OCCURRENCES:
+        return None
+    intervals = [(b.txn_date - a.txn_date).days for a, b in zip(charges, charges[1:])]
+    typical = median(intervals)
+
+    for cadence, period, jitter in CADENCES:
+        if abs(typical - period) > jitter:
+            continue
+        regular = sum(abs(interval - period) <= jitter for interval in intervals)
+        if regular / len(intervals) < MIN_REGULAR_SHARE:
+            return None
+        last = charges[-1]
+        return {
+            'cadence': cadence,
+            'period_days': period,
+            'amount': last.amount,
+            'occurrences': len(charges),
+            'first_date': charges[0].txn_date,
+            'last_date': last.txn_date,
+            'next_expected': last.txn_date + timedelta(days=period),
+            'last_transaction_id': last.id,
+        }
+    return None
+
+class RecurringDetector:
+    """
+    Maintain a user's RecurringSeries. After the first (full) scan only
+    transactions past the user's watermark are read: a charge that lands
+    where an existing series expects its next one extends it in place, and
+    merchants with any other new charge are re-scanned from their history.
+    Older rows written since the previous scan (merchant backfills, rows
+    flagged as transfers, edits) re-scan their merchant too, and a deleted
+    transaction re-scans all of the user's merchants. A charge moved to
+    another merchant only re-scans the new one; run with full=True after
+    bulk merchant reassignments.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def run(self, user_id: str, full: bool = False) -> Dict:
+        started = datetime.utcnow()
+        scan = self.session.get(RecurringScan, user_id)
+        high = self.session.exec(
+            select(func.max(Transaction.id)).where(Transaction.user_id == user_id)
+        ).one() or 0
+
+        if scan is None or full or self._deleted_since(user_id, scan.scanned_at - SCAN_OVERLAP):
+            scan = scan or RecurringScan(user_id=user_id)
+            stats = {'extended': 0, 'detected': self._rescan(user_id, None, high)}
+        else:
+            touched = self._touched_merchants(user_id, scan.last_transaction_id, scan.scanned_at - SCAN_OVERLAP)
+            charges = [
+                c for c in self._charges(user_id, high, after_id=scan.last_transaction_id)
+                if c.merchant_id not in touched
+            ]
+            extended, pending = self._extend(user_id, charges)
+            pending |= touched
+            detected = self._rescan(user_id, pending, high) if pending else 0
+            stats = {'extended': extended, 'detected': detected}
+
+        scan.last_transaction_id = high
+        scan.scanned_at = started
+        self.session.add(scan)
+        self.session.commit()
+
+        logger.info(f"Recurring scan for {user_id}: {stats}")
+        return stats
+
+    def _touched_merchants(self, user_id: str, up_to_id: int, since: datetime) -> Set[int]:
+        """Merchants of already-scanned transactions written since `since`"""
+        return set(self.session.exec(
+            select(Transaction.merchant_id).where(
+                Transaction.user_id == user_id,
+                Transaction.id <= up_to_id,
+                Transaction.updated_at >= since,
+                Transaction.merchant_id != None
+            ).distinct()
+        ).all())
+
+    def _deleted_since(self, user_id: str, since: datetime) -> bool:
+        return self.session.exec(
+            select(Tombstone.id).where(
+                Tombstone.user_id == user_id,
+                Tombstone.entity == Transaction.__tablename__,
+                Tombstone.deleted_at >= since
+            ).limit(1)
+        ).first() is not None
+
+    def _charges(
+        self,
+        user_id: str,
+        up_to_id: int,
+        after_id: int = 0,
+        merchant_ids: Optional[Set[int]] = None
+    ) -> List[Charge]:
+        """The user's merchant expenses in (after_id, up_to_id], by merchant and date"""
+        query = select(
+            Transaction.id, Transaction.merchant_id, Transaction.txn_date, Transaction.amount
+        ).where(
+            Transaction.user_id == user_id,
+            Transaction.merchant_id != None,
+            Transaction.amount < 0,
+            Transaction.is_transfer == False,
+            Transaction.id > after_id,
+            Transaction.id <= up_to_id
+        )
+        if merchant_ids is not None:
+            query = query.where(Transaction.merchant_id.in_(merchant_ids))
+        query = query.order_by(Transaction.merchant_id, Transaction.txn_date, Transaction.id)
+        return [Charge(*row) for row in self.session.exec(query).all()]
+
+    def _extend(self, user_id: str, charges: List[Charge]) -> Tuple[int, Set[int]]:
+        """Extend series by charges that arrive on schedule; return (extended, merchants to rescan)"""
+        merchant_ids = {c.merchant_id for c in charges}
+        series_by_merchant: Dict[int, List[RecurringSeries]] = {}
+        if merchant_ids:
+            for series in self.session.exec(
+                select(RecurringSeries).where(
+                    RecurringSeries.user_id == user_id,
+                    RecurringSeries.merchant_id.in_(merchant_ids)
+                )
+            ).all():
+                series_by_merchant.setdefault(series.merchant_id, []).append(series)
+
+        extended = 0
+        pending: Set[int] = set()
+        for charge in sorted(charges, key=lambda c: (c.txn_date, c.id)):
+            series = next((
+                s for s in series_by_merchant.get(charge.merchant_id, [])
+                if amount_matches(charge.amount, s.amount)
+                and on_schedule(charge.txn_date, s.last_date, s.period_days)
+            ), None)
+            if series is None:
+                pending.add(charge.merchant_id)
+                continue
+            series.amount = charge.amount
+            series.occurrences += 1
+            series.last_date = charge.txn_date
+            series.next_expected = charge.txn_date + timedelta(days=series.period_days)
+            series.last_transaction_id = charge.id
+            self.session.add(series)
+            extended += 1
+        return extended, pending
+
+    def _rescan(self, user_id: str, merchant_ids: Optional[Set[int]], up_to_id: int) -> int:
+        """Replace the series of these merchants (all when None) from their full history"""
+        found = detect_series(self._charges(user_id, up_to_id, merchant_ids=merchant_ids))
+
+        clear = delete(RecurringSeries).where(RecurringSeries.user_id == user_id)
+        if merchant_ids is not None:
+            clear = clear.where(RecurringSeries.merchant_id.in_(merchant_ids))
+        self.session.execute(clear)
+        self.session.add_all([RecurringSeries(user_id=user_id, **series) for series in found])
+        return len(found)
+
+def active_series(series: RecurringSeries, today: date) -> bool:
+    """Still charging: the next charge is not overdue by more than the jitter"""
+    return series.next_expected + timedelta(days=JITTER[series.period_days]) >= today
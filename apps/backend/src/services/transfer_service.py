@@ -0,0 +1,152 @@
+# apps/backend/src/services/transfer_service.py
+from sqlmodel import Session, select
+from sqlalchemy import bindparam, func, update
+from datetime import timedelta
+from itertools import groupby
+from typing import List, Tuple
+import logging
+
+from src.core.config import settings
+from src.core.database import mark_written
+from src.models.models import Transaction
+from src.services.budget_service import BudgetTracker, month_of
+
+logger = logging.getLogger(__name__)
+
+CANDIDATE_COLUMNS = (
+    Transaction.id,
+    Transaction.account_id,
+    Transaction.txn_date,
+    Transaction.amount,
+    Transaction.currency,
+)
+
+def _key(row) -> Tuple[str, float]:
+    return row.currency, round(abs(row.amount), 2)
+
+def match_transfers(rows: List, window: timedelta) -> List[Tuple]:
+    """
+    Pair outflows with inflows of the same currency and absolute amount on
+    different accounts, at most `window` apart. Both sides are sorted by
+    (currency, amount, date) and merged like a sort-merge join, so the cost
+    is O(n log n); within an amount, the closest dates are paired first.
+    Returns (outflow, inflow) row pairs.
+    """
+    order = lambda r: (_key(r), r.txn_date, r.id)
+    outflows = sorted((r for r in rows if r.amount < 0), key=order)
+    inflows = sorted((r for r in rows if r.amount > 0), key=order)
+
+    pairs = []
+    out_groups = groupby(outflows, key=_key)
+    in_groups = groupby(inflows, key=_key)
+    out_key, outs = next(out_groups, (None, None))
+    in_key, ins = next(in_groups, (None, None))
+
+    while outs is not None and ins is not None:
+        if out_key < in_key:
+            out_key, outs = next(out_groups, (None, None))
+        elif in_key < out_key:
+            in_key, ins = next(in_groups, (None, None))
+        else:
+            pairs.extend(_match_dates(list(outs), list(ins), window))
+            out_key, outs = next(out_groups, (None, None))
+            in_key, ins = next(in_groups, (None, None))
+    return pairs
+
+def _match_dates(outs: List, ins: List, window: timedelta) -> List[Tuple]:
+    """
+    Pair outflows and inflows of one amount, both sorted by date. Every
+    cross-account pair within the window is a candidate; the closest dates
+    win, so a same-account refund neither blocks nor steals a transfer.
+    Candidates are only generated inside the window, so this stays linear
+    unless many rows share an amount within a few days.
+    """
+    candidates = []
+    lo = 0
+    for out in outs:
+        while lo < len(ins) and ins[lo].txn_date + window < out.txn_date:
+            lo += 1
+        for inflow in ins[lo:]:
+            if inflow.txn_date > out.txn_date + window:
+                break
+            # Same account is a refund or correction, not a transfer
+            if inflow.account_id != out.account_id:
+                gap = abs((inflow.txn_date - out.txn_date).days)
+                candidates.append((gap, out.txn_date, out.id, inflow.id, out, inflow))
+
+    pairs = []
+    used_outs, used_ins = set(), set()
+    for *_, out, inflow in sorted(candidates, key=lambda c: c[:4]):
+        if out.id not in used_outs and inflow.id not in used_ins:
+            used_outs.add(out.id)
+            used_ins.add(inflow.id)
+            pairs.append((out, inflow))
+    return pairs
+
+class TransferDetector:
+    """
+    Mark transfers between a user's own accounts: both sides get
+    is_transfer=True and each other's id in transfer_pair_id, so reports
+    exclude them with a plain filter instead of a self-join. A pair the
+    user un-marks keeps its transfer_pair_id and is not matched again.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+        self.window = timedelta(days=settings.TRANSFER_WINDOW_DAYS)
+
+    def latest_id(self, user_id: str) -> int:
+        """Watermark to pass to detect() after adding transactions"""
+        return self.session.exec(
+            select(func.max(Transaction.id)).where(Transaction.user_id == user_id)
+        ).one() or 0
+
+    def detect(self, user_id: str, after_id: int = 0) -> int:
+        """
+        Pair unmatched transactions with id > after_id against every unmatched
+        transaction within the date window (all of them when after_id is 0).
+        Returns the number of pairs marked; commits.
+        """
+        conditions = [
+            Transaction.user_id == user_id,
+            Transaction.is_transfer == False,
+            Transaction.transfer_pair_id == None,
+            Transaction.amount != 0
+        ]
+        if after_id:
+            first, last = self.session.exec(
+                select(func.min(Transaction.txn_date), func.max(Transaction.txn_date))
+                .where(*conditions, Transaction.id > after_id)
+            ).one()
+            if first is None:
+                return 0
+            conditions += [
+                Transaction.txn_date >= first - self.window,
+                Transaction.txn_date <= last + self.window
+            ]
+
+        rows = self.session.exec(select(*CANDIDATE_COLUMNS).where(*conditions)).all()
+        pairs = [
+            (out, inflow) for out, inflow in match_transfers(rows, self.window)
+            if out.id > after_id or inflow.id > after_id
+        ]
+        if pairs:
+            table = Transaction.__table__
+            self.session.execute(
+                update(table)
+                .where(table.c.id == bindparam("_id"), table.c.txn_date == bindparam("_txn_date"))
+                .values(is_transfer=True, transfer_pair_id=bindparam("_pair_id")),
+                [
+                    {"_id": a.id, "_txn_date": a.txn_date, "_pair_id": b.id}
+                    for out, inflow in pairs
+                    for a, b in ((out, inflow), (inflow, out))
+                ]
+            )
+            BudgetTracker(self.session).refresh(
+                user_id, {month_of(row.txn_date) for pair in pairs for row in pair}
+            )
+            mark_written(self.session, user_id)
+        self.session.commit()
+
+        logger.info(f"Marked {len(pairs)} transfers for {user_id} from {len(rows)} candidates")
+        return len(pairs)
@@ -0,0 +1,61 @@
+# apps/backend/tests/conftest.py
+import pytest
+from contextlib import contextmanager
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, SQLModel, create_engine
+from typing import List
+
+class QueryCounter:
+    """Records every SQL statement run through any Engine (sync or async) while active"""
+    
+    def __init__(self):
+        self.statements: List[str] = []
+    
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+    
+    def __enter__(self):
+        event.listen(Engine, "before_cursor_execute", self._record)
+        return self
+    
+    def __exit__(self, *exc_info):
+        event.remove(Engine, "before_cursor_execute", self._record)
+    
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+@contextmanager
+def assert_max_queries(limit: int):
+    """Fail if the block runs more than `limit` SQL statements"""
+    with QueryCounter() as counter:
+        yield counter
+    assert counter.count <= limit, (
+        f"Expected at most {limit} queries, ran {counter.count}:\n" + "\n".join(counter.statements)
+    )
+
+# Test database (a file, so sync and async engines see the same data)
+@pytest.fixture(name="db_url")
+def db_url_fixture(tmp_path):
+    return f"sqlite:///{tmp_path / 'test.db'}"
+
+@pytest.fixture(name="engine")
+def engine_fixture(db_url: str):
+    engine = create_engine(db_url, connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture(name="session")
+def session_fixture(engine: Engine):
+    with Session(engine) as session:
+        yield session
+
+@pytest.fixture(name="query_budget")
+def query_budget_fixture():
+    """
+    Usage: `with query_budget(3): client.get(...)`. Seed more rows than the
+    budget so per-row (N+1) queries show up as a failure.
+    """
+    return assert_max_queries
@@ -1,33 +1,37 @@
 # apps/backend/src/tests/test_transactions.py
 import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import Session, create_engine, SQLModel
-from sqlmodel.pool import StaticPool
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine
 from datetime import date
 
 from src.main import app
-from src.core.database import get_session
-from src.models.models import User, Account, Transaction, TransactionSource, Category
+from src.core.database import get_session, get_async_session
+from src.api.dependencies import get_read_session, get_async_read_session, get_async_read_session_factory
+from src.models.models import (
+    User, Account, Transaction, TransactionSource, Category, CategoryClosure, TransactionPayload, Rule, Budget
+)
 import hashlib
 
-# Test database
-@pytest.fixture(name="session")
-def session_fixture():
-    engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    SQLModel.metadata.create_all(engine)
-    with Session(engine) as session:
-        yield session
-
 @pytest.fixture(name="client")
-def client_fixture(session: Session):
+def client_fixture(session: Session, db_url: str):
+    async_engine = create_async_engine(db_url.replace("sqlite://", "sqlite+aiosqlite://"))
+    
     def get_session_override():
         return session
     
+    async def get_async_session_override():
+        async with AsyncSession(async_engine, expire_on_commit=False) as async_session:
+            yield async_session
+    
     app.dependency_overrides[get_session] = get_session_override
+    app.dependency_overrides[get_read_session] = get_session_override
+    app.dependency_overrides[get_async_session] = get_async_session_override
+    app.dependency_overrides[get_async_read_session] = get_async_session_override
+    app.dependency_overrides[get_async_read_session_factory] = (
+        lambda: lambda: AsyncSession(async_engine, expire_on_commit=False)
+    )
     client = TestClient(app)
     yield client
     app.dependency_overrides.clear()
@@ -65,7 +69,7 @@ def test_category_fixture(session: Session):
 def test_create_transaction(client: TestClient, test_account: Account, test_user: User):
     """Test creating a manual transaction"""
     # Mock auth
-    from src.core.auth_jwt import get_current_user_id
+    from src.core.auth import get_current_user_id
     app.dependency_overrides[get_current_user_id] = lambda: test_user.id
     
     response = client.post(
@@ -112,7 +116,7 @@ def test_list_transactions(
     session.commit()
     
     # Mock auth
-    from src.core.auth_jwt import get_current_user_id
+    from src.core.auth import get_current_user_id
     app.dependency_overrides[get_current_user_id] = lambda: test_user.id
     
     # Test filtering by month
@@ -161,7 +165,7 @@ def test_monthly_report(
     session.commit()
     
     # Mock auth
-    from src.core.auth_jwt import get_current_user_id
+    from src.core.auth import get_current_user_id
     app.dependency_overrides[get_current_user_id] = lambda: test_user.id
     
     response = client.get("/reports/monthly?month=2025-01")
@@ -174,6 +178,62 @@ def test_monthly_report(
     assert data["net"] == 120000
     assert len(data["by_category"]) >= 1
 
+@pytest.mark.filterwarnings("error::sqlalchemy.exc.SAWarning")
+def test_category_subtree(
+    client: TestClient,
+    session: Session,
+    test_account: Account,
+    test_user: User
+):
+    """Test that the closure table lets filters and reports include subcategories"""
+    root = Category(name="Necesidades")
+    session.add(root)
+    session.commit()
+    child = Category(name="Alimentación", parent_id=root.id)
+    other = Category(name="Gustos")
+    session.add_all([child, other])
+    session.commit()
+    leaf = Category(name="Supermercado", parent_id=other.id)
+    session.add(leaf)
+    session.commit()
+    
+    # Move the leaf under Alimentación
+    leaf.parent_id = child.id
+    session.add(leaf)
+    session.commit()
+    
+    ancestors = session.exec(
+        select(CategoryClosure.ancestor_id, CategoryClosure.depth)
+        .where(CategoryClosure.descendant_id == leaf.id)
+    ).all()
+    assert sorted(ancestors) == sorted([(leaf.id, 0), (child.id, 1), (root.id, 2)])
+    
+    for i, category_id in enumerate([root.id, child.id, leaf.id, other.id]):
+        session.add(Transaction(
+            user_id=test_user.id,
+            account_id=test_account.id,
+            txn_date=date(2025, 3, 10),
+            amount=-1000 * (i + 1),
+            description=f"Subtree {i}",
+            source=TransactionSource.MANUAL,
+            category_id=category_id,
+            hash_dedupe=hashlib.sha256(f"subtree{i}".encode()).hexdigest()
+        ))
+    session.commit()
+    
+    from src.core.auth import get_current_user_id
+    app.dependency_overrides[get_current_user_id] = lambda: test_user.id
+    
+    response = client.get(f"/transactions?category_id={root.id}")
+    assert {t["description"] for t in response.json()} == {"Subtree 0", "Subtree 1", "Subtree 2"}
+    
+    response = client.get(f"/transactions?category_id={child.id}")
+    assert len(response.json()) == 2
+    
+    data = client.get("/reports/monthly?month=2025-03&rollup=true").json()
+    totals = {c["category_id"]: c["total"] for c in data["by_category"]}
+    assert totals == {root.id: -6000, other.id: -4000}
+
 def test_export_csv(
     client: TestClient,
     session: Session,
@@ -199,7 +259,7 @@ def test_export_csv(
     session.commit()
     
     # Mock auth
-    from src.core.auth_jwt import get_current_user_id
+    from src.core.auth import get_current_user_id
     app.dependency_overrides[get_current_user_id] = lambda: test_user.id
     
     response = client.get("/exports/monthly.csv?month=2025-01")
@@ -217,3 +277,691 @@ def test_health_check(client: TestClient):
     data = response.json()
     assert data["status"] in ["ok", "degraded"]
     assert "database" in data
+
+def test_app_mounts_api_routers():
+    """Test the app serves every API router, not only health and metrics"""
+    paths = {route.path for route in app.routes}
+    assert {
+        "/transactions", "/reports/monthly", "/exports/monthly.csv", "/dashboard", "/sync", "/events",
+        "/accounts", "/categories", "/budgets", "/budgets/status", "/rules", "/rules/apply",
+    } <= paths
+
+def test_import_csv_statement(
+    client: TestClient,
+    session: Session,
+    test_account: Account,
+    test_user: User
+):
+    """Test bulk CSV import with deduplication on re-import"""
+    from src.core.auth import get_current_user_id
+    app.dependency_overrides[get_current_user_id] = lambda: test_user.id
+    
+    csv_body = (
+        "Fecha;Descripción;Comercio;Monto\n"
+        "15/01/2025;Compra Lider;LIDER;-25.000\n"
+        "15/01/2025;Compra Lider;LIDER;-25.000\n"
+        "16/01/2025;Sueldo;;1.500.000\n"
+        "fecha-invalida;Error;;100\n"
+    )
+    
+    response = client.post(
+        f"/transactions/import?account_id={test_account.id}&format=csv",
+        content=csv_body.encode()
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data == {"processed": 4, "created": 3, "duplicates": 0, "failed": 1, "transfers": 0}
+    
+    response = client.post(
+        f"/transactions/import?account_id={test_account.id}&format=csv",
+        content=csv_body.encode()
+    )
+    assert response.json()["duplicates"] == 3
+    
+    imported = session.exec(
+        select(Transaction).where(Transaction.source == TransactionSource.IMPORT)
+    ).all()
+    assert len(imported) == 3
+    assert sorted(t.amount for t in imported) == [-25000, -25000, 1500000]
+
+def test_csv_statement_parser():
+    """Test amount separators and quoted newlines split across chunks"""
+    from src.services.import_service import CsvStatementParser, parse_amount
+    
+    assert parse_amount("1,234.50") == 1234.5
+    assert parse_amount("1.234,50") == 1234.5
+    assert parse_amount("$ 25.000") == 25000
+    assert parse_amount("1,234,567") == 1234567
+    assert parse_amount("-25000.00") == -25000
+    for ambiguous in ("1,234", "1.23,4.5"):
+        with pytest.raises(ValueError):
+            parse_amount(ambiguous)
+    
+    csv_body = (
+        'Fecha,Descripción,Monto\n'
+        '15/01/2025,"Compra en LIDER\nsucursal, centro",-25.000\n'
+        '16/01/2025,Pago USD,"1,234.50"\n'
+        '17/01/2025,Ambiguo,"1,234"\n'
+    )
+    parser = CsvStatementParser()
+    rows = []
+    for i in range(0, len(csv_body), 7):
+        rows += parser.feed(csv_body[i:i + 7])
+    rows += parser.close()
+    
+    assert [(r["description"], r["amount"]) for r in rows] == [
+        ("Compra en LIDER\nsucursal, centro", -25000),
+        ("Pago USD", 1234.5),
+    ]
+    assert parser.failed == 1
+
+def test_import_ofx_statement(
+    client: TestClient,
+    session: Session,
+    test_account: Account,
+    test_user: User
+):
+    """Test OFX import"""
+    from src.core.auth import get_current_user_id
+    app.dependency_overrides[get_current_user_id] = lambda: test_user.id
+    
+    ofx_body = (
+        "OFXHEADER:100\n<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><CURDEF>CLP\n"
+        "<BANKTRANLIST>\n"
+        "<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20250115120000<TRNAMT>-12990.00"
+        "<FITID>A1<NAME>UBER *TRIP</STMTTRN>\n"
+        "<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20250120<TRNAMT>50000"
+        "<FITID>A2<NAME>TRANSFERENCIA</STMTTRN>\n"
+        "</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>"
+    )
+    
+    response = client.post(
+        f"/transactions/import?account_id={test_account.id}&format=ofx",
+        content=ofx_body.encode()
+    )
+    assert response.status_code == 200
+    assert response.json()["created"] == 2
+    
+    txn = session.exec(select(Transaction).where(Transaction.merchant == "UBER *TRIP")).one()
+    assert txn.txn_date == date(2025, 1, 15)
+    assert txn.amount == -12990.0
+
+def test_get_transaction(client: TestClient, test_account: Account, test_user: User):
+    """Test fetching a single transaction by id"""
+    from src.core.auth import get_current_user_id
+    app.dependency_overrides[get_current_user_id] = lambda: test_user.id
+    
+    created = client.post(
+        "/transactions",
+        json={
+            "account_id": test_account.id,
+            "txn_date": "2025-02-01",
+            "amount": -1990.0,
+            "description": "Cafe",
+        }
+    ).json()
+    
+    response = client.get(f"/transactions/{created['id']}")
+    assert response.status_code == 200
+    assert response.json() == created
+    assert response.json()["txn_date"] == "2025-02-01"
+    assert "raw_payload" not in response.json()
+
+def test_get_transaction_payload(
+    client: TestClient,
+    session: Session,
+    test_account: Account,
+    test_user: User
+):
+    """Test that the raw payload is served from its side table"""
+    txn = Transaction(
+        user_id=test_user.id,
+        account_id=test_account.id,
+        txn_date=date(2025, 2, 3),
+        amount=-5000,
+        description="Compra en LIDER",
+        source=TransactionSource.EMAIL,
+        hash_dedupe=hashlib.sha256(b"payload-test").hexdigest()
+    )
+    session.add(txn)
+    session.flush()
+    session.add(TransactionPayload(
+        transaction_id=txn.id,
+        txn_date=txn.txn_date,
+        payload={"email_id": "msg-1", "subject": "Compra"}
+    ))
+    session.commit()
+    
+    from src.core.auth import get_current_user_id
+    app.dependency_overrides[get_current_user_id] = lambda: test_user.id
+    
+    response = client.get(f"/transactions/{txn.id}/payload")
+    assert response.status_code == 200
+    assert response.json() == {
+        "transaction_id": txn.id,
+        "payload": {"email_id": "msg-1", "subject": "Compra"}
+    }
+    
+    created = client.post(
+        "/transactions",
+        json={
+            "account_id": test_account.id,
+            "txn_date": "2025-02-04",
+            "amount": -100.0,
+            "description": "Manual",
+        }
+    ).json()
+    response = client.get(f"/transactions/{created['id']}/payload")
+    assert response.json()["payload"] is None
+    
+    assert client.get("/transactions/999999/payload").status_code == 404
+
+def test_merchant_report(client: TestClient, test_account: Account, test_user: User):
+    """Test that spending is grouped by canonical merchant"""
+    from src.core.auth import get_current_user_id
+    app.dependency_overrides[get_current_user_id] = lambda: test_user.id
+    
+    for amount, merchant in [(-5000, "UBER *TRIP"), (-7000, "UBER TRIP 1234"), (-9000, "UBER EATS 55"), (-1000, "JUMBO")]:
+        response = client.post(
+            "/transactions",
+            json={
+                "account_id": test_account.id,
+                "txn_date": "2025-05-10",
+                "amount": amount,
+                "description": merchant,
+                "merchant": merchant,
+            }
+        )
+        assert response.status_code == 201
+    
+    response = client.get("/reports/merchants?month=2025-05&limit=2")
+    assert response.status_code == 200
+    assert [(m["merchant_name"], m["total"], m["count"]) for m in response.json()] == [
+        ("Uber", -12000, 2),
+        ("Uber Eats", -9000, 1),
+    ]
+
+def test_subscriptions(client: TestClient, session: Session, test_account: Account, test_user: User):
+    """Test that detected recurring charges are listed, hiding stopped ones by default"""
+    from datetime import timedelta
+    from src.core.auth import get_current_user_id
+    from src.services.recurring_service import RecurringDetector
+    app.dependency_overrides[get_current_user_id] = lambda: test_user.id
+    
+    today = date.today()
+    charges = [(today - timedelta(days=30 * k), -8990, "NETFLIX.COM") for k in range(4)]
+    charges += [(date(2023, month, 15), -4500, "SPOTIFY P1234") for month in range(1, 5)]
+    for txn_date, amount, merchant in charges:
+        response = client.post(
+            "/transactions",
+            json={
+                "account_id": test_account.id,
+                "txn_date": txn_date.isoformat(),
+                "amount": amount,
+                "description": merchant,
+                "merchant": merchant,
+            }
+        )
+        assert response.status_code == 201
+    
+    assert RecurringDetector(session).run(test_user.id) == {"extended": 0, "detected": 2}
+    
+    response = client.get("/reports/subscriptions")
+    assert response.status_code == 200
+    [netflix] = response.json()
+    assert netflix["cadence"] == "monthly"
+    assert netflix["amount"] == -8990
+    assert netflix["occurrences"] == 4
+    assert netflix["next_expected"] == (today + timedelta(days=30)).isoformat()
+    assert netflix["active"] is True
+    
+    response = client.get("/reports/subscriptions?include_inactive=true")
+    assert [s["active"] for s in response.json()] == [True, False]
+
+def test_transfers_excluded_from_reports(
+    client: TestClient,
+    session: Session,
+    test_account: Account,
+    test_user: User
+):
+    """Test that detected transfers are paired and left out of the monthly report"""
+    from src.core.auth import get_current_user_id
+    app.dependency_overrides[get_current_user_id] = lambda: test_user.id
+    
+    savings = Account(user_id=test_user.id, name="Ahorro", institution="test_bank", type="debit")
+    session.add(savings)
+    session.commit()
+    
+    for i, (account_id, txn_date, amount) in enumerate([
+        (test_account.id, date(2025, 3, 1), -100000),
+        (savings.id, date(2025, 3, 2), 100000),
+        (test_account.id, date(2025, 3, 5), -20000),
+        (test_account.id, date(2025, 3, 15), -300000),
+    ]):
+        session.add(Transaction(
+            user_id=test_user.id,
+            account_id=account_id,
+            txn_date=txn_date,
+            amount=amount,
+            description="Transferencia" if abs(amount) != 20000 else "Compra",
+            source=TransactionSource.MANUAL,
+            hash_dedupe=hashlib.sha256(f"transfer{i}".encode()).hexdigest()
+        ))
+    session.commit()
+    
+    response = client.post("/transactions/transfers/detect")
+    assert response.json() == {"transfers": 1}
+    
+    # The import pairs its own rows with the unmatched outflow
+    response = client.post(
+        f"/transactions/import?account_id={savings.id}&format=csv",
+        content="Fecha;Descripción;Monto\n16/03/2025;Transferencia recibida;300.000\n".encode()
+    )
+    assert response.json()["transfers"] == 1
+    
+    response = client.get("/reports/monthly?month=2025-03")
+    data = response.json()
+    assert data["total_expenses"] == -20000
+    assert data["total_income"] == 0
+    
+    pairs = dict(session.exec(
+        select(Transaction.id, Transaction.transfer_pair_id).where(Transaction.is_transfer == True)
+    ).all())
+    assert len(pairs) == 4
+    assert all(pairs[pair_id] == txn_id for txn_id, pair_id in pairs.items())
+
+def test_dashboard(
+    client: TestClient,
+    session: Session,
+    test_account: Account,
+    test_user: User,
+    test_category: Category
+):
+    """Test that the dashboard bundles the report, recent transactions and lists"""
+    from src.core.auth import get_current_user_id
+    app.dependency_overrides[get_current_user_id] = lambda: test_user.id
+    
+    session.add(Budget(user_id=test_user.id, name="Comida", amount=200000, start_month=date(2025, 5, 1)))
+    for i in range(3):
+        session.add(Transaction(
+            user_id=test_user.id,
+            account_id=test_account.id,
+            txn_date=date(2025, 5, 10 + i),
+            amount=-1000 * (i + 1),
+            description=f"Dashboard {i}",
+            source=TransactionSource.MANUAL,
+            category_id=test_category.id,
+            hash_dedupe=hashlib.sha256(f"dashboard{i}".encode()).hexdigest()
+        ))
+    session.commit()
+    
+    # Count the pooled sessions a dashboard request checks out
+    factory = app.dependency_overrides[get_async_read_session_factory]()
+    opened = []
+    app.dependency_overrides[get_async_read_session_factory] = lambda: lambda: opened.append(1) or factory()
+    
+    response = client.get("/dashboard?month=2025-05&recent=2")
+    assert response.status_code == 200
+    assert len(opened) == 3
+    data = response.json()
+    
+    assert data["month"] == "2025-05"
+    assert data["report"] == client.get("/reports/monthly?month=2025-05").json()
+    assert [t["description"] for t in data["recent_transactions"]] == ["Dashboard 2", "Dashboard 1"]
+    assert [c["id"] for c in data["categories"]] == [test_category.id]
+    assert [a["id"] for a in data["accounts"]] == [test_account.id]
+    assert [b["name"] for b in data["budgets"]] == ["Comida"]
+
+def test_budget_status(
+    client: TestClient,
+    session: Session,
+    test_account: Account,
+    test_user: User,
+    test_category: Category
+):
+    """Test that budget status follows manual entries, bulk updates and imports"""
+    from src.core.auth import get_current_user_id
+    app.dependency_overrides[get_current_user_id] = lambda: test_user.id
+    
+    response = client.post(
+        "/budgets",
+        json={"name": "Gustos", "amount": 50000, "category_id": test_category.id, "start_month": "2025-06-01"}
+    )
+    budget_id = response.json()["id"]
+    
+    response = client.post(
+        "/transactions",
+        json={
+            "account_id": test_account.id,
+            "txn_date": "2025-06-03",
+            "amount": -20000,
+            "description": "Cine",
+            "category_id": test_category.id,
+        }
+    )
+    txn_id = response.json()["id"]
+    
+    response = client.get("/budgets/status?month=2025-06")
+    assert response.status_code == 200
+    [status] = response.json()
+    assert (status["budget_id"], status["spent"], status["remaining"]) == (budget_id, 20000, 30000)
+    
+    client.patch("/transactions/bulk", json={"ids": [txn_id], "changes": {"category_id": None}})
+    assert client.get("/budgets/status?month=2025-06").json()[0]["spent"] == 0
+    
+    client.patch("/transactions/bulk", json={"ids": [txn_id], "changes": {"category_id": test_category.id}})
+    session.add(Rule(
+        user_id=test_user.id,
+        pattern="CONCIERTO",
+        field="description",
+        action="set_category",
+        value=str(test_category.id)
+    ))
+    session.commit()
+    client.post(
+        f"/transactions/import?account_id={test_account.id}&format=csv",
+        content="Fecha;Descripción;Monto\n10/06/2025;Concierto;-25.000\n".encode()
+    )
+    assert client.get("/budgets/status?month=2025-06").json()[0]["spent"] == 20000
+    
+    client.post("/rules/apply")
+    [status] = client.get("/budgets/status?month=2025-06").json()
+    assert status["spent"] == 45000
+    assert status["used"] == 0.9
+    assert status["alerted"] == 0.8
+
+def test_categorize_transactions(
+    client: TestClient,
+    session: Session,
+    test_account: Account,
+    test_user: User,
+    monkeypatch
+):
+    """Test training on categorized history and filling uncategorized rows"""
+    from src.core.config import settings
+    from src.services.categorizer_service import CategorizerService
+    monkeypatch.setattr(settings, "AUTO_CATEGORIZE_MIN_DOCUMENTS", 4)
+    
+    food = Category(name="Alimentación")
+    transport = Category(name="Transporte")
+    session.add_all([food, transport])
+    session.commit()
+    
+    history = [("LIDER", food.id), ("JUMBO", food.id), ("UBER", transport.id), ("COPEC", transport.id)]
+    rows = history * 5 + [("LIDER", None), ("UBER", None), ("FERRETERIA", None)]
+    for i, (merchant, category_id) in enumerate(rows):
+        session.add(Transaction(
+            user_id=test_user.id,
+            account_id=test_account.id,
+            txn_date=date(2025, 6, 1) if category_id else date(2025, 7, 1 + i),
+            amount=-10000,
+            description=f"Compra en {merchant}",
+            merchant=merchant,
+            source=TransactionSource.EMAIL,
+            category_id=category_id,
+            hash_dedupe=hashlib.sha256(f"categorize{i}".encode()).hexdigest()
+        ))
+    session.commit()
+    
+    from src.core.auth import get_current_user_id
+    app.dependency_overrides[get_current_user_id] = lambda: test_user.id
+    
+    response = client.post("/transactions/categorize")
+    assert response.status_code == 200
+    assert response.json() == {"trained_on": 20, "scored": 3, "categorized": 2}
+    
+    categories = dict(session.exec(
+        select(Transaction.description, Transaction.category_id)
+        .where(Transaction.txn_date >= date(2025, 7, 1))
+    ).all())
+    assert categories == {
+        "Compra en LIDER": food.id,
+        "Compra en UBER": transport.id,
+        "Compra en FERRETERIA": None,
+    }
+    
+    # Incremental: its own suggestions are not learned, nothing left it is confident about
+    response = client.post("/transactions/categorize")
+    assert response.json() == {"trained_on": 20, "scored": 1, "categorized": 0}
+    
+    # A user's correction of an old row is learned on the next update
+    ferreteria = session.exec(
+        select(Transaction.id).where(Transaction.description == "Compra en FERRETERIA")
+    ).one()
+    response = client.patch("/transactions/bulk", json={"ids": [ferreteria], "changes": {"category_id": food.id}})
+    assert response.json() == {"updated": 1}
+    response = client.post("/transactions/categorize")
+    assert response.json() == {"trained_on": 21, "scored": 0, "categorized": 0}
+    
+    # Writes that leave the category alone are not learned again
+    history_ids = session.exec(
+        select(Transaction.id).where(Transaction.txn_date == date(2025, 6, 1))
+    ).all()
+    response = client.patch("/transactions/bulk", json={"ids": history_ids, "changes": {"is_transfer": False}})
+    assert response.json() == {"updated": 20}
+    synced_at = session.exec(select(Transaction.updated_at).where(Transaction.id == history_ids[0])).one()
+    response = client.post("/transactions/categorize")
+    assert response.json() == {"trained_on": 21, "scored": 0, "categorized": 0}
+    
+    # A recategorized row moves from its old label to the new one
+    model = CategorizerService(session).train(test_user.id)
+    food_docs = model.class_docs[food.id]
+    client.patch("/transactions/bulk", json={"ids": [ferreteria], "changes": {"category_id": transport.id}})
+    model = CategorizerService(session).train(test_user.id)
+    assert model.documents == 21
+    assert model.class_docs[food.id] == food_docs - 1
+    
+    # And a cleared one is forgotten
+    client.patch("/transactions/bulk", json={"ids": [ferreteria], "changes": {"category_id": None}})
+    response = client.post("/transactions/categorize")
+    assert response.json()["trained_on"] == 20
+    
+    # Training leaves updated_at alone, so /sync does not resend every row
+    assert session.exec(
+        select(Transaction.updated_at).where(Transaction.id == history_ids[0])
+    ).one() == synced_at
+
+def test_bulk_update_transactions(
+    client: TestClient,
+    session: Session,
+    test_account: Account,
+    test_user: User,
+    test_category: Category
+):
+    """Test bulk recategorization by ids and by filter"""
+    txn_ids = []
+    for i in range(4):
+        txn = Transaction(
+            user_id=test_user.id,
+            account_id=test_account.id,
+            txn_date=date(2025, 1 + i % 2, 10),
+            amount=-1000 * (i + 1),
+            currency="CLP",
+            description=f"Uber viaje {i}" if i < 3 else "Supermercado",
+            source=TransactionSource.MANUAL,
+            hash_dedupe=f"bulk-{i}"
+        )
+        session.add(txn)
+        session.commit()
+        txn_ids.append(txn.id)
+    
+    from src.core.auth import get_current_user_id
+    app.dependency_overrides[get_current_user_id] = lambda: test_user.id
+    
+    response = client.patch(
+        "/transactions/bulk",
+        json={"ids": txn_ids[:2], "changes": {"category_id": test_category.id}}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"updated": 2}
+    
+    response = client.patch(
+        "/transactions/bulk",
+        json={"filter": {"search": "uber", "month": "2025-01"}, "changes": {"is_transfer": True}}
+    )
+    assert response.json() == {"updated": 2}
+    
+    session.expire_all()
+    updated = session.exec(select(Transaction).where(Transaction.is_transfer == True)).all()
+    assert sorted(t.id for t in updated) == [txn_ids[0], txn_ids[2]]
+    
+    response = client.patch(
+        "/transactions/bulk",
+        json={"ids": txn_ids, "filter": {}, "changes": {"category_id": None}}
+    )
+    assert response.status_code == 422
+    
+    # An empty filter would touch every row; a null is_transfer is no change at all
+    for body in (
+        {"filter": {}, "changes": {"category_id": None}},
+        {"filter": {"search": None}, "changes": {"category_id": None}},
+        {"ids": txn_ids, "changes": {"is_transfer": None}},
+    ):
+        response = client.patch("/transactions/bulk", json=body)
+        assert response.status_code == 422, body
+
+def test_sync_changes(
+    client: TestClient,
+    session: Session,
+    test_account: Account,
+    test_user: User,
+    test_category: Category
+):
+    """Test delta sync: full snapshot, paging, updates and tombstones"""
+    from src.core.auth import get_current_user_id
+    app.dependency_overrides[get_current_user_id] = lambda: test_user.id
+    
+    ids = [
+        client.post(
+            "/transactions",
+            json={
+                "account_id": test_account.id,
+                "txn_date": f"2025-01-1{i}",
+                "amount": -1000.0 * (i + 1),
+                "description": f"Sync {i}",
+            }
+        ).json()["id"]
+        for i in range(3)
+    ]
+    
+    first = client.get("/sync?limit=2").json()
+    assert first["full"] and first["has_more"]
+    assert [t["id"] for t in first["transactions"]] == ids[:2]
+    assert [a["id"] for a in first["accounts"]] == [test_account.id]
+    assert [c["id"] for c in first["categories"]] == [test_category.id]
+    
+    second = client.get(f"/sync?limit=2&since={first['token']}").json()
+    assert not second["has_more"]
+    assert [t["id"] for t in second["transactions"]] == ids[2:]
+    
+    assert client.get("/sync?since=2999-01-01T00:00:00|0").json()["transactions"] == []
+    
+    client.patch("/transactions/bulk", json={"ids": [ids[0]], "changes": {"category_id": test_category.id}})
+    assert client.delete(f"/transactions/{ids[1]}").status_code == 204
+    
+    delta = client.get(f"/sync?since={second['token']}").json()
+    assert ids[0] in [t["id"] for t in delta["transactions"]]
+    assert ids[1] not in [t["id"] for t in delta["transactions"]]
+    assert delta["deleted"]["transactions"] == [ids[1]]
+    
+    assert client.get("/sync?since=bogus").status_code == 422
+
+def test_auth_token_cache(monkeypatch):
+    """Test verified tokens are cached until their exp"""
+    import time
+    import jwt
+    from fastapi.security import HTTPAuthorizationCredentials
+    from src.core import auth
+    
+    token = jwt.encode(
+        {"sub": "cached-user", "aud": "authenticated", "exp": int(time.time()) + 60},
+        auth.settings.SUPABASE_JWT_SECRET,
+        algorithm="HS256"
+    )
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    
+    assert auth.get_current_user_id(credentials) == "cached-user"
+    
+    def fail_decode(*args, **kwargs):
+        raise AssertionError("token should not be re-verified")
+    
+    monkeypatch.setattr(auth.jwt, "decode", fail_decode)
+    hits = auth.TOKEN_CACHE_REQUESTS.labels(result="hit")._value.get()
+    assert auth.get_current_user_id(credentials) == "cached-user"
+    assert auth.TOKEN_CACHE_REQUESTS.labels(result="hit")._value.get() == hits + 1
+
+def test_query_budgets(
+    client: TestClient,
+    session: Session,
+    test_user: User,
+    query_budget
+):
+    """Test that read endpoints run a fixed number of queries however many rows they return"""
+    accounts = [
+        Account(user_id=test_user.id, name=f"Cuenta {i}", institution="bci", type="debit")
+        for i in range(3)
+    ]
+    categories = [Category(name=f"Categoría {i}") for i in range(6)]
+    session.add_all(accounts + categories)
+    session.commit()
+    session.add(Rule(
+        user_id=test_user.id,
+        pattern="LIDER",
+        field="merchant",
+        action="set_category",
+        value=str(categories[0].id)
+    ))
+    
+    for i in range(40):
+        session.add(Transaction(
+            user_id=test_user.id,
+            account_id=accounts[i % 3].id,
+            txn_date=date(2025, 4, 1 + i % 28),
+            amount=-1000 * (i + 1),
+            description=f"Budget {i}",
+            merchant="LIDER" if i % 2 else "COPEC",
+            source=TransactionSource.MANUAL,
+            category_id=categories[i % 6].id,
+            hash_dedupe=hashlib.sha256(f"budget{i}".encode()).hexdigest()
+        ))
+    session.commit()
+    
+    from src.core.auth import get_current_user_id
+    user_id = test_user.id
+    app.dependency_overrides[get_current_user_id] = lambda: user_id
+    
+    budgets = [
+        ("GET", "/transactions?limit=500", 1),
+        ("GET", "/transactions?category_id=%d" % categories[0].id, 1),
+        ("GET", "/reports/monthly?month=2025-04", 3),
+        ("GET", "/reports/monthly?month=2025-04&rollup=true", 3),
+        ("GET", "/dashboard?month=2025-04", 7),
+        ("GET", "/exports/monthly.csv?month=2025-04", 1),
+        ("GET", "/sync", 5),
+        ("GET", "/categories", 1),
+        ("GET", "/accounts", 1),
+        ("GET", "/budgets", 1),
+        ("GET", "/rules", 1),
+        # + budget lookup for the recategorized rows
+        ("POST", "/rules/apply", 4),
+    ]
+    for method, url, limit in budgets:
+        with query_budget(limit):
+            response = client.request(method, url)
+        assert response.status_code == 200, url
+
+def test_gmail_webhook_opens_no_session(client: TestClient):
+    """Test that acknowledging a push notification does not check out a connection"""
+    from src.core.config import settings
+    
+    def no_session():
+        pytest.fail("webhook opened a database session")
+    
+    app.dependency_overrides[get_async_session] = no_session
+    response = client.post(
+        "/gmail/webhook",
+        json={"historyId": "123"},
+        headers={"X-Webhook-Secret": settings.GMAIL_WEBHOOK_SECRET}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"status": "received", "historyId": "123"}
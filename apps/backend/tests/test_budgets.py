@@ -0,0 +1,65 @@
+from datetime import date
+
+from sqlmodel import Session
+
+from src.core.events import BUDGET_THRESHOLD, event_bus
+from src.models.models import Account, AccountType, Budget, Category, Transaction, TransactionSource, User
+from src.services.budget_service import BudgetTracker
+
+def test_counters_follow_orm_changes_and_alert_once(session: Session):
+    """Test running spend through inserts, recategorization and deletes, with one event per threshold"""
+    month = date.today().replace(day=1)
+    
+    session.add(User(id="b1", email="b1@example.com"))
+    food = Category(name="Alimentación")
+    other = Category(name="Otros")
+    session.add_all([food, other])
+    session.commit()
+    groceries = Category(name="Supermercado", parent_id=food.id)
+    account = Account(user_id="b1", name="Visa", institution="BCI", type=AccountType.CREDIT)
+    session.add_all([groceries, account])
+    session.commit()
+    budget = Budget(user_id="b1", name="Comida", amount=100000, category_id=food.id, start_month=month)
+    session.add(budget)
+    session.commit()
+    
+    def spend(amount: float, category: Category, n: int) -> Transaction:
+        txn = Transaction(
+            user_id="b1", account_id=account.id, txn_date=month, amount=-amount,
+            description="Compra", source=TransactionSource.MANUAL,
+            category_id=category.id, hash_dedupe=f"budget-{n}"
+        )
+        session.add(txn)
+        session.commit()
+        return txn
+    
+    def spent() -> float:
+        [(_, counter)] = BudgetTracker(session).status("b1", month)
+        return counter.spent
+    
+    last_id = max([e.id for e in event_bus.replay("b1", 0)], default=0)
+    alerts = lambda: [e.data["threshold"] for e in event_bus.replay("b1", last_id) if e.type == BUDGET_THRESHOLD]
+    
+    spend(50000, groceries, 1)
+    assert spent() == 50000
+    
+    big = spend(35000, groceries, 2)
+    spend(9000, other, 3)
+    assert spent() == 85000
+    assert alerts() == [0.8]
+    
+    big.category_id = other.id
+    session.commit()
+    assert spent() == 50000
+    
+    big.category_id = food.id
+    session.commit()
+    assert alerts() == [0.8]
+    
+    spend(20000, food, 4)
+    assert spent() == 105000
+    assert alerts() == [0.8, 1.0]
+    
+    session.delete(big)
+    session.commit()
+    assert spent() == 70000
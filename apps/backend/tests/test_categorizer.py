@@ -0,0 +1,31 @@
+from src.services.categorizer_service import NaiveBayesCategorizer, features
+
+def test_naive_bayes_categorizer():
+    """Test learning, confident prediction and state round-trip"""
+    model = NaiveBayesCategorizer()
+    examples = [
+        ("LIDER", "Compra en LIDER", -25000, 1),
+        ("JUMBO", "Compra en JUMBO", -40000, 1),
+        ("UBER TRIP", "Compra en UBER", -6000, 2),
+        ("CABIFY", "Compra en CABIFY", -7000, 2),
+    ]
+    for _ in range(10):
+        for merchant, description, amount, category_id in examples:
+            model.learn(features(merchant, None, description, amount), category_id)
+    
+    assert model.documents == 40
+    
+    documents = [
+        features("HIPER LIDER 123", None, "Compra aprobada en LIDER", -30000),
+        features("UBER *TRIP", None, "Compra en UBER", -5500),
+        features("DESCONOCIDO", None, "Otro comercio", -100),
+    ]
+    (lider, lider_p), (uber, uber_p), (_, unknown_p) = model.predict_many(documents)
+    assert (lider, uber) == (1, 2)
+    assert lider_p > 0.9 and uber_p > 0.9
+    assert unknown_p < lider_p
+    
+    restored = NaiveBayesCategorizer.from_state(model.to_state())
+    assert restored.predict_many(documents) == model.predict_many(documents)
+    
+    assert NaiveBayesCategorizer().predict_many([documents[0]]) == [(None, 0.0)]
@@ -0,0 +1,105 @@
+import os
+import subprocess
+import sys
+from datetime import date
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, SQLModel, create_engine, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core import database
+from src.core.auth import get_current_user_id
+from src.api.dependencies import get_async_read_session
+from src.models.models import Account, Transaction, TransactionPayload, TransactionSource, User
+
+def test_read_replica_routing(db_url: str, engine: Engine, tmp_path, monkeypatch):
+    """Test reads go to the replica except right after the user wrote"""
+    replica_url = f"sqlite:///{tmp_path / 'replica.db'}"
+    SQLModel.metadata.create_all(create_engine(replica_url))
+    
+    monkeypatch.setattr(database, "async_engine", create_async_engine(database.to_async_url(db_url)))
+    monkeypatch.setattr(
+        database, "async_replica_engine", create_async_engine(database.to_async_url(replica_url))
+    )
+    monkeypatch.setattr(database, "_primary_pins", type(database._primary_pins)(maxsize=10, ttl=60))
+    
+    app = FastAPI()
+    current_user = {"id": "user-1"}
+    app.dependency_overrides[get_current_user_id] = lambda: current_user["id"]
+    
+    @app.get("/count")
+    async def count(session: AsyncSession = Depends(get_async_read_session)):
+        return (await session.exec(select(func.count(Transaction.id)))).one()
+    
+    client = TestClient(app)
+    assert client.get("/count").json() == 0  # replica is behind
+    
+    # Writing through the primary pins user-1 there until the window passes
+    with Session(engine) as session:
+        session.add(User(id="user-1", email="u1@example.com"))
+        session.add(Account(id=1, user_id="user-1", name="Cuenta", institution="bci", type="credit"))
+        session.add(Transaction(
+            user_id="user-1",
+            account_id=1,
+            txn_date=date(2025, 1, 15),
+            amount=-1000,
+            description="Compra",
+            source=TransactionSource.MANUAL,
+            hash_dedupe="replica-test"
+        ))
+        session.commit()
+    
+    assert client.get("/count").json() == 1
+    
+    current_user["id"] = "user-2"
+    assert client.get("/count").json() == 0
+
+def test_transaction_key_matches_partitioned_table(engine: Engine):
+    """Test the (id, txn_date) key on SQLite: ids autoincrement and payloads cascade"""
+    assert [c.name for c in Transaction.__table__.primary_key] == ["id", "txn_date"]
+    
+    event.listen(engine, "connect", lambda conn, record: conn.execute("PRAGMA foreign_keys=ON"))
+    engine.dispose()  # reconnect with foreign keys enforced
+    
+    with Session(engine) as session:
+        session.add(User(id="user-1", email="user-1@example.com"))
+        session.commit()
+        session.add(Account(user_id="user-1", name="Cuenta", institution="bci", type="debit"))
+        session.commit()
+        
+        txns = [
+            Transaction(
+                user_id="user-1",
+                account_id=1,
+                txn_date=date(2025, 1, day),
+                amount=-1000,
+                description="Compra",
+                source=TransactionSource.MANUAL,
+                hash_dedupe=f"keys{day}"
+            )
+            for day in (1, 2)
+        ]
+        session.add_all(txns)
+        session.flush()
+        assert [t.id for t in txns] == [1, 2]
+        
+        session.add(TransactionPayload(transaction_id=1, txn_date=date(2025, 1, 1), payload={}))
+        session.commit()
+        session.delete(txns[0])
+        session.commit()
+        assert session.exec(select(func.count()).select_from(TransactionPayload)).one() == 0
+
+def test_database_does_not_import_auth():
+    """Test scripts can use src.core.database without pulling in the API auth layer"""
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = "import sys, src.core.database; assert 'src.core.auth' not in sys.modules"
+    env = {**os.environ, "DATABASE_URL": "sqlite://"}
+    env.pop("PYTHONPATH", None)
+    
+    result = subprocess.run([sys.executable, "-c", code], cwd=backend_dir, env=env, capture_output=True, text=True)
+    
+    assert result.returncode == 0, result.stderr
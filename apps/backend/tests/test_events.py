@@ -0,0 +1,79 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta
+
+import jwt
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, text
+
+from src.core.auth import get_stream_user_id
+from src.core.config import settings
+from src.core.events import EventBus, event_bus, publish_after_commit
+
+def test_publish_after_commit(engine: Engine):
+    """Test that events wait for the commit and are dropped on rollback"""
+    last_id = max([e.id for e in event_bus.replay("events-user", 0)], default=0)
+    
+    with Session(engine) as session:
+        session.execute(text("SELECT 1"))
+        publish_after_commit(session, "events-user", "test.rolled_back", {})
+        session.rollback()
+        session.execute(text("SELECT 1"))
+        publish_after_commit(session, "events-user", "test.committed", {"n": 1})
+        assert event_bus.replay("events-user", last_id) == []
+        session.commit()
+    
+    [item] = event_bus.replay("events-user", last_id)
+    assert (item.type, item.data) == ("test.committed", {"n": 1})
+
+def test_subscribers_receive_events_from_threads():
+    """Test delivery from worker threads, per user, dropping the oldest when full"""
+    bus = EventBus()
+    
+    async def scenario():
+        mine, other = bus.subscribe("u1"), bus.subscribe("u2")
+        worker = threading.Thread(target=lambda: [bus.publish("u1", "ping", {"i": i}) for i in range(3)])
+        worker.start()
+        worker.join()
+        received = [await asyncio.wait_for(mine.queue.get(), 1) for _ in range(3)]
+        
+        for i in range(settings.EVENT_QUEUE_SIZE + 5):
+            bus.publish("u1", "ping", {"i": i})
+        await asyncio.sleep(0)
+        first = mine.queue.get_nowait()
+        
+        bus.unsubscribe(mine)
+        bus.unsubscribe(other)
+        return received, other.queue.qsize(), first
+    
+    received, other_size, first = asyncio.run(scenario())
+    assert [e.data["i"] for e in received] == [0, 1, 2]
+    assert received[0].id < received[1].id < received[2].id
+    assert other_size == 0
+    assert first.data == {"i": 5}
+    assert [e.data["i"] for e in bus.replay("u1", received[2].id)][:2] == [5, 6]
+
+def test_stream_token_from_query():
+    """Test that streams accept the token as ?access_token="""
+    now = datetime.utcnow()
+    token = jwt.encode(
+        {"sub": "stream-user", "aud": "authenticated", "iat": now, "exp": now + timedelta(minutes=5)},
+        settings.SUPABASE_JWT_SECRET,
+        algorithm="HS256"
+    )
+    assert get_stream_user_id(None, token) == "stream-user"
+
+def test_replay_keeps_events_by_their_own_age():
+    """Test that recent events survive past the replay window of the user's first event"""
+    now = [1000.0]
+    bus = EventBus(timer=lambda: now[0])
+    
+    first = bus.publish("u1", "ping", {"i": 1})
+    now[0] += settings.EVENT_REPLAY_SECONDS - 2
+    bus.publish("u1", "ping", {"i": 2})
+    now[0] += 2
+    assert [e.data["i"] for e in bus.replay("u1", 0)] == [2]
+    assert [e.data["i"] for e in bus.replay("u1", first.id)] == [2]
+    
+    now[0] += settings.EVENT_REPLAY_SECONDS
+    assert bus.replay("u1", 0) == []
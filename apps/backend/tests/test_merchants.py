@@ -0,0 +1,54 @@
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, select
+
+from src.models.models import Merchant
+from src.services.merchant_service import MerchantNormalizer, clean_merchant, known_index
+
+def test_clean_and_match():
+    """Test cleaning raw merchant strings and matching known prefixes"""
+    assert clean_merchant("Uber *Trip") == "UBER TRIP"
+    assert clean_merchant("UBER EATS 1234") == "UBER EATS"
+    assert clean_merchant("MERPAGO*JUMBO.CL") == "JUMBO"
+    assert clean_merchant("Líder Express 0123") == "LIDER EXPRESS"
+    assert clean_merchant("123-456") == ""
+    
+    assert known_index.match("UBER TRIP HELP") == "Uber"
+    assert known_index.match("UBER EATS") == "Uber Eats"
+    assert known_index.match("HIPER LIDER MAIPU") == "Líder"
+    assert known_index.match("EXPRESS") is None
+
+def test_normalizer_persists_aliases(engine: Engine):
+    """Test that variants share a canonical merchant and resolve the same later"""
+    raws = ["UBER *TRIP", "UBER EATS 1234", "Uber Eats 99", "FOO STORE 12", "FOO STORE 34", None, "0000"]
+    
+    with Session(engine) as session:
+        ids = MerchantNormalizer(session).resolve_many(raws)
+        session.commit()
+        names = dict(session.exec(select(Merchant.id, Merchant.name)).all())
+    
+    assert set(ids) == {"UBER *TRIP", "UBER EATS 1234", "Uber Eats 99", "FOO STORE 12", "FOO STORE 34"}
+    assert names[ids["UBER *TRIP"]] == "Uber"
+    assert names[ids["UBER EATS 1234"]] == "Uber Eats"
+    assert ids["Uber Eats 99"] == ids["UBER EATS 1234"]
+    assert ids["FOO STORE 12"] == ids["FOO STORE 34"]
+    assert names[ids["FOO STORE 12"]] == "FOO STORE"
+    assert len(names) == 3
+    
+    # A new session (e.g. another worker) reads the persisted mapping
+    with Session(engine) as session:
+        assert MerchantNormalizer(session).resolve("uber trip 77") == ids["UBER *TRIP"]
+
+def test_normalizer_caches_only_committed_aliases(engine: Engine):
+    """Test that a rolled-back alias is not served from the process cache"""
+    with Session(engine) as session:
+        MerchantNormalizer(session).resolve("ROLLBACK STORE 1")
+        session.rollback()
+    
+    with Session(engine) as session:
+        merchant_id = MerchantNormalizer(session).resolve("ROLLBACK STORE 2")
+        assert session.get(Merchant, merchant_id) is not None
+        session.commit()
+    
+    with Session(engine) as session:
+        assert MerchantNormalizer(session).resolve("ROLLBACK STORE 3") == merchant_id
+        assert session.get(Merchant, merchant_id).name == "ROLLBACK STORE"
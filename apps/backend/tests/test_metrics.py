@@ -0,0 +1,62 @@
+from prometheus_client import generate_latest, REGISTRY
+from sqlalchemy.engine import Engine
+from sqlmodel import create_engine
+
+from src.core.metrics import InstrumentedQueuePool, pool_collector
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels)
+
+def test_pool_metrics(db_url: str):
+    """Test pool occupancy gauges and checkout wait histogram"""
+    engine = create_engine(
+        db_url,
+        poolclass=InstrumentedQueuePool,
+        pool_logging_name="test",
+        pool_size=2,
+        max_overflow=1
+    )
+    pool_collector.register("test", engine)
+    
+    waits = _sample("db_pool_checkout_wait_seconds_count", engine="test") or 0
+    connections = [engine.connect() for _ in range(3)]
+    
+    assert _sample("db_pool_size", engine="test") == 2
+    assert _sample("db_pool_checked_out", engine="test") == 3
+    assert _sample("db_pool_overflow", engine="test") == 1
+    assert _sample("db_pool_checkout_wait_seconds_count", engine="test") == waits + 3
+    
+    for connection in connections:
+        connection.close()
+    assert _sample("db_pool_checked_out", engine="test") == 0
+    assert b'db_pool_checked_in{engine="test"} 2.0' in generate_latest()
+
+def test_request_metrics_by_route(engine: Engine):
+    """Test latency and SQL query histograms are labelled by route template"""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from sqlalchemy import text
+    from src.core.metrics import MetricsMiddleware
+    
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    
+    @app.get("/items/{item_id}")
+    def get_item(item_id: int):
+        with engine.connect() as connection:
+            for _ in range(item_id):
+                connection.execute(text("SELECT 1"))
+        return {"id": item_id}
+    
+    client = TestClient(app)
+    labels = {"method": "GET", "route": "/items/{item_id}"}
+    before = _sample("http_request_db_queries_sum", **labels) or 0
+    
+    client.get("/items/3")
+    client.get("/items/4")
+    
+    assert _sample("http_request_db_queries_sum", **labels) == before + 7
+    assert _sample("http_request_duration_seconds_count", status="200", **labels) >= 2
+    
+    client.get("/nope")
+    assert _sample("http_request_duration_seconds_count", method="GET", route="unmatched", status="404") >= 1
@@ -0,0 +1,83 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+import jwt
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from src.core.config import settings
+from src.core.profiling import ProfilingMiddleware
+
+def _token(user_id: str) -> str:
+    return jwt.encode(
+        {"sub": user_id, "aud": "authenticated", "exp": int(time.time()) + 60},
+        settings.SUPABASE_JWT_SECRET,
+        algorithm="HS256"
+    )
+
+def test_profiling_admin_only(engine: Engine, tmp_path, monkeypatch):
+    """Test only admins asking for it get a profile and SQL log written"""
+    monkeypatch.setattr(settings, "PROFILE_DIR", str(tmp_path / "profiles"))
+    monkeypatch.setattr(settings, "PROFILE_SAMPLE_INTERVAL", 0.001)
+    monkeypatch.setattr(settings, "ADMIN_USER_IDS", ["admin-1"])
+    
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware)
+    
+    @app.get("/slow")
+    def slow():
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        time.sleep(0.05)
+        return {"ok": True}
+    
+    client = TestClient(app)
+    
+    response = client.get("/slow", headers={"Authorization": f"Bearer {_token('user-1')}", "X-Profile": "1"})
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
+    
+    response = client.get("/slow?profile=1", headers={"Authorization": f"Bearer {_token('admin-1')}"})
+    profile_id = response.headers["x-profile-id"]
+    
+    with open(tmp_path / "profiles" / f"{profile_id}.json") as f:
+        report = json.load(f)
+    assert report["path"] == "/slow"
+    assert report["queries"]["count"] == 1
+    assert report["queries"]["statements"][0]["sql"] == "SELECT 1"
+    assert report["samples"] > 0
+    assert (tmp_path / "profiles" / f"{profile_id}.collapsed").read_text()
+
+def test_app_registers_profiling():
+    """Test the app wires in the profiling middleware and the admin profile routes"""
+    from src.main import app
+    
+    assert ProfilingMiddleware in [m.cls for m in app.user_middleware]
+    paths = {route.path for route in app.routes}
+    assert {"/admin/profiles", "/admin/profiles/{filename}"} <= paths
+
+def test_main_imports_cleanly():
+    """Test src.main imports in a fresh interpreter, without any module aliasing"""
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = {
+        **os.environ,
+        "DATABASE_URL": "sqlite://",
+        "SUPABASE_URL": "http://localhost",
+        "SUPABASE_JWT_SECRET": "test-secret",
+        "GOOGLE_CLIENT_ID": "x",
+        "GOOGLE_CLIENT_SECRET": "x",
+        "GMAIL_WEBHOOK_SECRET": "x",
+    }
+    env.pop("PYTHONPATH", None)
+    
+    result = subprocess.run(
+        [sys.executable, "-c", "import src.main"],
+        cwd=backend_dir, env=env, capture_output=True, text=True
+    )
+    
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from src.core import ratelimit
+from src.core.config import Settings
+from src.core.ratelimit import MemoryBackend, SQLiteBackend, RateLimitMiddleware
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryBackend(max_keys=3)
+    return SQLiteBackend(str(tmp_path / "limits.sqlite3"), max_keys=3)
+
+def test_sliding_window_limit(backend, monkeypatch):
+    """Test that hits beyond the limit are rejected until the window slides"""
+    now = [1_000_040.0]  # 20s into a minute window
+    monkeypatch.setattr(ratelimit.time, "time", lambda: now[0])
+    
+    results = [backend.hit("ip:1", 5, 60)[0] for _ in range(6)]
+    assert results == [True] * 5 + [False]
+    
+    # Halfway through the next window the previous one still weighs 2.5 hits
+    now[0] += 70
+    assert [backend.hit("ip:1", 5, 60)[0] for _ in range(3)] == [True, True, False]
+    
+    # Two windows later everything has expired
+    now[0] += 120
+    assert backend.hit("ip:1", 5, 60) == (True, 0.0)
+
+def test_memory_backend_evicts_idle_keys():
+    """Test LRU eviction keeps memory bounded"""
+    backend = MemoryBackend(max_keys=3)
+    for i in range(10):
+        backend.hit(f"ip:{i}", 5, 60)
+    assert list(backend._state) == ["ip:7", "ip:8", "ip:9"]
+
+def test_sqlite_backend_shared_between_instances(tmp_path):
+    """Test two workers pointing at the same file share counters"""
+    path = str(tmp_path / "limits.sqlite3")
+    worker_a, worker_b = SQLiteBackend(path), SQLiteBackend(path)
+    assert worker_a.hit("user:x", 2, 3600)[0] is True
+    assert worker_b.hit("user:x", 2, 3600)[0] is True
+    assert worker_a.hit("user:x", 2, 3600)[0] is False
+
+def test_middleware_returns_429(monkeypatch):
+    """Test middleware reads limits from settings and answers 429"""
+    monkeypatch.setattr(ratelimit.settings, "RATE_LIMIT_PER_MINUTE", 2)
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware, backend=MemoryBackend())
+    
+    @app.get("/ping")
+    def ping():
+        return {"ok": True}
+    
+    client = TestClient(app)
+    assert [client.get("/ping").status_code for _ in range(3)] == [200, 200, 429]
+    assert int(client.get("/ping").headers["Retry-After"]) >= 1
+
+def test_middleware_runs_sqlite_backend_off_the_event_loop(tmp_path):
+    """Test that blocking backend hits run in the threadpool, not on the loop"""
+    threads = {}
+    
+    class RecordingBackend(SQLiteBackend):
+        def hit(self, key, limit, window):
+            threads["hit"] = threading.get_ident()
+            return super().hit(key, limit, window)
+    
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware, backend=RecordingBackend(str(tmp_path / "limits.sqlite3")))
+    
+    @app.get("/ping")
+    async def ping():
+        threads["loop"] = threading.get_ident()
+        return {"ok": True}
+    
+    assert TestClient(app).get("/ping").status_code == 200
+    assert threads["hit"] != threads["loop"]
+
+def test_unknown_backend_is_rejected():
+    """Test that a misspelled backend fails at startup instead of falling back to memory"""
+    with pytest.raises(ValidationError):
+        Settings(RATE_LIMIT_BACKEND="sqlit")
@@ -0,0 +1,100 @@
+from datetime import date, timedelta
+
+from sqlmodel import Session, select
+
+from src.models.models import Account, AccountType, Merchant, RecurringSeries, Transaction, TransactionSource, User
+from src.services import recurring_service
+from src.services.recurring_service import Charge, RecurringDetector, detect_series
+
+def test_detect_series():
+    """Test that jittered periodic charges are found and irregular ones are not"""
+    netflix = [Charge(i, 1, date(2025, 1, 5) + timedelta(days=30 * i + (i % 3)), -8990) for i in range(6)]
+    # price increase halfway through the year
+    gym = [Charge(10 + i, 2, date(2025, 1, 1) + timedelta(weeks=i), -5000 if i < 4 else -5500) for i in range(8)]
+    groceries = [Charge(20 + i, 3, date(2025, 1, 1) + timedelta(days=d), -30000) for i, d in enumerate([0, 3, 20, 22, 50])]
+    # same merchant, two plans: only the monthly one is periodic
+    cloud = [
+        Charge(30, 4, date(2025, 1, 10), -2000),
+        Charge(31, 4, date(2025, 2, 3), -99000),
+        Charge(32, 4, date(2025, 2, 10), -2000),
+        Charge(33, 4, date(2025, 3, 10), -2000),
+    ]
+    
+    charges = sorted(netflix + gym + groceries + cloud, key=lambda c: (c.merchant_id, c.txn_date))
+    found = {s['merchant_id']: s for s in detect_series(charges)}
+    
+    assert set(found) == {1, 2, 4}
+    assert found[1]['cadence'] == "monthly"
+    assert found[1]['occurrences'] == 6
+    assert found[2]['cadence'] == "weekly"
+    assert found[2]['amount'] == -5500
+    assert found[4]['amount'] == -2000
+    assert found[4]['next_expected'] == date(2025, 4, 9)
+
+def test_detector_is_incremental(session: Session, monkeypatch):
+    """Test that later runs extend series and only rescan merchants with new charges"""
+    monkeypatch.setattr(recurring_service, "SCAN_OVERLAP", timedelta(0))
+    
+    session.add(User(id="u1", email="u1@example.com"))
+    netflix, spotify = Merchant(name="Netflix"), Merchant(name="Spotify")
+    account = Account(user_id="u1", name="Visa", institution="BCI", type=AccountType.CREDIT)
+    session.add_all([netflix, spotify, account])
+    session.commit()
+    
+    def charge(merchant: Merchant, txn_date: date, amount: float = -8990, resolved: bool = True):
+        txn = Transaction(
+            user_id="u1", account_id=account.id, txn_date=txn_date, amount=amount,
+            description=merchant.name, source=TransactionSource.EMAIL,
+            merchant_id=merchant.id if resolved else None, hash_dedupe=f"{merchant.id}-{txn_date}"
+        )
+        session.add(txn)
+        session.commit()
+        return txn
+    
+    for month in range(1, 5):
+        charge(netflix, date(2025, month, 3))
+    detector = RecurringDetector(session)
+    assert detector.run("u1") == {'extended': 0, 'detected': 1}
+    
+    charge(netflix, date(2025, 5, 4))
+    assert detector.run("u1") == {'extended': 1, 'detected': 0}
+    
+    for month in range(3, 6):
+        charge(spotify, date(2025, month, 20), -4500)
+    assert detector.run("u1") == {'extended': 0, 'detected': 1}
+    assert detector.run("u1") == {'extended': 0, 'detected': 0}
+    
+    series = {s.merchant_id: s for s in session.exec(select(RecurringSeries)).all()}
+    assert series[netflix.id].occurrences == 5
+    assert series[netflix.id].last_date == date(2025, 5, 4)
+    assert series[spotify.id].first_date == date(2025, 3, 20)
+    
+    assert detector.run("u1", full=True) == {'extended': 0, 'detected': 2}
+    
+    # Older rows written since the last scan re-scan their merchant:
+    # a charge later flagged as a transfer leaves the series
+    may = session.exec(
+        select(Transaction).where(Transaction.merchant_id == netflix.id, Transaction.txn_date == date(2025, 5, 4))
+    ).one()
+    may.is_transfer = True
+    session.commit()
+    assert detector.run("u1") == {'extended': 0, 'detected': 1}
+    assert session.exec(
+        select(RecurringSeries.occurrences).where(RecurringSeries.merchant_id == netflix.id)
+    ).one() == 4
+    
+    # and charges whose merchant is backfilled join one
+    disney = Merchant(name="Disney")
+    session.add(disney)
+    session.commit()
+    unresolved = [charge(disney, date(2025, month, 12), -6500, resolved=False) for month in range(1, 4)]
+    assert detector.run("u1") == {'extended': 0, 'detected': 0}
+    for txn in unresolved:
+        txn.merchant_id = disney.id
+    session.commit()
+    assert detector.run("u1") == {'extended': 0, 'detected': 1}
+    
+    # A deleted transaction re-scans everything
+    session.delete(may)
+    session.commit()
+    assert detector.run("u1") == {'extended': 0, 'detected': 3}
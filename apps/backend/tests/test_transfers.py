@@ -0,0 +1,46 @@
+from collections import namedtuple
+from datetime import date, timedelta
+
+from src.services.transfer_service import match_transfers
+
+Row = namedtuple("Row", "id account_id txn_date amount currency")
+
+def test_match_transfers():
+    """Test pairing opposite amounts across accounts within the window"""
+    rows = [
+        Row(1, 1, date(2025, 3, 1), -100000, "CLP"),
+        Row(2, 2, date(2025, 3, 2), 100000, "CLP"),
+        # too far apart
+        Row(3, 1, date(2025, 3, 10), -50000, "CLP"),
+        Row(4, 2, date(2025, 3, 20), 50000, "CLP"),
+        # refund on the same account
+        Row(5, 1, date(2025, 3, 5), -7990, "CLP"),
+        Row(6, 1, date(2025, 3, 6), 7990, "CLP"),
+        # other currency
+        Row(7, 1, date(2025, 3, 7), -200, "USD"),
+        Row(8, 3, date(2025, 3, 7), 200, "CLP"),
+        # repeated monthly transfer: each month pairs with its own deposit
+        Row(9, 1, date(2025, 4, 1), -100000, "CLP"),
+        Row(10, 2, date(2025, 4, 3), 100000, "CLP"),
+    ]
+    
+    pairs = match_transfers(rows, timedelta(days=3))
+    assert sorted((out.id, inflow.id) for out, inflow in pairs) == [(1, 2), (9, 10)]
+
+def test_match_transfers_skips_same_account_rows():
+    """Test that a same-account row does not block later cross-account matches"""
+    rows = [
+        # transfers both ways with the same amount on the same day
+        Row(1, 1, date(2025, 5, 1), 30000, "CLP"),
+        Row(2, 1, date(2025, 5, 1), -30000, "CLP"),
+        Row(3, 2, date(2025, 5, 1), 30000, "CLP"),
+        Row(4, 2, date(2025, 5, 1), -30000, "CLP"),
+        # purchase and refund on account 1, then a transfer to account 2
+        Row(5, 1, date(2025, 6, 1), -12000, "CLP"),
+        Row(7, 1, date(2025, 6, 2), 12000, "CLP"),
+        Row(6, 1, date(2025, 6, 2), -12000, "CLP"),
+        Row(8, 2, date(2025, 6, 2), 12000, "CLP"),
+    ]
+    
+    pairs = match_transfers(rows, timedelta(days=3))
+    assert sorted((out.id, inflow.id) for out, inflow in pairs) == [(2, 3), (4, 1), (6, 8)]